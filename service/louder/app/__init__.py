@@ -1,12 +1,34 @@
 from pathlib import Path
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
-from app.http.routes.post import router as file_post_router
-from app.http.routes.get import router as file_get_router
+from core import config
 from fastapi.middleware.cors import CORSMiddleware
 
 
 app = None
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Imported here: the tasks and the container import the services, whose modules import this package
+    from app.services.file import FileStorageService
+    from app.tasks import run_file_change_compaction, run_storage_rebalance, run_path_config_reload, EventLoopLagMonitor
+
+    tasks = [asyncio.create_task(EventLoopLagMonitor().run())]
+    if config.get("FILE_CHANGES_COMPACTION_INTERVAL", 3600) > 0:
+        tasks.append(asyncio.create_task(run_file_change_compaction(app.state.services)))
+    if config.get("PATH_CONFIG_RELOAD_INTERVAL", 0) > 0:
+        tasks.append(asyncio.create_task(run_path_config_reload()))
+    if config.get("STORAGE_REBALANCE_INTERVAL", 0) > 0:
+        tasks.append(asyncio.create_task(run_storage_rebalance()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await FileStorageService.close_backend()
+
+
 def create_app():
     global app
 
@@ -14,6 +36,7 @@ def create_app():
     app = FastAPI(
         title="Loader Service API",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     origins = [
@@ -31,9 +54,22 @@ def create_app():
 
     #init
     init_client()
+    from core.depends.container import ServiceContainer
+    app.state.services = ServiceContainer()
     #register
+    # Imported here: the routes import the services and the response models, which are modules of this package
+    from app.http.routes.post import router as file_post_router
+    from app.http.routes.get import router as file_get_router
+    from app.http.routes.put import router as file_put_router
+    from app.http.routes.patch import router as file_patch_router
+    from app.http.routes.delete import router as file_delete_router
+    from app.http.routes.metrics import router as metrics_router
     app.include_router(file_post_router)
     app.include_router(file_get_router)
+    app.include_router(file_put_router)
+    app.include_router(file_patch_router)
+    app.include_router(file_delete_router)
+    app.include_router(metrics_router)
     #command init
 
     return app
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Annotated
 from core.UUID6 import UUID6
+from core import config
 
 
 class FileFieldsRequest(BaseModel):
@@ -15,5 +16,41 @@ class CreateFileRequest(BaseModel):
     file_name: str = Field(..., min_length=1, max_length=255, description="Name of the file to create")
 
 
+class CreateFilesBatchRequest(BaseModel):
+    file_names: List[Annotated[str, Field(min_length=1, max_length=255)]] = Field(
+        ...,
+        min_length=1,
+        max_length=config.get("FILE_BATCH_MAX_FILES", 1000),
+        description="Names of the files to create"
+    )
+
+
 class FileUUIDRequest(BaseModel):
     file_uuid: str
+
+
+class CreateUploadSessionRequest(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255, description="Name of the uploaded file")
+    mime_type: Optional[str] = Field(None, max_length=100, description="MIME type of the uploaded file")
+    total_size: Optional[int] = Field(None, ge=1, description="Total file size in bytes, if known")
+
+
+class CompleteMultipartUploadRequest(BaseModel):
+    parts: Optional[List[int]] = Field(
+        None,
+        min_length=1,
+        description="Ordered part numbers to assemble; all uploaded parts by default"
+    )
+
+
+class HashNegotiationRequest(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255, description="Name of the file to upload")
+    mime_type: Optional[str] = Field(None, max_length=100, description="MIME type of the file to upload")
+    content_hash: str = Field(..., pattern=r"^[0-9a-fA-F]{64}$", description="SHA-256 of the file content (hex)")
+    size: int = Field(..., ge=1, description="File size in bytes")
+    challenge_token: Optional[str] = Field(None, max_length=512, description="Token of the content challenge answered")
+    challenge_proof: Optional[str] = Field(
+        None,
+        pattern=r"^[0-9a-fA-F]{64}$",
+        description="SHA-256 (hex) of the challenge nonce followed by the requested byte range of the content"
+    )
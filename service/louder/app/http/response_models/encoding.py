@@ -0,0 +1,44 @@
+from fastapi.responses import Response
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Values the standard json module can't encode, written as Pydantic writes them"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        iso = value.isoformat()
+        return iso[:-6] + "Z" if iso.endswith("+00:00") else iso
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    Encoding plain data (dicts, lists, UUIDs, datetimes) to compact JSON bytes
+
+    Uses the optional `orjson` package when installed, the json module
+    otherwise. The output is the one of Pydantic's model_dump_json.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class JSONBytesResponse(Response):
+    """
+    JSON response of an already encoded body.
+
+    Returned by the routes instead of a model, so FastAPI neither validates
+    the response_model again nor encodes it: the route declares it for the
+    documentation only.
+    """
+
+    media_type = "application/json"
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 from core.UUID6 import UUID6
 from uuid import UUID
@@ -17,10 +17,78 @@ class FileFieldsResponse(BaseModel):
     storage_filename: Optional[str] = Field(None, description="Storage filename with UUID")
     size_in_mb: Optional[float] = Field(None, description="File size in MB")
     size_in_kb: Optional[float] = Field(None, description="File size in KB")
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the file content")
 
 class FilesResponse(BaseModel):
     files: Dict[UUID, FileFieldsResponse]
 
 
+class FilesPageResponse(BaseModel):
+    files: List[FileFieldsResponse] = Field(default_factory=list, description="Files ordered by creation")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, null on the last page")
+
+
+class FileChangeResponse(BaseModel):
+    change_id: str = Field(..., description="uuid7 of the change")
+    operation: str = Field(..., description="created, updated or deleted")
+    file_uid: UUID = Field(..., description="File UUID")
+    file: Optional[FileFieldsResponse] = Field(None, description="Current file record, null once deleted")
+
+
+class FileChangesResponse(BaseModel):
+    changes: List[FileChangeResponse] = Field(default_factory=list, description="Changes ordered by time")
+    cursor: str = Field(..., description="Cursor to pass as `since` on the next call")
+    has_more: bool = Field(False, description="Whether more changes are available right away")
+
+
 class CreateFileResponse(BaseModel):
-    file_uid: str = Field(..., description="UUID of the created file")
\ No newline at end of file
+    file_uid: str = Field(..., description="UUID of the created file")
+
+class CreateFilesBatchResponse(BaseModel):
+    file_uids: List[str] = Field(..., description="UUIDs of the created files, in request order")
+
+class UploadResultResponse(BaseModel):
+    file_uid: str = Field(..., description="UUID of the uploaded file")
+    uploaded: bool = Field(..., description="Whether the file was saved")
+    file: Optional[FileFieldsResponse] = Field(None, description="The saved file")
+    error: Optional[str] = Field(None, description="Why the file was not saved")
+
+
+class MultiFileUploadResponse(BaseModel):
+    results: List[UploadResultResponse] = Field(default_factory=list, description="Per-file results in request order")
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str = Field(..., description="UUID of the upload session")
+    file_uid: str = Field(..., description="UUID of the uploaded file")
+    offset: int = Field(..., description="Number of bytes committed so far")
+    total_size: Optional[int] = Field(None, description="Declared total file size in bytes")
+
+
+class UploadPartResponse(BaseModel):
+    part_number: int = Field(..., description="Part number")
+    size: int = Field(..., description="Part size in bytes")
+
+
+class MultipartUploadResponse(BaseModel):
+    upload_id: str = Field(..., description="UUID of the upload session")
+    file_uid: str = Field(..., description="UUID of the uploaded file")
+    total_size: Optional[int] = Field(None, description="Declared total file size in bytes")
+    uploaded_size: int = Field(0, description="Total size of the uploaded parts in bytes")
+    max_parallel_parts: int = Field(..., description="Maximum number of parts uploaded at the same time to one worker of the service")
+    parts: List[UploadPartResponse] = Field(default_factory=list, description="Uploaded parts ordered by number")
+
+
+class ContentChallengeResponse(BaseModel):
+    token: str = Field(..., description="Token to send back with the proof")
+    offset: int = Field(..., description="First byte of the content range to hash")
+    length: int = Field(..., description="Number of bytes of the content range to hash")
+    nonce: str = Field(..., description="Hex bytes hashed before the content range")
+
+
+class HashNegotiationResponse(BaseModel):
+    upload_required: bool = Field(..., description="Whether the content must be uploaded")
+    file: Optional[FileFieldsResponse] = Field(None, description="The linked file when no upload is required")
+    challenge: Optional[ContentChallengeResponse] = Field(
+        None,
+        description="Content held by other users: answer the challenge to link it instead of uploading"
+    )
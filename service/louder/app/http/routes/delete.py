@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from uuid6 import UUID
+from typing import Annotated
+
+from core.dto.user_file_id_pair import UserFileIDPair
+from core.depends.domain import get_user_file_id_pair, get_upload_id
+from core.logger import Logger
+from core.depends.service import get_file_service
+from app.services.file import FileService
+from core.exceptions import *
+
+
+router = APIRouter(prefix="/api/v1/loader/file", tags=["Loader"])
+logger = Logger.get_logger(__name__)
+FileServiceDep = Annotated[FileService, Depends(get_file_service)]
+UserFileIDPairDep = Annotated[UserFileIDPair, Depends(get_user_file_id_pair)]
+UploadIDDep = Annotated[UUID, Depends(get_upload_id)]
+
+
+@router.delete(
+    "/{file_uid}",
+    summary="Delete a file",
+    description="Deletes a file of the authenticated user with its content",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def delete_file(
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep
+):
+    logger.debug(f"Request to delete a file from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        await fs.delete_file(user_file_id_pair)
+    except FileAccessError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found or access denied"
+        )
+    except FileDeleteError as e:
+        logger.error(f"File deletion failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Storage service temporarily unavailable"
+        )
+    except Exception as e:
+        logger.error(f"Error deleting file: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during file deletion"
+        )
+
+
+@router.delete(
+    "/{file_uid}/uploads/{upload_id}",
+    summary="Abort an upload",
+    description="Discards a resumable or multi-part upload session and all bytes received so far",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+@router.delete(
+    "/{file_uid}/multipart/{upload_id}",
+    include_in_schema=False,
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def abort_upload(
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep
+):
+    logger.debug(f"Request to abort an upload from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        await fs.abort_upload(user_file_id_pair, upload_id)
+    except (FileAccessError, UploadSessionNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except Exception as e:
+        logger.error(f"Error aborting upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during upload abort"
+        )
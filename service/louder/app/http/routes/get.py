@@ -5,23 +5,47 @@ from app.services.file import FileService
 from core.db.db import get_db
 from core.data_mapper.files.files import FilesMapper
 from core.domain.file import File
-from app.http.response_models.file import FilesResponse
+from app.http.response_models.file import (
+    FilesResponse,
+    FilesPageResponse,
+    FileChangesResponse,
+    UploadSessionResponse,
+    MultipartUploadResponse,
+    UploadPartResponse
+)
+from app.http.response_models.encoding import JSONBytesResponse
+from core.dto.file_filter import FileListFilter
 from core.exceptions import *
 from documentation.swagger.file.files import FileResponses
 
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi import Request, Header, status
+from fastapi import Request, Header, Response, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 from uuid6 import UUID
-from typing import Annotated
+from typing import Annotated, Optional
+from datetime import datetime
+from urllib.parse import quote
 import json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.depends.service import get_file_service
+from core import config
+from core.depends.domain import get_user_file_id_pair, get_upload_id
 
 router = APIRouter(prefix="/api/v1/loader", tags=["Loader"])
 logger = Logger.get_logger(__name__)
 DBDep = Annotated[AsyncSession, Depends(get_db)]
 FileServiceDep = Annotated[FileService, Depends(get_file_service)]
+UserFileIDPairDep = Annotated[UserFileIDPair, Depends(get_user_file_id_pair)]
+UploadIDDep = Annotated[UUID, Depends(get_upload_id)]
+
+
+class _WholeFileResponse(FileResponse):
+    """FileResponse ignoring the Range header, which Starlette would answer with 400 when invalid"""
+
+    async def __call__(self, scope, receive, send) -> None:
+        scope = {**scope, "headers": [(key, value) for key, value in scope["headers"] if key != b"range"]}
+        await super().__call__(scope, receive, send)
 
 
 @router.get(
@@ -34,7 +58,8 @@ FileServiceDep = Annotated[FileService, Depends(get_file_service)]
 )
 async def get_files(
         user_uid: Annotated[str, Header(alias="X-User-Id")],
-        fs: FileServiceDep):
+        fs: FileServiceDep,
+        if_none_match: Annotated[Optional[str], Header(alias="If-None-Match")] = None):
     logger.debug(f"Request to get a files from user {user_uid}")
 
     try:
@@ -43,18 +68,17 @@ async def get_files(
         raise HTTPException(status_code=400, detail="Invalid file ID format")
 
     try:
-        # Getting files
-        files: list[File] = await fs.get_files(user_uid)
+        version = await fs.get_listing_version(user_uid)
+        etag = fs.listing_etag(version)
+        if fs.listing_not_modified(etag, if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
-        # If there are no files, we return an empty list.
-        if not files:
-            logger.info(f"No files found for user {str(user_uid)[:8]}")
-            return FilesResponse(files={})
+        # The ETag comes with the cached body (the version it was read at), and a body
+        # older than the current version is loaded again
+        etag, body = await fs.get_files_listing_json(user_uid, min_version=version)
 
-        # Conversion to response
-        response: FilesResponse = FilesMapper.to_pydantic(files)
-        logger.debug(f"Successfully retrieved {len(files)} files for user {str(user_uid)[:8]}")
-        return response
+        logger.debug(f"Successfully retrieved the file listing ({len(body)} bytes) for user {str(user_uid)[:8]}")
+        return JSONBytesResponse(body, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
 
     except FileGetError as e:
         logger.error(f"File service error for user {str(user_uid)[:8]}: {str(e)}")
@@ -79,4 +103,247 @@ async def get_files(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
-        )
\ No newline at end of file
+        )
+
+
+@router.get(
+    "/file/page",
+    summary="Get a page of user files",
+    description="Retrieve the user files ordered by creation, one page at a time, with optional filters",
+    response_model=FilesPageResponse,
+    responses=FileResponses.get_responses(),
+    operation_id="get_user_files_page"
+)
+async def get_files_page(
+        user_uid: Annotated[str, Header(alias="X-User-Id")],
+        fs: FileServiceDep,
+        limit: Annotated[int, Query(ge=1, le=config.get("FILE_LIST_MAX_LIMIT", 1000))] = config.get("FILE_LIST_DEFAULT_LIMIT", 100),
+        after: Annotated[Optional[str], Query(description="Cursor returned with the previous page")] = None,
+        extension: Annotated[Optional[str], Query(max_length=50)] = None,
+        mime_type: Annotated[Optional[str], Query(max_length=100)] = None,
+        created_from: Annotated[Optional[datetime], Query()] = None,
+        created_to: Annotated[Optional[datetime], Query()] = None):
+    logger.debug(f"Request to get a files page from user {user_uid}")
+
+    try:
+        user_uid = UUID(user_uid)
+        after = UUID(after) if after else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID or cursor format")
+
+    file_filter = FileListFilter(
+        extension=extension.lstrip(".").lower() if extension else None,
+        mime_type=mime_type,
+        created_from=created_from,
+        created_to=created_to
+    )
+
+    try:
+        rows, next_cursor = await fs.get_file_rows(user_uid, limit, after, file_filter)
+        logger.debug(f"Successfully retrieved {len(rows)} files for user {str(user_uid)[:8]}")
+        return JSONBytesResponse(FilesMapper.rows_to_json_page(rows, next_cursor))
+
+    except FileGetError as e:
+        logger.error(f"File service error for user {str(user_uid)[:8]}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Temporary service unavailable. Please try again later."
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error getting files page for user {str(user_uid)[:8]}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get(
+    "/file/changes",
+    summary="Get user file changes",
+    description="Retrieve the files created, updated or deleted since a cursor. "
+                "Call without `since` to get the current cursor before the initial listing.",
+    response_model=FileChangesResponse,
+    operation_id="get_user_file_changes"
+)
+async def get_file_changes(
+        user_uid: Annotated[str, Header(alias="X-User-Id")],
+        fs: FileServiceDep,
+        since: Annotated[Optional[str], Query(description="Cursor returned by the previous call")] = None,
+        limit: Annotated[int, Query(ge=1, le=config.get("FILE_CHANGES_MAX_LIMIT", 5000))] = config.get("FILE_CHANGES_DEFAULT_LIMIT", 500)):
+    logger.debug(f"Request to get file changes from user {user_uid}")
+
+    try:
+        user_uid = UUID(user_uid)
+        since = UUID(since) if since else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID or cursor format")
+
+    try:
+        rows, cursor, has_more = await fs.get_file_changes(user_uid, since, limit)
+        logger.debug(f"Successfully retrieved {len(rows)} file changes for user {str(user_uid)[:8]}")
+        return FilesMapper.change_rows_to_pydantic(rows, cursor, has_more)
+
+    except FileChangesExpiredError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor expired, re-list the files and start from a new cursor"
+        )
+    except FileGetError as e:
+        logger.error(f"File service error for user {str(user_uid)[:8]}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Temporary service unavailable. Please try again later."
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error getting file changes for user {str(user_uid)[:8]}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get(
+    "/file/{file_uid}/uploads/{upload_id}",
+    summary="Get upload offset",
+    description="Returns the number of bytes committed to a resumable upload session",
+    response_model=UploadSessionResponse
+)
+async def get_upload_session(
+        response: Response,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep
+):
+    try:
+        session = await fs.get_upload_session(user_file_id_pair, upload_id)
+        response.headers["Upload-Offset"] = str(session.offset)
+        return UploadSessionResponse(
+            upload_id=str(session.upload_id),
+            file_uid=str(user_file_id_pair.file_uid),
+            offset=session.offset,
+            total_size=session.total_size
+        )
+    except (FileAccessError, UploadSessionNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error getting upload session: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+
+@router.get(
+    "/file/{file_uid}/multipart/{upload_id}",
+    summary="Get multi-part upload manifest",
+    description="Returns the parts of a parallel multi-part upload received so far",
+    response_model=MultipartUploadResponse
+)
+async def get_multipart_upload(
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep
+):
+    try:
+        session, parts = await fs.get_upload_parts(user_file_id_pair, upload_id)
+        return MultipartUploadResponse(
+            upload_id=str(session.upload_id),
+            file_uid=str(user_file_id_pair.file_uid),
+            total_size=session.total_size,
+            uploaded_size=session.offset,
+            max_parallel_parts=config.get("UPLOAD_MAX_PARALLEL_PARTS", 8),
+            parts=[UploadPartResponse(part_number=number, size=size) for number, size in parts.items()]
+        )
+    except (FileAccessError, UploadSessionNotFoundError, UploadPartError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error getting multi-part upload: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+
+@router.get(
+    "/file/{file_uid}/content",
+    summary="Download file content",
+    description="Returns the file content with Range, If-Range and If-None-Match support",
+    response_class=FileResponse
+)
+async def get_file_content(
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        if_none_match: Annotated[Optional[str], Header(alias="If-None-Match")] = None,
+        range_header: Annotated[Optional[str], Header(alias="Range")] = None,
+        if_range: Annotated[Optional[str], Header(alias="If-Range")] = None
+):
+    logger.debug(f"Request to download a file from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        content = await fs.get_file_content(user_file_id_pair)
+    except FileAccessError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found or access denied"
+        )
+    except ServiceRepositoryError as e:
+        logger.error(f"Database error for user {str(user_file_id_pair.user_uid)[:8]}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Temporary service unavailable. Please try again later."
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error getting file content: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+    if fs.is_not_modified(content, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": content.etag})
+
+    # Parsed here for both backends, so an invalid range is ignored as RFC 9110 asks
+    size = content.stat.st_size
+    try:
+        byte_range = fs.get_content_range(content, range_header, if_range)
+    except FileRangeError:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+
+    media_type = content.file.mime_type or "application/octet-stream"
+    headers = {"ETag": content.etag, "Cache-Control": "private, no-cache"}
+    if content.local:
+        # FileResponse serves the range (honouring If-Range against our ETag) and uses sendfile when available
+        response_class = FileResponse if byte_range else _WholeFileResponse
+        return response_class(
+            content.path,
+            media_type=media_type,
+            filename=content.file.filename,
+            stat_result=content.stat,
+            headers=headers
+        )
+
+    # Content held by an object store is streamed through, serving a single range
+    start, end = byte_range or (0, size - 1)
+    headers.update({
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(content.file.filename)}",
+    })
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        fs.read_content(content, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=media_type,
+        headers=headers
+    )
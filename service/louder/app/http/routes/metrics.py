@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from core.logger import Logger
+from app.services.file import FileCacheService, FsyncBatcher
+from app.services.io_executor import StorageIOExecutor
+from app.services.token_introspection import TokenIntrospectionService
+from app.tasks import EventLoopLagMonitor
+
+
+router = APIRouter(prefix="/api/v1/loader/metrics", tags=["Metrics"])
+logger = Logger.get_logger(__name__)
+
+
+@router.get(
+    "",
+    summary="Get service metrics",
+    description="Counters of the worker caches, storage I/O and event loop, for tuning their sizes, TTLs and thread counts. Requires the service key as bearer token"
+)
+async def get_metrics(key: bool = Depends(TokenIntrospectionService.has_service_key)):
+    return {
+        "file_list_cache": FileCacheService().stats(),
+        "fsync": FsyncBatcher().stats(),
+        "storage_io": StorageIOExecutor().stats(),
+        "event_loop": EventLoopLagMonitor().stats(),
+    }
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request, Response
+from uuid6 import UUID
+from typing import Annotated
+
+from core.dto.user_file_id_pair import UserFileIDPair
+from core.depends.domain import get_user_file_id_pair, get_upload_id
+from core.logger import Logger
+from core.depends.service import get_file_service
+from app.services.file import FileService
+from app.http.response_models.file import UploadSessionResponse
+from core.exceptions import *
+
+
+router = APIRouter(prefix="/api/v1/loader/file", tags=["Loader"])
+logger = Logger.get_logger(__name__)
+FileServiceDep = Annotated[FileService, Depends(get_file_service)]
+UserFileIDPairDep = Annotated[UserFileIDPair, Depends(get_user_file_id_pair)]
+UploadIDDep = Annotated[UUID, Depends(get_upload_id)]
+
+
+@router.patch(
+    "/{file_uid}/uploads/{upload_id}",
+    summary="Upload a byte range",
+    description="Appends the raw request body to a resumable upload at the offset given in Upload-Offset",
+    response_model=UploadSessionResponse
+)
+async def upload_chunk(
+        request: Request,
+        response: Response,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep,
+        offset: Annotated[int, Header(alias="Upload-Offset", ge=0)]
+):
+    logger.debug(f"Request to upload a chunk at offset {offset} from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        session = await fs.append_upload_chunk(user_file_id_pair, upload_id, offset, request.stream())
+        response.headers["Upload-Offset"] = str(session.offset)
+        return UploadSessionResponse(
+            upload_id=str(session.upload_id),
+            file_uid=str(user_file_id_pair.file_uid),
+            offset=session.offset,
+            total_size=session.total_size
+        )
+    except (FileAccessError, UploadSessionNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except (UploadOffsetError, UploadPartError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except FileSizeLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error uploading chunk: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during chunk upload"
+        )
@@ -1,19 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Header
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Header, Request
+from starlette.datastructures import UploadFile as StarletteUploadFile
 from uuid6 import UUID
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Optional
 
 from core.data_mapper.files.file import FileMapper
 from core.dto.user_file_id_pair import UserFileIDPair
-from core.depends.domain import get_user_file_id_pair
+from core.dto.content_challenge import ContentChallenge
+from core.depends.domain import get_user_file_id_pair, get_upload_id
 from core.logger import Logger
 from core.db.db import get_db
 from core.depends.service import get_file_service
 from app.services.file import FileService
-from app.http.request_models.file import CreateFileRequest
+from app.http.request_models.file import (
+    CreateFileRequest,
+    CreateFilesBatchRequest,
+    CreateUploadSessionRequest,
+    CompleteMultipartUploadRequest,
+    HashNegotiationRequest
+)
 from documentation.swagger.file.file_post import FileCreationResponses
-from app.http.response_models.file import CreateFileResponse
+from app.http.response_models.file import (
+    CreateFileResponse,
+    CreateFilesBatchResponse,
+    MultiFileUploadResponse,
+    UploadResultResponse,
+    UploadSessionResponse,
+    MultipartUploadResponse,
+    HashNegotiationResponse,
+    ContentChallengeResponse
+)
 from core.exceptions import *
+from core import config
 
 
 router = APIRouter(prefix="/api/v1/loader/file", tags=["Loader"])
@@ -21,6 +39,7 @@ logger = Logger.get_logger(__name__)
 FileServiceDep = Annotated[FileService, Depends(get_file_service)]
 UserFileIDPairDep = Annotated[UserFileIDPair, Depends(get_user_file_id_pair)]
 DBDep = Annotated[Session, Depends(get_db)]
+UploadIDDep = Annotated[UUID, Depends(get_upload_id)]
 
 
 @router.post(
@@ -80,6 +99,104 @@ async def create_file(
         )
 
 
+@router.post(
+    "/batch",
+    summary="Create several files",
+    description="Creates files for the authenticated user in one transaction and returns their UUIDs in order",
+    status_code=status.HTTP_201_CREATED,
+    response_model=CreateFilesBatchResponse
+)
+async def create_files(
+        batch_request: CreateFilesBatchRequest,
+        user_id: Annotated[str, Header(alias="X-User-Id")],
+        fs: FileServiceDep):
+
+    logger.debug(f"Request to create {len(batch_request.file_names)} files from user {user_id[:10]}")
+    try:
+        user_uid = UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
+
+    try:
+        file_uids = await fs.create_files(batch_request.file_names, user_uid)
+        return CreateFilesBatchResponse(file_uids=[str(file_uid) for file_uid in file_uids])
+
+    except FileCreationError as e:
+        if isinstance(e.__cause__, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Invalid request data: {str(e.__cause__)}"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="File creation process failed"
+        )
+
+    except Exception as e:
+        logger.error(f"Error creating files: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during file creation"
+        )
+
+
+@router.post(
+    "/batch/upload",
+    summary="Upload several files",
+    description="Uploads many files in one multipart request. The name of every file field "
+                "is the UUID of an existing file of the user; results are returned per file.",
+    response_model=MultiFileUploadResponse
+)
+async def upload_files(
+        request: Request,
+        user_id: Annotated[str, Header(alias="X-User-Id")],
+        fs: FileServiceDep):
+
+    logger.debug(f"Request to upload several files from user {user_id[:10]}")
+    try:
+        user_uid = UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
+
+    max_files = config.get("FILE_BATCH_MAX_FILES", 1000)
+    async with request.form(max_files=max_files, max_fields=max_files) as form:
+        uploads = []
+        for field_name, value in form.multi_items():
+            if not isinstance(value, StarletteUploadFile):
+                continue
+            try:
+                uploads.append((UUID(field_name), value))
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid file ID format: {field_name[:36]}")
+        if not uploads:
+            raise HTTPException(status_code=400, detail="No files in the request")
+
+        try:
+            results = await fs.save_files(user_uid, uploads)
+        except FileCreationError as e:
+            logger.error(f"Multi-file upload failed: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Storage service temporarily unavailable"
+            )
+        except Exception as e:
+            logger.error(f"Error uploading files: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error during file upload"
+            )
+
+    return MultiFileUploadResponse(results=[
+        UploadResultResponse(
+            file_uid=str(result.file_uid),
+            uploaded=result.ok,
+            file=FileMapper.to_pydantic(result.file) if result.ok else None,
+            error=result.error
+        )
+        for result in results
+    ])
+
+
 @router.post("/{file_uid}")
 async def upload_file(
         file: Annotated[UploadFile, File(...)],
@@ -91,9 +208,250 @@ async def upload_file(
         file = await fs.save_file(user_file_id_pair, file)
         file = FileMapper.to_pydantic(file)
         return file
+    except FileSizeLimitError as e:
+        logger.warning(f"Rejected upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds the maximum allowed size"
+        )
     except Exception as e:
         logger.error(f"Error uploading file: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during file upload"
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/{file_uid}/uploads",
+    summary="Start a resumable upload",
+    description="Opens a resumable upload session for an existing file",
+    status_code=status.HTTP_201_CREATED,
+    response_model=UploadSessionResponse
+)
+async def create_upload_session(
+        session_request: CreateUploadSessionRequest,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep
+):
+    logger.debug(f"Request to start an upload from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        session = await fs.create_upload_session(
+            user_file_id_pair,
+            file_name=session_request.file_name,
+            mime_type=session_request.mime_type,
+            total_size=session_request.total_size
+        )
+        return UploadSessionResponse(
+            upload_id=str(session.upload_id),
+            file_uid=str(user_file_id_pair.file_uid),
+            offset=session.offset,
+            total_size=session.total_size
+        )
+    except FileAccessError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found or access denied"
+        )
+    except FileSizeLimitError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds the maximum allowed size"
+        )
+    except ServiceToolsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid request data: {str(e)}"
+        )
+    except ServiceRepositoryError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Storage service temporarily unavailable"
+        )
+    except Exception as e:
+        logger.error(f"Error starting upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during upload start"
+        )
+
+
+@router.post(
+    "/{file_uid}/uploads/{upload_id}/complete",
+    summary="Finalize a resumable upload",
+    description="Moves the received content into the file storage and updates the file metadata"
+)
+async def finalize_upload(
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep
+):
+    logger.debug(f"Request to finalize an upload from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        file = await fs.finalize_upload(user_file_id_pair, upload_id)
+        return FileMapper.to_pydantic(file)
+    except (FileAccessError, UploadSessionNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except (UploadOffsetError, UploadPartError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error finalizing upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during upload finalizing"
+        )
+
+
+
+@router.post(
+    "/{file_uid}/multipart",
+    summary="Start a parallel multi-part upload",
+    description="Opens an upload session whose numbered parts can be uploaded concurrently",
+    status_code=status.HTTP_201_CREATED,
+    response_model=MultipartUploadResponse
+)
+async def create_multipart_upload(
+        session_request: CreateUploadSessionRequest,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep
+):
+    logger.debug(f"Request to start a multi-part upload from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        session = await fs.create_upload_session(
+            user_file_id_pair,
+            file_name=session_request.file_name,
+            mime_type=session_request.mime_type,
+            total_size=session_request.total_size,
+            multipart=True
+        )
+        return MultipartUploadResponse(
+            upload_id=str(session.upload_id),
+            file_uid=str(user_file_id_pair.file_uid),
+            total_size=session.total_size,
+            max_parallel_parts=config.get("UPLOAD_MAX_PARALLEL_PARTS", 8)
+        )
+    except FileAccessError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found or access denied"
+        )
+    except FileSizeLimitError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds the maximum allowed size"
+        )
+    except ServiceToolsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid request data: {str(e)}"
+        )
+    except ServiceRepositoryError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Storage service temporarily unavailable"
+        )
+    except Exception as e:
+        logger.error(f"Error starting multi-part upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during upload start"
+        )
+
+
+@router.post(
+    "/{file_uid}/multipart/{upload_id}/complete",
+    summary="Complete a parallel multi-part upload",
+    description="Assembles the uploaded parts into the file and updates the file metadata"
+)
+async def complete_multipart_upload(
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep,
+        complete_request: Optional[CompleteMultipartUploadRequest] = None
+):
+    logger.debug(f"Request to complete a multi-part upload from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        file = await fs.complete_multipart_upload(
+            user_file_id_pair,
+            upload_id,
+            part_numbers=complete_request.parts if complete_request else None
+        )
+        return FileMapper.to_pydantic(file)
+    except (FileAccessError, UploadSessionNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except UploadPartError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except FileSizeLimitError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds the maximum allowed size"
+        )
+    except Exception as e:
+        logger.error(f"Error completing multi-part upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during upload completion"
+        )
+
+
+
+@router.post(
+    "/{file_uid}/hash",
+    summary="Negotiate an upload by content hash",
+    description="Links the file to content the server already holds; otherwise reports that an upload is required",
+    response_model=HashNegotiationResponse
+)
+async def negotiate_upload(
+        negotiation_request: HashNegotiationRequest,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep
+):
+    logger.debug(f"Request to negotiate an upload from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        file = await fs.link_known_content(
+            user_file_id_pair,
+            file_name=negotiation_request.file_name,
+            content_hash=negotiation_request.content_hash.lower(),
+            size=negotiation_request.size,
+            mime_type=negotiation_request.mime_type,
+            challenge_token=negotiation_request.challenge_token,
+            challenge_proof=negotiation_request.challenge_proof
+        )
+        if file is None:
+            return HashNegotiationResponse(upload_required=True)
+        if isinstance(file, ContentChallenge):
+            return HashNegotiationResponse(
+                upload_required=True,
+                challenge=ContentChallengeResponse(
+                    token=file.token, offset=file.offset, length=file.length, nonce=file.nonce
+                )
+            )
+        return HashNegotiationResponse(upload_required=False, file=FileMapper.to_pydantic(file))
+    except FileAccessError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found or access denied"
+        )
+    except FileSizeLimitError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds the maximum allowed size"
+        )
+    except Exception as e:
+        logger.error(f"Error negotiating upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during upload negotiation"
+        )
@@ -0,0 +1,109 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request, Path
+from uuid6 import UUID
+from typing import Annotated, Optional
+from urllib.parse import unquote
+
+from core.data_mapper.files.file import FileMapper
+from core.dto.user_file_id_pair import UserFileIDPair
+from core.depends.domain import get_user_file_id_pair, get_upload_id
+from core.logger import Logger
+from core.depends.service import get_file_service
+from app.services.file import FileService
+from app.http.response_models.file import UploadPartResponse
+from core.exceptions import *
+from core import config
+
+
+router = APIRouter(prefix="/api/v1/loader/file", tags=["Loader"])
+logger = Logger.get_logger(__name__)
+FileServiceDep = Annotated[FileService, Depends(get_file_service)]
+UserFileIDPairDep = Annotated[UserFileIDPair, Depends(get_user_file_id_pair)]
+UploadIDDep = Annotated[UUID, Depends(get_upload_id)]
+
+
+@router.put(
+    "/{file_uid}/content",
+    summary="Upload raw file content",
+    description="Streams the raw request body straight into the file storage, bypassing multipart parsing"
+)
+async def upload_file_content(
+        request: Request,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        file_name: Annotated[str, Header(alias="X-File-Name")],
+        content_type: Annotated[Optional[str], Header(alias="Content-Type")] = None,
+        content_length: Annotated[Optional[int], Header(alias="Content-Length")] = None
+):
+    logger.debug(f"Request to upload a file content from user {str(user_file_id_pair.user_uid)[:8]}")
+
+    # The name is percent-encoded by clients, since headers are limited to latin-1
+    file_name = unquote(file_name).strip()
+    if not file_name:
+        raise HTTPException(status_code=400, detail="File name cannot be empty")
+
+    try:
+        file = await fs.save_file_stream(
+            user_file_id_pair,
+            request.stream(),
+            file_name=file_name,
+            mime_type=content_type,
+            content_length=content_length
+        )
+        return FileMapper.to_pydantic(file)
+    except FileSizeLimitError as e:
+        logger.warning(f"Rejected upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds the maximum allowed size"
+        )
+    except Exception as e:
+        logger.error(f"Error uploading file content: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during file upload"
+        )
+
+
+@router.put(
+    "/{file_uid}/multipart/{upload_id}/parts/{part_number}",
+    summary="Upload a numbered part",
+    description="Streams the raw request body into one part of a parallel multi-part upload",
+    response_model=UploadPartResponse
+)
+async def upload_part(
+        request: Request,
+        fs: FileServiceDep,
+        user_file_id_pair: UserFileIDPairDep,
+        upload_id: UploadIDDep,
+        part_number: Annotated[int, Path(ge=1, le=config.get("UPLOAD_MAX_PART_NUMBER", 10000))]
+):
+    logger.debug(f"Request to upload part {part_number} from user {str(user_file_id_pair.user_uid)[:8]}")
+    try:
+        size = await fs.upload_part(user_file_id_pair, upload_id, part_number, request.stream())
+        return UploadPartResponse(part_number=part_number, size=size)
+    except (FileAccessError, UploadSessionNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found"
+        )
+    except UploadPartError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except UploadConcurrencyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)
+        )
+    except FileSizeLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error uploading part: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during part upload"
+        )
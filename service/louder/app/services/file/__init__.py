@@ -2,6 +2,8 @@ from .storage import FileStorageService
 from .tools import FileToolsService
 from .data import FileDataService
 from .repository import FileRepositoryService
+from .cache import FileCacheService
+from .fsync import FsyncBatcher
 from .file import FileService
 
 __all__ = [
@@ -9,5 +11,7 @@ __all__ = [
     'FileToolsService',
     'FileRepositoryService',
     'FileService',
-    'FileDataService'
+    'FileDataService',
+    'FileCacheService',
+    'FsyncBatcher'
 ]
\ No newline at end of file
@@ -0,0 +1,9 @@
+from .base import StorageBackend
+from .local import LocalStorageBackend
+from .s3 import S3StorageBackend
+
+__all__ = [
+    'StorageBackend',
+    'LocalStorageBackend',
+    'S3StorageBackend',
+]
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Optional
+import os
+import stat
+
+
+class StorageBackend(ABC):
+    """
+    Store of the committed file contents and blobs.
+
+    Contents are addressed by the storage path PathMaster resolves for them;
+    an object store maps the path to a key under its root. Uploads are still
+    received and staged on local disk and handed over with put_file.
+    """
+
+    # Contents are local files, which can be served with sendfile, hard-linked and migrated
+    is_local: bool = True
+
+    @abstractmethod
+    async def put_stream(self, path: Path, chunks: AsyncIterator[bytes]) -> int:
+        """Stores a stream of chunks, replacing the content atomically, and returns its size"""
+        pass
+
+    @abstractmethod
+    async def put_file(self, path: Path, source: Path) -> None:
+        """Moves a local staged file in, replacing the content atomically"""
+        pass
+
+    @abstractmethod
+    def get_range(self, path: Path, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Reads the bytes from start to end inclusive (to the end of the content by default)"""
+        pass
+
+    @abstractmethod
+    async def stat(self, path: Path) -> Optional[os.stat_result]:
+        """Size and modification time of the content, None if it does not exist"""
+        pass
+
+    @abstractmethod
+    async def delete(self, path: Path) -> bool:
+        """Deletes the content, True if deleted or missing"""
+        pass
+
+    @abstractmethod
+    async def move(self, source: Path, target: Path) -> None:
+        """Moves a content to another path, replacing the target"""
+        pass
+
+    async def exists(self, path: Path) -> bool:
+        return await self.stat(path) is not None
+
+    async def close(self) -> None:
+        """Releases the pooled connections"""
+        pass
+
+    @staticmethod
+    def make_stat(size: int, mtime_ns: int) -> os.stat_result:
+        """Stat result of a content that is not a local file"""
+        mtime = mtime_ns / 1e9
+        return os.stat_result(
+            (stat.S_IFREG | 0o644, 0, 0, 1, 0, 0, size, mtime, mtime, mtime),
+            {"st_atime_ns": mtime_ns, "st_mtime_ns": mtime_ns, "st_ctime_ns": mtime_ns}
+        )
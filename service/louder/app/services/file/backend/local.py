@@ -0,0 +1,155 @@
+from core.exceptions import ServiceStorageError
+from core.logger import Logger
+from app.services.file.backend.base import StorageBackend
+from app.services.file.fsync import FsyncBatcher
+from app.services.io_executor import StorageIOExecutor
+
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional
+from uuid6 import uuid7
+import aiofiles
+import errno
+import os
+
+logger = Logger.get_logger(__name__)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Contents stored as files on the local volumes.
+
+    Blocking calls run in the storage I/O executor and new contents are
+    synced according to the STORAGE_FSYNC policy.
+    """
+
+    is_local = True
+
+    def __init__(self, chunk_size: int = 1024 * 1024):
+        self._chunk_size = chunk_size
+        self._io = StorageIOExecutor()
+        self._fsync = FsyncBatcher()
+
+    async def put_stream(self, path: Path, chunks: AsyncIterator[bytes]) -> int:
+        tmp_path = path.with_name(f"{path.name}.tmp.{uuid7()}")
+        written = 0
+        try:
+            await self._io.run(path.parent.mkdir, parents=True, exist_ok=True)
+            async with aiofiles.open(tmp_path, "wb", executor=self._io.executor) as buffer:
+                async for chunk in chunks:
+                    written += len(chunk)
+                    await buffer.write(chunk)
+            await self._fsync.sync_file(tmp_path)
+            await self._io.run(os.replace, tmp_path, path)
+        except BaseException:
+            await self._io.run(tmp_path.unlink, missing_ok=True)
+            raise
+        await self._fsync.sync_dir(path.parent)
+        return written
+
+    async def put_file(self, path: Path, source: Path) -> None:
+        await self._io.run(path.parent.mkdir, parents=True, exist_ok=True)
+        await self._io.run(self.move_file, source, path, self._fsync.sync_file_now)
+        await self._fsync.sync_dir(path.parent)
+
+    async def get_range(self, path: Path, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        remaining = None if end is None else end - start + 1
+        async with aiofiles.open(path, "rb", executor=self._io.executor) as f:
+            await f.seek(start)
+            while remaining is None or remaining > 0:
+                size = self._chunk_size if remaining is None else min(self._chunk_size, remaining)
+                chunk = await f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def stat(self, path: Path) -> Optional[os.stat_result]:
+        try:
+            return await self._io.run(path.stat)
+        except FileNotFoundError:
+            return None
+
+    async def delete(self, path: Path) -> bool:
+        try:
+            await self._io.run(path.unlink, missing_ok=True)
+            return True
+        except OSError as e:
+            logger.error(f"Error deleting file {path}: {e}")
+            return False
+
+    async def move(self, source: Path, target: Path) -> None:
+        await self.put_file(target, source)
+
+    @staticmethod
+    def link_or_copy(source: Path, target: Path, sync: Callable[[int], None]) -> None:
+        """Hard-linking a file, copying it when the target is on another volume (blocking)"""
+        try:
+            os.link(source, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            LocalStorageBackend.copy_file(source, target, sync)
+
+    @staticmethod
+    def move_file(source: Path, target: Path, sync: Callable[[int], None], drop_if_deleted: bool = False) -> None:
+        """
+        Renaming a file, copying it when the target is on another volume (blocking)
+
+        The copy goes to a temporary name first, so the target is never seen partial.
+
+        Args:
+            source: The file to move
+            target: Its new path, replaced if it exists
+            sync: Syncs the copied descriptor
+            drop_if_deleted: Remove the copy again if the source was deleted while being copied
+        """
+        try:
+            os.replace(source, target)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        tmp_path = target.with_name(f"{target.name}.tmp.{uuid7()}")
+        try:
+            LocalStorageBackend.copy_file(source, tmp_path, sync)
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        if drop_if_deleted and not source.exists():
+            target.unlink(missing_ok=True)
+            return
+        source.unlink(missing_ok=True)
+
+    @staticmethod
+    def copy_file(source: Path, target: Path, sync: Callable[[int], None]) -> int:
+        """Copying a file with in-kernel copies, then syncing it (blocking)"""
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            copied = LocalStorageBackend.copy_fd(src.fileno(), dst.fileno(), os.fstat(src.fileno()).st_size)
+            sync(dst.fileno())
+        return copied
+
+    @staticmethod
+    def copy_fd(src_fd: int, dst_fd: int, count: int) -> int:
+        """Copying count bytes between descriptors without user-space buffers"""
+        copied = 0
+        use_copy_file_range = hasattr(os, "copy_file_range")
+        while copied < count:
+            try:
+                if use_copy_file_range:
+                    n = os.copy_file_range(src_fd, dst_fd, count - copied)
+                else:
+                    n = os.sendfile(dst_fd, src_fd, None, count - copied)
+            except OSError:
+                if not use_copy_file_range:
+                    raise
+                # e.g. EXDEV on old kernels, fall back to sendfile
+                use_copy_file_range = False
+                continue
+            if n == 0:
+                break
+            copied += n
+        if copied != count:
+            raise ServiceStorageError(f"Short copy: {copied} of {count} bytes")
+        return copied
@@ -0,0 +1,256 @@
+from core.exceptions import ServiceStorageError
+from core.logger import Logger
+from app.services.file.backend.base import StorageBackend
+from app.services.io_executor import StorageIOExecutor
+
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+import asyncio
+import os
+
+logger = Logger.get_logger(__name__)
+
+# Largest object CopyObject accepts, larger ones are copied part by part
+_MAX_COPY_SIZE = 5 * 1024 ** 3
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Contents stored in an S3-compatible object store (AWS S3, MinIO, Ceph RGW...).
+
+    Requires the optional `aiobotocore` package. A storage path is mapped to
+    the key of its path relative to the storage root, under the key prefix.
+    One client per process keeps a pool of max_connections HTTP connections;
+    contents larger than part_size are sent as multipart uploads with
+    upload_concurrency parts in flight, and an interrupted upload is aborted.
+    """
+
+    is_local = False
+
+    def __init__(
+            self,
+            bucket: str,
+            root: Path,
+            prefix: str = "",
+            endpoint_url: Optional[str] = None,
+            region: Optional[str] = None,
+            access_key: Optional[str] = None,
+            secret_key: Optional[str] = None,
+            part_size: int = 8 * 1024 * 1024,
+            max_connections: int = 32,
+            upload_concurrency: int = 4,
+            chunk_size: int = 1024 * 1024
+    ):
+        try:
+            from aiobotocore.session import get_session
+            from botocore.config import Config
+        except ImportError as e:
+            raise RuntimeError("The s3 storage backend requires the 'aiobotocore' package") from e
+
+        self._bucket = bucket
+        self._root = root
+        self._prefix = prefix.strip("/")
+        # S3 rejects multipart parts under 5 MiB, except the last one
+        self._part_size = max(part_size, 5 * 1024 * 1024)
+        self._upload_concurrency = upload_concurrency
+        self._chunk_size = chunk_size
+        self._session = get_session()
+        self._client_kwargs = {
+            "endpoint_url": endpoint_url,
+            "region_name": region,
+            "aws_access_key_id": access_key,
+            "aws_secret_access_key": secret_key,
+            "config": Config(
+                max_pool_connections=max_connections,
+                # Path-style addressing works with local stand-ins without DNS per bucket
+                s3={"addressing_style": "path"} if endpoint_url else None,
+                retries={"max_attempts": 3, "mode": "standard"}
+            ),
+        }
+        self._client = None
+        self._client_lock = asyncio.Lock()
+        self._exit_stack = AsyncExitStack()
+        self._io = StorageIOExecutor()
+
+    async def _get_client(self):
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = await self._exit_stack.enter_async_context(
+                        self._session.create_client("s3", **self._client_kwargs)
+                    )
+        return self._client
+
+    def _key(self, path: Path) -> str:
+        try:
+            relative = path.relative_to(self._root).as_posix()
+        except ValueError:
+            raise ServiceStorageError(f"Path {path} is outside the storage root {self._root}")
+        return f"{self._prefix}/{relative}" if self._prefix else relative
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    async def put_stream(self, path: Path, chunks: AsyncIterator[bytes]) -> int:
+        buffer = bytearray()
+        upload = None
+        written = 0
+        try:
+            async for chunk in chunks:
+                written += len(chunk)
+                buffer += chunk
+                if len(buffer) >= self._part_size:
+                    if upload is None:
+                        upload = await _MultipartUpload.start(await self._get_client(), self._bucket, self._key(path))
+                    await upload.add_part(bytes(buffer))
+                    buffer.clear()
+            if upload is None:
+                client = await self._get_client()
+                await client.put_object(Bucket=self._bucket, Key=self._key(path), Body=bytes(buffer))
+            else:
+                if buffer:
+                    await upload.add_part(bytes(buffer))
+                await upload.complete()
+        except BaseException:
+            if upload is not None:
+                await upload.abort()
+            raise
+        return written
+
+    async def put_file(self, path: Path, source: Path) -> None:
+        size = (await self._io.run(source.stat)).st_size
+        key = self._key(path)
+        client = await self._get_client()
+        if size <= self._part_size:
+            body = await self._io.run(source.read_bytes)
+            await client.put_object(Bucket=self._bucket, Key=key, Body=body)
+        else:
+            upload = await _MultipartUpload.start(client, self._bucket, key)
+            semaphore = asyncio.Semaphore(self._upload_concurrency)
+
+            async def send(number: int, offset: int) -> None:
+                async with semaphore:
+                    body = await self._io.run(self._read_part, source, offset, self._part_size)
+                    await upload.add_part(body, number)
+
+            try:
+                await asyncio.gather(*(
+                    send(number, offset)
+                    for number, offset in enumerate(range(0, size, self._part_size), start=1)
+                ))
+                await upload.complete()
+            except BaseException:
+                await upload.abort()
+                raise
+        await self._io.run(source.unlink, missing_ok=True)
+        logger.debug(f"Uploaded {size} bytes to s3://{self._bucket}/{key}")
+
+    @staticmethod
+    def _read_part(source: Path, offset: int, size: int) -> bytes:
+        with open(source, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    async def get_range(self, path: Path, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        if end is not None and end < start:
+            return
+        client = await self._get_client()
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        response = await client.get_object(Bucket=self._bucket, Key=self._key(path), Range=byte_range)
+        body = response["Body"]
+        try:
+            while chunk := await body.read(self._chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def stat(self, path: Path) -> Optional[os.stat_result]:
+        client = await self._get_client()
+        try:
+            head = await client.head_object(Bucket=self._bucket, Key=self._key(path))
+        except Exception as e:
+            if self._is_not_found(e):
+                return None
+            raise
+        mtime_ns = int(head["LastModified"].timestamp() * 1e9)
+        return self.make_stat(head["ContentLength"], mtime_ns)
+
+    async def delete(self, path: Path) -> bool:
+        client = await self._get_client()
+        try:
+            await client.delete_object(Bucket=self._bucket, Key=self._key(path))
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting object {self._key(path)}: {e}")
+            return False
+
+    async def move(self, source: Path, target: Path) -> None:
+        """Server-side copy, then delete of the source"""
+        client = await self._get_client()
+        source_key = self._key(source)
+        target_key = self._key(target)
+        copy_source = {"Bucket": self._bucket, "Key": source_key}
+
+        size = (await client.head_object(Bucket=self._bucket, Key=source_key))["ContentLength"]
+        if size <= _MAX_COPY_SIZE:
+            await client.copy_object(Bucket=self._bucket, Key=target_key, CopySource=copy_source)
+        else:
+            upload = await _MultipartUpload.start(client, self._bucket, target_key)
+            try:
+                for number, offset in enumerate(range(0, size, _MAX_COPY_SIZE), start=1):
+                    last = min(offset + _MAX_COPY_SIZE, size) - 1
+                    await upload.copy_part(copy_source, f"bytes={offset}-{last}", number)
+                await upload.complete()
+            except BaseException:
+                await upload.abort()
+                raise
+        await client.delete_object(Bucket=self._bucket, Key=source_key)
+
+    async def close(self) -> None:
+        await self._exit_stack.aclose()
+        self._client = None
+
+
+class _MultipartUpload:
+    """Parts of one multipart upload, completed in part number order"""
+
+    def __init__(self, client, bucket: str, key: str, upload_id: str):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._upload_id = upload_id
+        self._parts: List[dict] = []
+
+    @classmethod
+    async def start(cls, client, bucket: str, key: str) -> '_MultipartUpload':
+        response = await client.create_multipart_upload(Bucket=bucket, Key=key)
+        return cls(client, bucket, key, response["UploadId"])
+
+    async def add_part(self, body: bytes, number: Optional[int] = None) -> None:
+        number = number or len(self._parts) + 1
+        response = await self._client.upload_part(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=number, Body=body
+        )
+        self._parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    async def copy_part(self, copy_source: dict, byte_range: str, number: int) -> None:
+        response = await self._client.upload_part_copy(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=number,
+            CopySource=copy_source, CopySourceRange=byte_range
+        )
+        self._parts.append({"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]})
+
+    async def complete(self) -> None:
+        await self._client.complete_multipart_upload(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+            MultipartUpload={"Parts": sorted(self._parts, key=lambda part: part["PartNumber"])}
+        )
+
+    async def abort(self) -> None:
+        try:
+            await self._client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+        except Exception as e:
+            logger.warning(f"Failed to abort multipart upload of {self._key}: {e}")
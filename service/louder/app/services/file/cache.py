@@ -0,0 +1,181 @@
+from core.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from core.dto.cached_listing import CachedListing
+from core.logger import Logger
+from core import config
+from app.http.response_models.file import FilesResponse
+
+from typing import Awaitable, Callable, Dict, Optional
+from uuid6 import UUID
+
+logger = Logger.get_logger(__name__)
+
+
+class FileCacheService:
+    """
+    Singleton cache of the user file listing, keyed by user UID.
+
+    Write paths of FileService invalidate the entry of the user after their
+    commit. Every entry holds the listing version it was read at, which the
+    ETag of the served listing is derived from; the current version of the
+    user is cached separately, for conditional requests. The backend is the
+    in-process LRU+TTL cache by default, or Redis (FILE_LIST_CACHE_BACKEND =
+    "redis") to keep several workers coherent. With FILE_LIST_CACHE_ENCODED
+    the listing is cached as its encoded JSON bytes, served as they are,
+    rather than as a FilesResponse.
+
+    Attributes:
+        hits: Number of listings served from the cache
+        misses: Number of listings loaded from the database
+        invalidations: Number of invalidated entries
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init_cache()
+        return cls._instance
+
+    def _init_cache(self) -> None:
+        self._enabled: bool = config.get("FILE_LIST_CACHE_ENABLED", True)
+        self._encoded: bool = config.get("FILE_LIST_CACHE_ENCODED", True)
+        self._backend: CacheBackend = self._create_backend()
+        # Listing versions stay in process: a short TTL bounds staleness across workers
+        self._versions = MemoryCacheBackend(
+            max_entries=config.get("FILE_LIST_CACHE_MAX_USERS", 10000),
+            ttl=config.get("FILE_LIST_VERSION_TTL", 2)
+        )
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def caches_encoded(self) -> bool:
+        """Whether the cached listings are encoded JSON bytes"""
+        return self._encoded
+
+    def _create_backend(self) -> CacheBackend:
+        backend = config.get("FILE_LIST_CACHE_BACKEND", "memory")
+        ttl = config.get("FILE_LIST_CACHE_TTL", 30)
+        if backend == "redis":
+            logger.info("File listing cache uses the redis backend")
+            return RedisCacheBackend(
+                url=config.get("FILE_LIST_CACHE_REDIS_URL"),
+                ttl=ttl,
+                serializer=self._serialize_entry,
+                deserializer=self._deserialize_entry,
+                prefix="louder:files:"
+            )
+        return MemoryCacheBackend(max_entries=config.get("FILE_LIST_CACHE_MAX_USERS", 10000), ttl=ttl)
+
+    def _serialize_entry(self, entry: CachedListing) -> bytes:
+        """The version on the first line, then the listing JSON"""
+        body = entry.listing if self._encoded else entry.listing.model_dump_json().encode()
+        return b"%d\n" % entry.version + body
+
+    def _deserialize_entry(self, data: bytes) -> CachedListing:
+        version, body = data.split(b"\n", 1)
+        return CachedListing(
+            version=int(version),
+            listing=body if self._encoded else FilesResponse.model_validate_json(body)
+        )
+
+    async def get_listing(
+            self,
+            user_uid: UUID,
+            loader: Callable[[], Awaitable[CachedListing]],
+            min_version: int = 0
+    ) -> CachedListing:
+        """
+        Returns the cached listing of the user, loading and caching it on a miss.
+
+        Args:
+            user_uid: User UUID
+            loader: Coroutine function reading the listing version, then the
+                listing (as encoded JSON bytes if caches_encoded) from the database
+            min_version: Listing version the entry must have reached, older
+                entries are loaded again
+        """
+        if not self._enabled:
+            return await loader()
+
+        key = str(user_uid)
+        try:
+            cached = await self._backend.get(key)
+        except Exception as e:
+            logger.error(f"File listing cache read failed: {e}")
+            cached = None
+        if cached is not None and cached.version >= min_version:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        # Read before the load, so a listing loaded before a write is not cached after it
+        generation = await self._get_generation(key)
+        entry = await loader()
+        if generation is not None:
+            try:
+                await self._backend.set_if_generation(key, entry, generation)
+            except Exception as e:
+                logger.error(f"File listing cache write failed: {e}")
+        return entry
+
+    async def get_version(self, user_uid: UUID, loader: Callable[[], Awaitable[int]]) -> int:
+        """
+        Returns the cached listing version of the user, loading it on a miss.
+
+        Args:
+            user_uid: User UUID
+            loader: Coroutine function reading the version from the database
+        """
+        if not self._enabled:
+            return await loader()
+
+        key = str(user_uid)
+        version = await self._versions.get(key)
+        if version is not None:
+            return version
+
+        generation = await self._get_generation(key)
+        version = await loader()
+        if generation is not None and await self._get_generation(key) == generation:
+            await self._versions.set(key, version)
+        return version
+
+    async def _get_generation(self, key: str) -> Optional[int]:
+        """Generation of the user entry in the backend, None if it cannot be read"""
+        try:
+            return await self._backend.get_generation(key)
+        except Exception as e:
+            logger.error(f"File listing cache read failed: {e}")
+            return None
+
+    async def invalidate(self, user_uid: UUID) -> None:
+        """Drops the cached listing and listing version of the user after a write"""
+        if not self._enabled:
+            return
+
+        key = str(user_uid)
+        self.invalidations += 1
+        await self._versions.delete(key)
+        try:
+            await self._backend.invalidate(key)
+        except Exception as e:
+            logger.error(f"File listing cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Counters for tuning the cache size and TTL"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self._enabled,
+            "encoded": self._encoded,
+            "backend": type(self._backend).__name__,
+            "entries": self._backend.size(),
+            "version_entries": self._versions.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "invalidations": self.invalidations,
+            "evictions": getattr(self._backend, "evictions", None),
+        }
@@ -4,10 +4,27 @@ from app.services.user import UserService
 from fastapi import UploadFile
 from app.services.file import *
 from core.dto.user_file_id_pair import UserFileIDPair
+from core.dto.upload_session import UploadSession
+from core.dto.file_content import FileContent
+from core.dto.file_filter import FileListFilter
+from core.dto.upload_result import UploadResult
+from core.dto.cached_listing import CachedListing
+from core.dto.content_challenge import ContentChallenge
+from core.data_mapper.files.files import FilesMapper
+from core.db.models.file_change import FILE_CHANGE_CREATED, FILE_CHANGE_UPDATED, FILE_CHANGE_DELETED
+from core import config
+from app.http.response_models.file import FilesResponse
 from core.exceptions import *
 
 from uuid6 import uuid7, UUID
-from typing import Tuple, Optional
+from pathlib import Path
+from datetime import datetime
+import time
+import hmac
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Tuple, Optional, AsyncIterator, Dict, Sequence, Union
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 
@@ -19,11 +36,13 @@ class FileService:
                  ds: FileDataService,
                  ts: FileToolsService,
                  rs: FileRepositoryService,
-                 ss: FileStorageService,):
+                 ss: FileStorageService,
+                 cs: FileCacheService):
         self._data_service = ds
         self._tools_service = ts
         self._repository_service = rs
         self._storage_service = ss
+        self._cache_service = cs
 
     async def create_file(self, file_name: str, user_uid: UUID) -> UUID:
         """
@@ -54,9 +73,11 @@ class FileService:
             # Save to database using repository service
             await self._repository_service.save_file_to_db(file)
             await self._repository_service.save_user_file_association(user_file_id_pair)
+            await self._record_change(user_uid, file.uid, FILE_CHANGE_CREATED)
 
             # Commit transaction
             await self._repository_service.commit_transaction()
+            await self._cache_service.invalidate(user_uid)
 
             logger.debug(f"Successful creation of a file for the user {str(user_uid)[:8]}")
 
@@ -67,6 +88,43 @@ class FileService:
             logger.error(f"File creation failed: {str(e)}")
             raise FileCreationError(f"Error during file creation: {e}") from e
 
+    async def create_files(self, file_names: list[str], user_uid: UUID) -> list[UUID]:
+        """
+        Creates and persists several new files for the given user at once.
+
+        The file and user_files rows are written with one multi-row insert
+        each, in a single transaction: either all files are created or none.
+
+        Args:
+            file_names: Names of the files to create
+            user_uid: Unique identifier of the user
+
+        Returns:
+            list[UUID]: The IDs of the created files, in the order of the names
+
+        Raises:
+            FileCreationError: If any part of the file creation process fails.
+        """
+        logger.debug(f"Start batch creation of {len(file_names)} files")
+        try:
+            files = [self._data_service.create_base_file_domain(file_name) for file_name in file_names]
+            file_uids = [file.uid for file in files]
+
+            await self._repository_service.save_files_to_db_bulk(user_uid, files)
+            await self._repository_service.bump_listing_version(user_uid)
+            await self._repository_service.record_file_changes(user_uid, file_uids, FILE_CHANGE_CREATED)
+
+            await self._repository_service.commit_transaction()
+            await self._cache_service.invalidate(user_uid)
+
+            logger.debug(f"Successful creation of {len(files)} files for the user {str(user_uid)[:8]}")
+            return file_uids
+
+        except Exception as e:
+            await self._repository_service.rollback_db()
+            logger.error(f"Batch file creation failed: {str(e)}")
+            raise FileCreationError(f"Error during batch file creation: {e}") from e
+
     async def save_file(self, user_file_id_pair: UserFileIDPair, upload_file: UploadFile) -> File:
         """
         Saves an uploaded file to disk and persists file metadata to the database.
@@ -79,19 +137,23 @@ class FileService:
         5. Creates user-file association
 
         The file is stored using UUID-based filename for security and uniqueness.
+        The content is written and fsynced to a staging path first, so no
+        database connection is held during the disk write.
 
         Args:
             user_file_id_pair:
             upload_file (UploadFile): The file uploaded via FastAPI's UploadFile
 
         Returns:
-            tuple[bool, Optional[UUID]]:
-                - bool: True if file saving was successful, False otherwise
-                - UUID: Unique identifier of the saved file if successful, None if failed
+            File: The saved file with the size actually written to disk
+
+        Raises:
+            FileSizeLimitError: If the file exceeds the maximum allowed size
+            FileCreationError: If any other part of the saving process fails
 
         Note:
-            In case of failure during database operations, the file on disk will be
-            automatically removed to maintain consistency.
+            In case of failure during database operations, the staged content is
+            removed and the previous content of the file is left untouched.
         """
 
         logger.debug(f"Start saving file for user {str(user_file_id_pair.user_uid)[:8]}")
@@ -102,21 +164,811 @@ class FileService:
 
             file = self._tools_service.extract_file_metadata(upload_file, user_file_id_pair.file_uid)
             logger.debug(f"File ID before save: {file.uid}, expected: {user_file_id_pair.file_uid}")
-            await self._repository_service.update_file_in_db(file)
 
-            success = await self._storage_service.save_file(upload_file, file, user_file_id_pair)
-            if not success:
-                await self._repository_service.rollback_db()
-                raise
-
-            await self._repository_service.commit_transaction()
+            # The size reported by the client is replaced by the bytes actually written
+            content = await self._storage_service.save_file(upload_file, file, user_file_id_pair)
+            file.size = content.size
+            file.content_hash = content.content_hash
+            await self._persist_saved_file(file, user_file_id_pair, content.path)
 
             logger.debug(f"Success saving file for user {str(user_file_id_pair.user_uid)[:8]}")
             return file
+        except FileSizeLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error during file saving: {e}")
             raise FileCreationError(f"Error during file saving: {e}")
 
+    async def save_files(
+            self,
+            user_uid: UUID,
+            uploads: Sequence[Tuple[UUID, UploadFile]]
+    ) -> list[UploadResult]:
+        """
+        Saves several uploaded files, each bound to an existing file of the user.
+
+        Contents are written to disk concurrently, at most
+        UPLOAD_BATCH_CONCURRENCY at a time, then the metadata of every file
+        written successfully is persisted in a single transaction.
+
+        Args:
+            user_uid: Unique identifier of the user
+            uploads: File UUIDs with the uploaded content of each
+
+        Returns:
+            list[UploadResult]: The outcome of every upload, in the given order
+
+        Raises:
+            FileCreationError: If the metadata transaction fails; no file is saved then
+        """
+        logger.debug(f"Start saving {len(uploads)} files for user {str(user_uid)[:8]}")
+        try:
+            owned = await self._repository_service.get_user_file_ids(user_uid, [file_uid for file_uid, _ in uploads])
+            await self._repository_service.release_connection()
+        except Exception as e:
+            logger.error(f"Error during multi-file upload: {e}")
+            raise FileCreationError(f"Error during multi-file upload: {e}")
+
+        semaphore = asyncio.Semaphore(config.get("UPLOAD_BATCH_CONCURRENCY", 4))
+        seen = set()
+
+        async def write(file_uid: UUID, upload_file: UploadFile) -> Tuple[Optional[Tuple], UploadResult]:
+            if file_uid in seen:
+                return None, UploadResult(file_uid, error="Duplicate file in the request")
+            seen.add(file_uid)
+            if str(file_uid) not in owned:
+                return None, UploadResult(file_uid, error="File not found or access denied")
+            if not self._tools_service.validate_upload_file(upload_file):
+                return None, UploadResult(file_uid, error="File cannot be empty")
+
+            user_file_id_pair = self._data_service.create_base_user_files_dto(user_uid, file_uid)
+            try:
+                file = self._tools_service.extract_file_metadata(upload_file, file_uid)
+                async with semaphore:
+                    content = await self._storage_service.save_file(upload_file, file, user_file_id_pair)
+                file.size = content.size
+                file.content_hash = content.content_hash
+                return (file, user_file_id_pair, content.path), UploadResult(file_uid, file=file)
+            except FileSizeLimitError:
+                return None, UploadResult(file_uid, error="File exceeds the maximum allowed size")
+            except Exception as e:
+                logger.error(f"Failed to write file {str(file_uid)[:8]}: {e}")
+                return None, UploadResult(file_uid, error="File could not be stored")
+
+        written = await asyncio.gather(*(write(file_uid, upload_file) for file_uid, upload_file in uploads))
+
+        saved = [staged for staged, result in written if result.ok]
+        failed_uids = set()
+        if saved:
+            try:
+                failed_uids = await self._persist_saved_files(user_uid, saved)
+            except Exception as e:
+                logger.error(f"Error during multi-file upload: {e}")
+                raise FileCreationError(f"Error during multi-file upload: {e}")
+
+        results = [
+            UploadResult(result.file_uid, error="File could not be stored") if result.file_uid in failed_uids else result
+            for _, result in written
+        ]
+        logger.debug(f"Success saving {len(saved) - len(failed_uids)} of {len(uploads)} files "
+                     f"for user {str(user_uid)[:8]}")
+        return results
+
+    async def save_file_stream(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            chunks: AsyncIterator[bytes],
+            file_name: str,
+            mime_type: Optional[str] = None,
+            content_length: Optional[int] = None
+    ) -> File:
+        """
+        Saves a raw content stream to disk and persists file metadata to the database.
+
+        Unlike save_file, the content is not spooled by the multipart parser first:
+        the chunks are written straight into a staging path next to the file.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+            chunks: Asynchronous iterator of file content chunks (e.g. request.stream())
+            file_name: Original file name including the extension
+            mime_type: MIME type of the content
+            content_length: Size declared by the client, checked before reading
+
+        Returns:
+            File: The saved file with the size actually written to disk
+
+        Raises:
+            FileSizeLimitError: If the content exceeds the maximum allowed size
+            FileCreationError: If any other part of the saving process fails
+        """
+        logger.debug(f"Start saving file stream for user {str(user_file_id_pair.user_uid)[:8]}")
+        try:
+            if content_length is not None:
+                self._storage_service.check_size_limit(content_length)
+
+            file = self._tools_service.build_file_metadata(file_name, mime_type, user_file_id_pair.file_uid)
+
+            content = await self._storage_service.save_stream(chunks, file, user_file_id_pair)
+            file.size = content.size
+            file.content_hash = content.content_hash
+            if file.size == 0:
+                await self._storage_service.discard_staged(content.path)
+                raise ValidationError("File cannot be empty")
+
+            await self._persist_saved_file(file, user_file_id_pair, content.path)
+
+            logger.debug(f"Success saving file stream for user {str(user_file_id_pair.user_uid)[:8]}")
+            return file
+        except FileSizeLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Error during file stream saving: {e}")
+            raise FileCreationError(f"Error during file stream saving: {e}")
+
+    async def link_known_content(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            file_name: str,
+            content_hash: str,
+            size: int,
+            mime_type: Optional[str] = None,
+            challenge_token: Optional[str] = None,
+            challenge_proof: Optional[str] = None
+    ) -> Union[File, ContentChallenge, None]:
+        """
+        Links a file to content the server already holds, without any body transfer.
+
+        Content is looked up among the stored files of the user, whose content
+        is hard-linked. In deduplicated mode content stored by other users is
+        linked as well once the client proves it holds it: the first request
+        returns a challenge over a random byte range, answered by a second
+        request with its token and proof. A hash alone never links content the
+        user does not already own.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+            file_name: Original file name including the extension
+            content_hash: SHA-256 of the content (hex)
+            size: Size of the content in bytes
+            mime_type: MIME type of the content
+            challenge_token: Token of the answered challenge
+            challenge_proof: Answer to the challenge (see ContentChallenge)
+
+        Returns:
+            Union[File, ContentChallenge, None]: The saved file, a challenge to
+                answer, or None if the content must be uploaded
+
+        Raises:
+            FileAccessError: If the file does not exist or belongs to another user
+            FileSizeLimitError: If the size exceeds the maximum allowed size
+            FileCreationError: If any other part of the process fails
+        """
+        logger.debug(f"Start hash negotiation for user {str(user_file_id_pair.user_uid)[:8]}")
+        await self._check_file_access(user_file_id_pair)
+        self._storage_service.check_size_limit(size)
+
+        try:
+            file = self._tools_service.build_file_metadata(file_name, mime_type, user_file_id_pair.file_uid, size)
+            file.content_hash = content_hash
+            own_file = await self._repository_service.find_file_by_content(
+                user_file_id_pair.user_uid, content_hash, size
+            )
+            if own_file is not None and own_file.uid == file.uid:
+                return own_file
+
+            staging_path = None
+            if self._storage_service.dedup_enabled:
+                if not await self._repository_service.blob_exists(content_hash, size) \
+                        or not await self._storage_service.blob_available(content_hash, size):
+                    return None
+                if own_file is None:
+                    challenge = None
+                    if challenge_token is not None:
+                        challenge = self._tools_service.read_content_challenge(
+                            challenge_token, user_file_id_pair, content_hash, size
+                        )
+                    if challenge is None:
+                        return self._tools_service.issue_content_challenge(user_file_id_pair, content_hash, size)
+                    if not challenge_proof or not await self._check_content_proof(file, user_file_id_pair,
+                                                                                  challenge, challenge_proof):
+                        logger.warning(f"Wrong content proof from user {str(user_file_id_pair.user_uid)[:8]}")
+                        return None
+            else:
+                if own_file is None:
+                    return None
+                own_pair = self._data_service.create_base_user_files_dto(user_file_id_pair.user_uid, own_file.uid)
+                staging_path = await self._storage_service.link_content(own_file, own_pair, user_file_id_pair)
+                if staging_path is None:
+                    return None
+
+            try:
+                await self._persist_saved_file(file, user_file_id_pair, staging_path)
+            except FileNotFoundError:
+                return None
+
+            logger.debug(f"Known content linked for user {str(user_file_id_pair.user_uid)[:8]}")
+            return file
+        except Exception as e:
+            logger.error(f"Error during hash negotiation: {e}")
+            raise FileCreationError(f"Error during hash negotiation: {e}")
+
+    async def _check_content_proof(
+            self,
+            file: File,
+            user_file_id_pair: UserFileIDPair,
+            challenge: ContentChallenge,
+            proof: str
+    ) -> bool:
+        """Compares the proof of a challenge with the hash of the stored blob range"""
+        content_path = await self._storage_service.get_content_path(file, user_file_id_pair)
+        data = bytearray()
+        async for chunk in self._storage_service.read_content(
+                content_path, challenge.offset, challenge.offset + challenge.length - 1):
+            data += chunk
+        expected = self._tools_service.content_proof(challenge, bytes(data))
+        return hmac.compare_digest(proof.lower(), expected)
+
+    async def create_upload_session(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            file_name: str,
+            mime_type: Optional[str] = None,
+            total_size: Optional[int] = None,
+            multipart: bool = False
+    ) -> UploadSession:
+        """
+        Opens a resumable or parallel multi-part upload session for an existing file.
+
+        The database row is not touched until the session is finalized.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+            file_name: Original file name including the extension
+            mime_type: MIME type of the content
+            total_size: Declared size of the whole file, if known
+            multipart: Whether the content is uploaded as independent numbered parts
+
+        Returns:
+            UploadSession: The created session with a zero offset
+
+        Raises:
+            FileAccessError: If the file does not exist or belongs to another user
+            FileSizeLimitError: If the declared size exceeds the maximum allowed size
+        """
+        logger.debug(f"Start upload session for user {str(user_file_id_pair.user_uid)[:8]}")
+        await self._check_file_access(user_file_id_pair)
+        if total_size is not None:
+            self._storage_service.check_size_limit(total_size)
+
+        # Validates the name before any byte is received
+        self._tools_service.build_file_metadata(file_name, mime_type, user_file_id_pair.file_uid)
+
+        session = UploadSession(
+            upload_id=uuid7(),
+            file_name=file_name,
+            mime_type=mime_type or 'application/octet-stream',
+            total_size=total_size,
+            created_at=datetime.now(),
+            multipart=multipart
+        )
+        await self._storage_service.create_upload_session(session, user_file_id_pair)
+        return session
+
+    async def get_upload_session(self, user_file_id_pair: UserFileIDPair, upload_id: UUID) -> UploadSession:
+        """
+        Returns an upload session with its committed offset.
+
+        Raises:
+            FileAccessError: If the file does not exist or belongs to another user
+            UploadSessionNotFoundError: If the session does not exist
+        """
+        await self._check_file_access(user_file_id_pair)
+        return await self._storage_service.get_upload_session(upload_id, user_file_id_pair)
+
+    async def append_upload_chunk(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            upload_id: UUID,
+            offset: int,
+            chunks: AsyncIterator[bytes]
+    ) -> UploadSession:
+        """
+        Appends a byte range to an upload session.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+            upload_id: Upload session ID
+            offset: Offset of the first byte of the range
+            chunks: Asynchronous iterator of the range content
+
+        Returns:
+            UploadSession: The session with the new committed offset
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadOffsetError: If the offset does not match the committed offset
+            FileSizeLimitError: If the range exceeds the declared or maximum size
+        """
+        session = await self.get_upload_session(user_file_id_pair, upload_id)
+        if session.multipart:
+            raise UploadPartError("Multi-part upload sessions accept numbered parts only")
+        offset = await self._storage_service.append_upload_chunk(session, user_file_id_pair, offset, chunks)
+        return session.with_offset(offset)
+
+    async def finalize_upload(self, user_file_id_pair: UserFileIDPair, upload_id: UUID) -> File:
+        """
+        Completes an upload session: stages the received content, persists the
+        file metadata and moves the content into the file storage path.
+
+        Returns:
+            File: The saved file
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadOffsetError: If not all declared bytes have been received
+            FileCreationError: If any other part of the process fails
+        """
+        # Held against chunks appended and completions retried within the worker
+        async with self._storage_service.get_upload_lock(upload_id):
+            return await self._finalize_upload(user_file_id_pair, upload_id)
+
+    async def _finalize_upload(self, user_file_id_pair: UserFileIDPair, upload_id: UUID) -> File:
+        session = await self.get_upload_session(user_file_id_pair, upload_id)
+        if session.multipart:
+            raise UploadPartError("Multi-part upload sessions are completed with their parts manifest")
+        if session.total_size is not None and not session.is_complete:
+            raise UploadOffsetError(f"Upload is incomplete: {session.offset} of {session.total_size} bytes")
+        if session.offset == 0:
+            raise UploadOffsetError("Upload is empty")
+
+        try:
+            file = self._tools_service.build_file_metadata(
+                session.file_name,
+                session.mime_type,
+                user_file_id_pair.file_uid,
+                session.offset
+            )
+            staging_path = await self._storage_service.stage_upload(session, user_file_id_pair)
+            if self._storage_service.dedup_enabled:
+                file.content_hash = await self._storage_service.hash_content(staging_path)
+            await self._persist_saved_file(file, user_file_id_pair, staging_path)
+            await self._storage_service.delete_upload_session(
+                session.upload_id, user_file_id_pair, session.legacy_layout
+            )
+
+            logger.debug(f"Success finalizing upload for user {str(user_file_id_pair.user_uid)[:8]}")
+            return file
+        except Exception as e:
+            logger.error(f"Error during upload finalizing: {e}")
+            raise FileCreationError(f"Error during upload finalizing: {e}")
+
+    async def upload_part(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            upload_id: UUID,
+            part_number: int,
+            chunks: AsyncIterator[bytes]
+    ) -> int:
+        """
+        Saves one part of a parallel multi-part upload.
+
+        Parts may be uploaded concurrently and in any order.
+
+        Returns:
+            int: Size of the saved part in bytes
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadPartError: If the session is not a multi-part one
+            UploadConcurrencyError: If the user exceeds the limit of parallel part uploads
+            FileSizeLimitError: If the part exceeds the maximum allowed size
+        """
+        session = await self.get_upload_session(user_file_id_pair, upload_id)
+        if not session.multipart:
+            raise UploadPartError("Resumable upload sessions accept byte ranges only")
+        return await self._storage_service.save_upload_part(session, user_file_id_pair, part_number, chunks)
+
+    async def get_upload_parts(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            upload_id: UUID
+    ) -> Tuple[UploadSession, Dict[int, int]]:
+        """
+        Returns a multi-part upload session with its manifest of completed parts.
+
+        Returns:
+            Tuple[UploadSession, Dict[int, int]]: The session and the part sizes by part number
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadPartError: If the session is not a multi-part one
+        """
+        session = await self.get_upload_session(user_file_id_pair, upload_id)
+        if not session.multipart:
+            raise UploadPartError("Upload session is not a multi-part one")
+        return session, await self._storage_service.list_upload_parts(
+            upload_id, user_file_id_pair, session.legacy_layout
+        )
+
+    async def complete_multipart_upload(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            upload_id: UUID,
+            part_numbers: Optional[list[int]] = None
+    ) -> File:
+        """
+        Assembles the parts of a multi-part upload into the file and persists
+        the file metadata.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+            upload_id: Upload session ID
+            part_numbers: Ordered part numbers to assemble; by default all
+                          uploaded parts, which must be numbered 1..N
+
+        Returns:
+            File: The saved file
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadPartError: If parts are missing or do not match the declared size
+            FileCreationError: If any other part of the process fails
+        """
+        async with self._storage_service.get_upload_lock(upload_id):
+            return await self._complete_multipart_upload(user_file_id_pair, upload_id, part_numbers)
+
+    async def _complete_multipart_upload(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            upload_id: UUID,
+            part_numbers: Optional[list[int]]
+    ) -> File:
+        session, parts = await self.get_upload_parts(user_file_id_pair, upload_id)
+
+        if part_numbers is None:
+            part_numbers = list(parts)
+            if part_numbers != list(range(1, len(part_numbers) + 1)):
+                raise UploadPartError("Uploaded parts are not numbered contiguously from 1")
+        missing = [number for number in part_numbers if number not in parts]
+        if missing:
+            raise UploadPartError(f"Missing parts: {missing}")
+        if not part_numbers:
+            raise UploadPartError("Upload has no parts")
+
+        size = sum(parts[number] for number in part_numbers)
+        if session.total_size is not None and size != session.total_size:
+            raise UploadPartError(f"Parts size {size} does not match the declared size {session.total_size}")
+        self._storage_service.check_size_limit(size)
+
+        try:
+            file = self._tools_service.build_file_metadata(
+                session.file_name,
+                session.mime_type,
+                user_file_id_pair.file_uid,
+                size
+            )
+            content = await self._storage_service.assemble_upload_parts(session, part_numbers, user_file_id_pair)
+            if content.size != size:
+                # A part was uploaded again (e.g. through another worker) while assembling
+                await self._storage_service.discard_staged(content.path)
+                raise UploadPartError(f"Parts changed while assembling: {content.size} of {size} bytes")
+            if self._storage_service.dedup_enabled:
+                file.content_hash = await self._storage_service.hash_content(content.path)
+            await self._persist_saved_file(file, user_file_id_pair, content.path)
+            await self._storage_service.delete_upload_session(
+                session.upload_id, user_file_id_pair, session.legacy_layout
+            )
+
+            logger.debug(f"Success completing multi-part upload for user {str(user_file_id_pair.user_uid)[:8]}")
+            return file
+        except UploadPartError:
+            raise
+        except Exception as e:
+            logger.error(f"Error during multi-part upload completion: {e}")
+            raise FileCreationError(f"Error during multi-part upload completion: {e}")
+
+    async def abort_upload(self, user_file_id_pair: UserFileIDPair, upload_id: UUID) -> None:
+        """
+        Discards an upload session and its received bytes.
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+        """
+        session = await self.get_upload_session(user_file_id_pair, upload_id)
+        await self._storage_service.delete_upload_session(session.upload_id, user_file_id_pair, session.legacy_layout)
+
+    async def _check_file_access(self, user_file_id_pair: UserFileIDPair) -> None:
+        """Checks that the file exists and belongs to the user, then releases the connection"""
+        if not await self._repository_service.user_has_file(user_file_id_pair):
+            raise FileAccessError(f"File {str(user_file_id_pair.file_uid)[:8]} not found")
+        # Upload paths do disk I/O next, which must not hold a pooled connection
+        await self._repository_service.release_connection()
+
+    async def delete_file(self, user_file_id_pair: UserFileIDPair) -> None:
+        """
+        Deletes a file of the user from the database and from the storage.
+
+        In deduplicated mode the blob reference is released and the blob is
+        unlinked only when no other file references it.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+
+        Raises:
+            FileAccessError: If the file does not exist or belongs to another user
+            FileDeleteError: If any other part of the deletion fails
+        """
+        logger.debug(f"Start deleting file for user {str(user_file_id_pair.user_uid)[:8]}")
+        try:
+            file = await self._repository_service.get_file_by_id(user_file_id_pair.file_uid)
+        except FileNotFoundError:
+            raise FileAccessError(f"File {str(user_file_id_pair.file_uid)[:8]} not found")
+
+        released = False
+        try:
+            if not await self._repository_service.delete_file_in_db(user_file_id_pair):
+                raise FileAccessError(f"File {str(user_file_id_pair.file_uid)[:8]} not found")
+            if self._storage_service.dedup_enabled and file.content_hash:
+                released = await self._repository_service.release_blob_reference(file.content_hash)
+            await self._record_change(user_file_id_pair.user_uid, file.uid, FILE_CHANGE_DELETED)
+            await self._repository_service.commit_transaction()
+        except FileAccessError:
+            await self._repository_service.rollback_db()
+            raise
+        except Exception as e:
+            await self._repository_service.rollback_db()
+            logger.error(f"File deletion failed: {str(e)}")
+            raise FileDeleteError(f"Error during file deletion: {e}") from e
+
+        await self._cache_service.invalidate(user_file_id_pair.user_uid)
+        await self._storage_service.delete_file(file, user_file_id_pair)
+        if released:
+            await self._unlink_released_blob(file.content_hash)
+
+        logger.debug(f"Success deleting file for user {str(user_file_id_pair.user_uid)[:8]}")
+
+    async def _persist_saved_file(
+            self,
+            file: File,
+            user_file_id_pair: UserFileIDPair,
+            staging_path: Optional[Path]
+    ) -> None:
+        """
+        Persists metadata of a file whose content is staged, see _persist_saved_files
+
+        Raises:
+            ServiceStorageError: If the content could not be moved in place (the
+                previous metadata of the file was restored)
+        """
+        if await self._persist_saved_files(user_file_id_pair.user_uid, [(file, user_file_id_pair, staging_path)]):
+            raise ServiceStorageError(f"Content of file {str(file.uid)[:8]} could not be moved in place")
+
+    async def _persist_saved_files(
+            self,
+            user_uid: UUID,
+            saved: Sequence[Tuple[File, UserFileIDPair, Optional[Path]]]
+    ) -> set[UUID]:
+        """
+        Persists metadata of files whose content is staged, then moves the content in place.
+
+        Second phase of the two-phase upload: the content was already written
+        and fsynced to a staging path without a database connection, so the
+        transaction only spans the metadata statements. After the commit every
+        staged content is atomically renamed to its file storage path. A file
+        whose content cannot be moved gets its previous metadata back in a
+        compensating transaction, so no record points at missing content.
+
+        In deduplicated mode the blob reference of the new content is added and
+        the reference of the replaced content is released; after the commit the
+        staged content is renamed straight to its blob path, which depends on
+        the content only, so concurrent uploads of one file never exchange
+        their contents. A staging path of None means the content is already in
+        place (linked to a known blob), which is checked once referenced.
+
+        Each metadata update checks in the same statement that the file still
+        belongs to the user: a file deleted in the meantime fails the
+        transaction with FileAccessError. The staged contents are removed if
+        the database update fails. Saves of the same file are serialized
+        within the worker, from the update to the content placement.
+
+        Returns:
+            set[UUID]: Files whose content could not be moved in place
+
+        Raises:
+            FileNotFoundError: If a linked blob is no longer stored
+        """
+        async with AsyncExitStack() as locks:
+            # Sorted, so that two multi-file saves never wait for each other's locks
+            for file_uid in sorted({str(file.uid) for file, _, _ in saved}):
+                await locks.enter_async_context(self._storage_service.get_file_lock(file_uid))
+            return await self._persist_saved_files_locked(user_uid, saved)
+
+    async def _persist_saved_files_locked(
+            self,
+            user_uid: UUID,
+            saved: Sequence[Tuple[File, UserFileIDPair, Optional[Path]]]
+    ) -> set[UUID]:
+        dedup = self._storage_service.dedup_enabled
+        released_hashes = []
+        try:
+            previous_files = await self._repository_service.get_files_by_ids([file.uid for file, _, _ in saved])
+            for file, user_file_id_pair, staging_path in saved:
+                previous = previous_files.get(file.uid)
+                previous_hash = previous.content_hash if previous is not None else None
+                if await self._repository_service.update_user_file(user_file_id_pair, file) is None:
+                    raise FileAccessError(f"File {str(file.uid)[:8]} not found")
+
+                if dedup and file.content_hash != previous_hash:
+                    await self._repository_service.add_blob_reference(file.content_hash, file.size)
+                    if previous_hash and await self._repository_service.release_blob_reference(previous_hash):
+                        released_hashes.append(previous_hash)
+                if dedup and staging_path is None \
+                        and not await self._storage_service.blob_available(file.content_hash, file.size):
+                    # Unlinked before this reference was added (see _unlink_released_blob)
+                    raise FileNotFoundError(f"Blob {file.content_hash[:12]} is no longer stored")
+
+            await self._repository_service.bump_listing_version(user_uid)
+            await self._repository_service.record_file_changes(
+                user_uid, [file.uid for file, _, _ in saved], FILE_CHANGE_UPDATED
+            )
+            await self._repository_service.commit_transaction()
+        except Exception:
+            await self._repository_service.rollback_db()
+            for _, _, staging_path in saved:
+                if staging_path is not None:
+                    await self._storage_service.discard_staged(staging_path)
+            raise
+
+        failed = []
+        for file, user_file_id_pair, staging_path in saved:
+            if staging_path is None:
+                continue
+            try:
+                if dedup:
+                    await self._storage_service.place_blob(file, staging_path)
+                else:
+                    await self._storage_service.commit_staged(staging_path, file, user_file_id_pair)
+            except ServiceStorageError as e:
+                logger.error(f"Content of file {file.uid} was not moved in place, restoring its metadata: {e}")
+                failed.append((file, user_file_id_pair, previous_files[file.uid]))
+                await self._storage_service.discard_staged(staging_path)
+        if failed:
+            released_hashes.extend(await self._restore_saved_files(user_uid, failed))
+
+        await self._cache_service.invalidate(user_uid)
+
+        # A blob referenced again meanwhile (e.g. restored above) is kept, see _unlink_released_blob
+        for released_hash in released_hashes:
+            await self._unlink_released_blob(released_hash)
+        return {file.uid for file, _, _ in failed}
+
+    async def _restore_saved_files(
+            self,
+            user_uid: UUID,
+            failed: Sequence[Tuple[File, UserFileIDPair, File]]
+    ) -> list[str]:
+        """
+        Compensating transaction of _persist_saved_files: puts back the metadata
+        (and in deduplicated mode the blob reference) the files had before the
+        upload whose content could not be moved in place.
+
+        Returns:
+            list[str]: Hashes of the blobs left without reference
+        """
+        dedup = self._storage_service.dedup_enabled
+        released_hashes = []
+        try:
+            for file, user_file_id_pair, previous in failed:
+                await self._repository_service.update_user_file(user_file_id_pair, previous)
+                if dedup and file.content_hash != previous.content_hash:
+                    if previous.content_hash:
+                        await self._repository_service.add_blob_reference(previous.content_hash, previous.size)
+                    if await self._repository_service.release_blob_reference(file.content_hash):
+                        released_hashes.append(file.content_hash)
+            await self._repository_service.bump_listing_version(user_uid)
+            await self._repository_service.record_file_changes(
+                user_uid, [file.uid for file, _, _ in failed], FILE_CHANGE_UPDATED
+            )
+            await self._repository_service.commit_transaction()
+        except Exception as e:
+            await self._repository_service.rollback_db()
+            logger.error(f"Failed to restore the metadata of files {[str(file.uid) for file, _, _ in failed]}, "
+                         f"their records point at missing content: {e}")
+            return []
+        return released_hashes
+
+    async def _record_change(self, user_uid: UUID, file_uid: UUID, operation: str) -> None:
+        """Bumps the listing version and appends to the change log, in the current transaction"""
+        await self._repository_service.bump_listing_version(user_uid)
+        await self._repository_service.record_file_change(user_uid, file_uid, operation)
+
+    async def _unlink_released_blob(self, content_hash: str) -> None:
+        """
+        Unlinks a blob whose last reference was released.
+
+        The blob row is deleted only if its reference count is still zero, and
+        the blob is unlinked before that deletion commits: an upload of the
+        same content adding its reference meanwhile waits on the row lock, and
+        then either kept the blob or finds it gone (and stores its own copy).
+        """
+        try:
+            if await self._repository_service.delete_unreferenced_blob(content_hash):
+                await self._storage_service.delete_blob(content_hash)
+            await self._repository_service.commit_transaction()
+        except Exception as e:
+            await self._repository_service.rollback_db()
+            logger.error(f"Failed to unlink released blob {content_hash[:12]}: {e}")
+
+    async def get_file_content(self, user_file_id_pair: UserFileIDPair) -> FileContent:
+        """
+        Resolves the stored content of a file of the user.
+
+        Args:
+            user_file_id_pair: User and file identifiers
+
+        Returns:
+            FileContent: The file, the path holding its content, its stat and its ETag
+
+        Raises:
+            FileAccessError: If the file does not exist, belongs to another user
+                             or has no content yet
+            FileGetError: If any other error occurs
+        """
+        logger.debug(f"Start get file content for user {str(user_file_id_pair.user_uid)[:8]}")
+        await self._check_file_access(user_file_id_pair)
+        try:
+            file = await self._repository_service.get_file_by_id(user_file_id_pair.file_uid)
+            # The content is streamed after this, without a pooled connection
+            await self._repository_service.release_connection()
+        except FileNotFoundError:
+            raise FileAccessError(f"File {str(user_file_id_pair.file_uid)[:8]} not found")
+        except Exception as e:
+            logger.error(f"Failed to get file content: {e}")
+            raise FileGetError(f"Error during get file content: {e}")
+
+        content_path = await self._storage_service.get_content_path(file, user_file_id_pair)
+        try:
+            stat = await self._storage_service.stat_content(content_path)
+        except FileNotFoundError:
+            raise FileAccessError(f"File {str(user_file_id_pair.file_uid)[:8]} has no content")
+        return FileContent(
+            file=file,
+            path=content_path,
+            stat=stat,
+            etag=self._tools_service.build_etag(file, stat),
+            local=self._storage_service.content_is_local
+        )
+
+    def is_not_modified(self, content: FileContent, if_none_match: Optional[str]) -> bool:
+        """Check whether the client already holds this content (If-None-Match)"""
+        return self._tools_service.etag_matches(content.etag, if_none_match)
+
+    def get_content_range(
+            self,
+            content: FileContent,
+            range_header: Optional[str],
+            if_range: Optional[str]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Byte range to serve from a content that is not a local file.
+
+        A range is only honoured while If-Range, when sent, still matches the ETag.
+
+        Returns:
+            Optional[Tuple[int, int]]: First and last byte, None for the whole content
+
+        Raises:
+            FileRangeError: If the range is not satisfiable
+        """
+        if if_range and if_range.strip() != content.etag:
+            return None
+        return self._tools_service.parse_byte_range(range_header, content.stat.st_size)
+
+    def read_content(self, content: FileContent, start: int, end: int) -> AsyncIterator[bytes]:
+        """Streams the bytes from start to end inclusive of a content from the storage backend"""
+        return self._storage_service.read_content(content.path, start, end)
+
     async def get_files(self, user_uid: UUID):
         """
         Retrieves all files associated with the specified user.
@@ -164,3 +1016,238 @@ class FileService:
         except Exception as e:
             logger.error(f"Failed to get files for user: {e}")
             raise FileGetError(f"Error during get files for user: {e}")
+
+    async def get_files_page(
+            self,
+            user_uid: UUID,
+            limit: int,
+            after: Optional[UUID] = None,
+            file_filter: Optional[FileListFilter] = None
+    ) -> Tuple[list[File], Optional[UUID]]:
+        """
+        Retrieves one page of the user files, ordered by creation (uuid7 file ID).
+
+        Args:
+            user_uid: Unique identifier of the user
+            limit: Maximum number of files in the page
+            after: Cursor returned with the previous page
+            file_filter: Optional filters on extension, MIME type and creation date
+
+        Returns:
+            Tuple[list[File], Optional[UUID]]: The files and the cursor of the
+            next page, None when this is the last page
+
+        Raises:
+            FileGetError: If any error occurs during the file retrieval process
+        """
+        logger.debug(f"Start get files page for user {str(user_uid)[:8]}")
+        try:
+            # One extra row tells whether a next page exists
+            files = await self._repository_service.get_files_page_by_user_id(
+                user_uid, limit + 1, after, file_filter
+            )
+            next_cursor = None
+            if len(files) > limit:
+                files = files[:limit]
+                next_cursor = files[-1].uid
+            return files, next_cursor
+        except Exception as e:
+            logger.error(f"Failed to get files page for user: {e}")
+            raise FileGetError(f"Error during get files page for user: {e}")
+
+    async def get_file_rows(
+            self,
+            user_uid: UUID,
+            limit: Optional[int] = None,
+            after: Optional[UUID] = None,
+            file_filter: Optional[FileListFilter] = None
+    ) -> Tuple[Sequence[Row], Optional[UUID]]:
+        """
+        Retrieves the user files as plain column tuples for listing responses.
+
+        Lean counterpart of get_files/get_files_page: no ORM entity or File
+        domain object is built per row.
+
+        Args:
+            user_uid: Unique identifier of the user
+            limit: Maximum number of files, all files when None
+            after: Cursor returned with the previous page
+            file_filter: Optional filters on extension, MIME type and creation date
+
+        Returns:
+            Tuple[Sequence[Row], Optional[UUID]]: The rows and the cursor of the
+            next page, None when this is the last page
+
+        Raises:
+            FileGetError: If any error occurs during the file retrieval process
+        """
+        logger.debug(f"Start get file rows for user {str(user_uid)[:8]}")
+        try:
+            rows = await self._repository_service.get_file_rows_by_user_id(
+                user_uid, limit + 1 if limit is not None else None, after, file_filter
+            )
+            next_cursor = None
+            if limit is not None and len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = UUID(rows[-1][0])
+            return rows, next_cursor
+        except Exception as e:
+            logger.error(f"Failed to get file rows for user: {e}")
+            raise FileGetError(f"Error during get file rows for user: {e}")
+
+    async def get_files_listing(self, user_uid: UUID) -> FilesResponse:
+        """
+        Retrieves the listing of all user files, served from the listing cache
+        when possible.
+
+        Args:
+            user_uid: Unique identifier of the user
+
+        Returns:
+            FilesResponse: The user files keyed by file UUID
+
+        Raises:
+            FileGetError: If any error occurs during the file retrieval process
+        """
+        entry = await self._get_cached_listing(user_uid)
+        if self._cache_service.caches_encoded:
+            return FilesResponse.model_validate_json(entry.listing)
+        return entry.listing
+
+    async def get_files_listing_json(self, user_uid: UUID, min_version: int = 0) -> Tuple[str, bytes]:
+        """
+        Retrieves the listing of all user files as the encoded JSON of a
+        FilesResponse, ready to be sent, with its ETag.
+
+        With FILE_LIST_CACHE_ENCODED the rows are encoded straight to bytes and
+        the bytes are cached; otherwise the cached FilesResponse is encoded on
+        every call, without being validated again. The ETag is the one of the
+        listing version the body was read at, never of a later one.
+
+        Args:
+            user_uid: Unique identifier of the user
+            min_version: Listing version the body must have reached (see get_listing_version)
+
+        Returns:
+            Tuple[str, bytes]: The ETag and the JSON body of the listing
+
+        Raises:
+            FileGetError: If any error occurs during the file retrieval process
+        """
+        entry = await self._get_cached_listing(user_uid, min_version)
+        body = entry.listing if self._cache_service.caches_encoded else FilesMapper.to_json(entry.listing)
+        return self.listing_etag(entry.version), body
+
+    async def _get_cached_listing(self, user_uid: UUID, min_version: int = 0) -> CachedListing:
+        async def load_listing() -> CachedListing:
+            # Read first: the rows read next are at least as recent as the version
+            try:
+                version = await self._repository_service.get_listing_version(user_uid)
+            except Exception as e:
+                logger.error(f"Failed to get listing version for user: {e}")
+                raise FileGetError(f"Error during get listing version for user: {e}")
+            rows, _ = await self.get_file_rows(user_uid)
+            if self._cache_service.caches_encoded:
+                return CachedListing(version=version, listing=FilesMapper.rows_to_json(rows))
+            return CachedListing(version=version, listing=FilesMapper.rows_to_pydantic(rows))
+
+        return await self._cache_service.get_listing(user_uid, load_listing, min_version)
+
+    async def get_file_changes(
+            self,
+            user_uid: UUID,
+            since: Optional[UUID],
+            limit: int
+    ) -> Tuple[Sequence[Row], str, bool]:
+        """
+        Retrieves the changes of the user files after a change feed cursor.
+
+        Changes younger than FILE_CHANGES_SETTLE_MS are held back, so that a
+        transaction committing with an older uuid7 is never skipped by a
+        cursor that already moved past it. Without a cursor only the current
+        cursor is returned: clients take it before their initial listing.
+
+        Args:
+            user_uid: Unique identifier of the user
+            since: Cursor returned by the previous call
+            limit: Maximum number of changes
+
+        Returns:
+            Tuple[Sequence[Row], str, bool]: The change rows, the next cursor
+            and whether more changes are available right away
+
+        Raises:
+            FileChangesExpiredError: If the cursor is older than the retained change log
+            FileGetError: If any other error occurs
+        """
+        now_ms = time.time_ns() // 1_000_000
+        until = self._tools_service.uuid7_bound(now_ms - config.get("FILE_CHANGES_SETTLE_MS", 1000))
+        if since is None:
+            return [], until, False
+
+        retention_ms = config.get("FILE_CHANGES_RETENTION", 7 * 24 * 3600) * 1000
+        if self._tools_service.uuid7_timestamp_ms(since) < now_ms - retention_ms:
+            raise FileChangesExpiredError(f"Cursor {since} is older than the change log retention")
+
+        logger.debug(f"Start get file changes for user {str(user_uid)[:8]}")
+        try:
+            rows = await self._repository_service.get_file_changes(user_uid, str(since), until, limit + 1)
+        except Exception as e:
+            logger.error(f"Failed to get file changes for user: {e}")
+            raise FileGetError(f"Error during get file changes for user: {e}")
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1][0], True
+        # Every change before the bound was returned, the next call starts from it
+        return rows, until if until > str(since) else str(since), False
+
+    async def compact_file_changes(self) -> int:
+        """
+        Compacts the change log: drops changes past the retention and
+        changes superseded by a later change of the same file.
+
+        Returns:
+            int: Number of removed changes
+        """
+        retention_ms = config.get("FILE_CHANGES_RETENTION", 7 * 24 * 3600) * 1000
+        horizon = self._tools_service.uuid7_bound(time.time_ns() // 1_000_000 - retention_ms)
+        try:
+            removed = await self._repository_service.compact_file_changes(
+                horizon, config.get("FILE_CHANGES_COMPACTION_BATCH", 1000)
+            )
+            await self._repository_service.commit_transaction()
+        except Exception:
+            await self._repository_service.rollback_db()
+            raise
+        logger.info(f"Compacted the file change log: {removed} changes removed")
+        return removed
+
+    async def get_listing_version(self, user_uid: UUID) -> int:
+        """
+        Current version of the user file listing, from which its ETag is derived.
+
+        Every create, upload and delete bumps the version in its own transaction,
+        so conditional requests are answered without reading the file tables.
+        The version is cached for FILE_LIST_VERSION_TTL seconds.
+
+        Raises:
+            FileGetError: If the version cannot be read
+        """
+        try:
+            return await self._cache_service.get_version(
+                user_uid,
+                lambda: self._repository_service.get_listing_version(user_uid)
+            )
+        except Exception as e:
+            logger.error(f"Failed to get listing version for user: {e}")
+            raise FileGetError(f"Error during get listing version for user: {e}")
+
+    @staticmethod
+    def listing_etag(version: int) -> str:
+        """ETag of the user file listing at this listing version"""
+        return f'"v{version}"'
+
+    def listing_not_modified(self, etag: str, if_none_match: Optional[str]) -> bool:
+        """Check whether the client already holds this listing (If-None-Match)"""
+        return self._tools_service.etag_matches(etag, if_none_match)
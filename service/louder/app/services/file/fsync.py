@@ -0,0 +1,141 @@
+from core.logger import Logger
+from core import config
+from app.services.io_executor import StorageIOExecutor
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = Logger.get_logger(__name__)
+
+FSYNC_NONE = "none"
+FSYNC_FILE = "file"
+FSYNC_FILE_DIR = "file+dir"
+
+
+class FsyncBatcher:
+    """
+    Singleton coalescing the fsync calls of concurrent writers.
+
+    Writers wait on a shared batch instead of calling fsync themselves: the
+    first request opens a window of STORAGE_FSYNC_BATCH_WINDOW_MS, then every
+    file and directory requested in the meantime is synced in one hop to the
+    storage I/O executor.
+    A directory shared by several renames is synced once per batch, and the
+    file system can merge the journal commits of the batch.
+
+    The policy (STORAGE_FSYNC) decides what is synced:
+        none: nothing, the page cache decides
+        file: file contents before they are renamed into place
+        file+dir: file contents, and directories after a rename
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init_batcher()
+        return cls._instance
+
+    def _init_batcher(self) -> None:
+        self._policy: str = config.get("STORAGE_FSYNC", FSYNC_FILE)
+        if self._policy not in (FSYNC_NONE, FSYNC_FILE, FSYNC_FILE_DIR):
+            logger.warning(f"Unknown STORAGE_FSYNC policy '{self._policy}', using '{FSYNC_FILE}'")
+            self._policy = FSYNC_FILE
+        self._window: float = config.get("STORAGE_FSYNC_BATCH_WINDOW_MS", 2) / 1000
+        self._files: Dict[Path, List[asyncio.Future]] = {}
+        self._dirs: Dict[Path, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.synced_files = 0
+        self.synced_dirs = 0
+        self.requests = 0
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    async def sync_file(self, file_path: Path) -> None:
+        """Waits until the content of the file is on stable storage (file policies)"""
+        if self._policy != FSYNC_NONE:
+            await self._enqueue(self._files, file_path)
+
+    async def sync_dir(self, dir_path: Path) -> None:
+        """Waits until the entries of the directory are on stable storage (file+dir policy)"""
+        if self._policy == FSYNC_FILE_DIR:
+            await self._enqueue(self._dirs, dir_path)
+
+    def sync_file_now(self, fd: int) -> None:
+        """Syncs an open descriptor in the calling thread, for writers already off the event loop"""
+        if self._policy != FSYNC_NONE:
+            self._datasync(fd)
+
+    async def _enqueue(self, bucket: Dict[Path, List[asyncio.Future]], path: Path) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        bucket.setdefault(path, []).append(future)
+        self.requests += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush())
+        await future
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self._window)
+        files, self._files = self._files, {}
+        dirs, self._dirs = self._dirs, {}
+
+        errors = await StorageIOExecutor().run(self._sync_all, list(files), list(dirs))
+        self.batches += 1
+        self.synced_files += len(files)
+        self.synced_dirs += len(dirs)
+
+        for bucket in (files, dirs):
+            for path, futures in bucket.items():
+                error = errors.get(path)
+                for future in futures:
+                    if future.done():
+                        continue
+                    if error:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(None)
+
+    @staticmethod
+    def _sync_all(files: List[Path], dirs: List[Path]) -> Dict[Path, OSError]:
+        """Syncing files, then directories (blocking, run in the storage executor)"""
+        errors = {}
+        for path, is_dir in [(path, False) for path in files] + [(path, True) for path in dirs]:
+            try:
+                fd = os.open(path, os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if is_dir else 0))
+                try:
+                    if is_dir:
+                        os.fsync(fd)
+                    else:
+                        FsyncBatcher._datasync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                logger.error(f"Failed to sync {path}: {e}")
+                errors[path] = e
+        return errors
+
+    @staticmethod
+    def _datasync(fd: int) -> None:
+        # fdatasync skips the metadata a reader does not need (e.g. mtime); not available on macOS
+        if hasattr(os, "fdatasync"):
+            os.fdatasync(fd)
+        else:
+            os.fsync(fd)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for tuning the batch window"""
+        return {
+            "policy": self._policy,
+            "batches": self.batches,
+            "requests": self.requests,
+            "synced_files": self.synced_files,
+            "synced_dirs": self.synced_dirs,
+            "requests_per_batch": self.requests / self.batches if self.batches else None,
+        }
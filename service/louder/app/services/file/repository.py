@@ -2,21 +2,40 @@ from core.domain.file import File
 from core.db.models.user_files import UserFileModel
 from core.data_mapper.files.user_files import UserFileIdMapper
 from core.data_mapper.files.file import FileMapper
+from core.data_mapper.files.files import FilesMapper
 from core.db.models.file import FileModel
+from core.db.models.blob import BlobModel
+from core.db.models.user_file_version import UserFileVersionModel
+from core.db.models.file_change import FileChangeModel, FILE_CHANGE_CREATED, FILE_CHANGE_UPDATED
 from core.dto.user_file_id_pair import UserFileIDPair
+from core.dto.file_filter import FileListFilter
 from core.logger import Logger
 from core.exceptions import *
 from app.services.file.tools import FileToolsService
 from app.services.repository import RepositoryService
 
-from sqlalchemy import select
-from uuid6 import UUID
+from sqlalchemy import select, update, delete, insert, func, Select, Row
+from sqlalchemy.dialects import mysql, postgresql
+from uuid6 import UUID, uuid7
 from sqlalchemy.orm import Session
-from typing import overload, Union
+from typing import overload, Union, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = Logger.get_logger(__name__)
 
+# Columns of the lean listing path, in the order FilesMapper.rows_to_pydantic expects
+FILE_ROW_COLUMNS = (
+    FileModel.id,
+    FileModel.file_name,
+    FileModel.file_extension,
+    FileModel.is_public,
+    FileModel.file_size,
+    FileModel.mime_type,
+    FileModel.created_at,
+    FileModel.updated_at,
+    FileModel.content_hash,
+)
+
 
 class FileRepositoryService(RepositoryService):
     def __init__(self, db: AsyncSession, ts: FileToolsService):
@@ -80,6 +99,23 @@ class FileRepositoryService(RepositoryService):
             logger.error(f"Failed to save file to database: {e}")
             raise ServiceRepositoryError(f"Database save failed: {e}")
 
+    async def save_files_to_db_bulk(self, user_id: UUID, files: list[File]) -> None:
+        """Saving files and their user associations with one multi-row insert per table
+
+        Raises:
+            ServiceRepositoryError: If database operation fails
+        """
+        try:
+            await self._db.execute(insert(FileModel).values(FilesMapper.to_rows(files)))
+            await self._db.execute(
+                insert(UserFileModel).values([
+                    {"user_id": str(user_id), "file_id": str(file.uid)} for file in files
+                ])
+            )
+        except Exception as e:
+            logger.error(f"Failed to bulk save {len(files)} files to database: {e}")
+            raise ServiceRepositoryError(f"Database save failed: {e}")
+
     async def get_files_by_user_id(self, user_id: UUID) -> list[File]:
         """Get all files for specific user"""
         try:
@@ -99,10 +135,91 @@ class FileRepositoryService(RepositoryService):
             logger.error(f"Failed to get files for user {str(user_id)[:8]}: {e}")
             raise ServiceRepositoryError(f"Database query failed: {e}")
 
+    async def get_files_page_by_user_id(
+            self,
+            user_id: UUID,
+            limit: int,
+            after: Optional[UUID] = None,
+            file_filter: Optional[FileListFilter] = None
+    ) -> list[File]:
+        """Get one page of user files ordered by file ID
+
+        Args:
+            user_id: User UUID
+            limit: Maximum number of files
+            after: File ID the page starts after (exclusive)
+            file_filter: Optional filters
+        """
+        try:
+            stmt = self._filter_user_files(select(FileModel), user_id, limit, after, file_filter)
+            result = await self._db.execute(stmt)
+            return [FileMapper.to_domain(file_model) for file_model in result.scalars().all()]
+
+        except Exception as e:
+            logger.error(f"Failed to get files page for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
+
+    async def get_file_rows_by_user_id(
+            self,
+            user_id: UUID,
+            limit: Optional[int] = None,
+            after: Optional[UUID] = None,
+            file_filter: Optional[FileListFilter] = None
+    ) -> Sequence[Row]:
+        """Get user files as plain column tuples ordered by file ID
+
+        Lean listing path: only the listed columns are selected, without ORM
+        entities, identity map or domain validation per row. The columns are
+        those of FILE_ROW_COLUMNS.
+        """
+        try:
+            stmt = self._filter_user_files(select(*FILE_ROW_COLUMNS), user_id, limit, after, file_filter)
+            result = await self._db.execute(stmt)
+            return result.all()
+
+        except Exception as e:
+            logger.error(f"Failed to get file rows for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
+
+    @staticmethod
+    def _filter_user_files(
+            stmt: Select,
+            user_id: UUID,
+            limit: Optional[int] = None,
+            after: Optional[UUID] = None,
+            file_filter: Optional[FileListFilter] = None
+    ) -> Select:
+        """Restricting a select on the file table to one page of the user files
+
+        uuid7 file IDs are time-ordered, so pages are resolved by a range scan
+        on the (user_id, file_id) unique index, whatever the page depth.
+        """
+        stmt = (
+            stmt
+            .select_from(FileModel)
+            .join(UserFileModel, FileModel.id == UserFileModel.file_id)
+            .where(UserFileModel.user_id == str(user_id))
+            .order_by(UserFileModel.file_id)
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if after is not None:
+            stmt = stmt.where(UserFileModel.file_id > str(after))
+        if file_filter is not None:
+            if file_filter.extension is not None:
+                stmt = stmt.where(FileModel.file_extension == file_filter.extension)
+            if file_filter.mime_type is not None:
+                stmt = stmt.where(FileModel.mime_type == file_filter.mime_type)
+            if file_filter.created_from is not None:
+                stmt = stmt.where(FileModel.created_at >= file_filter.created_from)
+            if file_filter.created_to is not None:
+                stmt = stmt.where(FileModel.created_at < file_filter.created_to)
+        return stmt
+
     async def get_file_by_id(self, file_id: UUID) -> File:
         """Get file by ID"""
         try:
-            stmt = select(FileModel).where(FileModel.id == file_id)
+            stmt = select(FileModel).where(FileModel.id == str(file_id))
             result = await self._db.execute(stmt)
             file_model = result.scalar_one_or_none()
 
@@ -117,25 +234,385 @@ class FileRepositoryService(RepositoryService):
             logger.error(f"Failed to get file {file_id}: {e}")
             raise ServiceRepositoryError(f"Database query failed: {e}")
 
-    @overload
-    async def update_file_in_db(self, file: File) -> FileModel:
-        ...
+    async def get_files_by_ids(self, file_ids: Sequence[UUID]) -> dict[UUID, File]:
+        """Get the files with these IDs in one query, keyed by file UUID (missing ones are left out)"""
+        try:
+            stmt = select(*FILE_ROW_COLUMNS).where(FileModel.id.in_([str(file_id) for file_id in file_ids]))
+            files = [File.from_row(row) for row in (await self._db.execute(stmt)).all()]
+            return {file.uid: file for file in files}
 
-    @overload
-    async def update_file_in_db(self, file: FileModel) -> FileModel:
-        ...
+        except Exception as e:
+            logger.error(f"Failed to get {len(file_ids)} files: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
 
-    async def update_file_in_db(self, file: Union[File, FileModel]) -> FileModel:
-        """Updating a file in the database"""
+    async def get_user_file_ids(self, user_id: UUID, file_ids: Sequence[UUID]) -> set[str]:
+        """Get which of the given files belong to the user"""
         try:
-            file_entity = self._tool_service.convert_to_file_model(file)
+            stmt = (
+                select(UserFileModel.file_id)
+                .where(UserFileModel.user_id == str(user_id))
+                .where(UserFileModel.file_id.in_([str(file_id) for file_id in file_ids]))
+            )
+            return set((await self._db.execute(stmt)).scalars().all())
 
-            await self._db.merge(file_entity)
-            await self._db.flush()
+        except Exception as e:
+            logger.error(f"Failed to check files ownership for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
 
-            logger.debug(f"Файл {file.uid} обновлен в базе")
-            return file_entity
+    async def user_has_file(self, user_file_id_pair: UserFileIDPair) -> bool:
+        """Check that the file exists and belongs to the user"""
+        try:
+            stmt = (
+                select(UserFileModel.id)
+                .where(
+                    UserFileModel.user_id == str(user_file_id_pair.user_uid),
+                    UserFileModel.file_id == str(user_file_id_pair.file_uid)
+                )
+                .limit(1)
+            )
+            result = await self._db.execute(stmt)
+            return result.scalar_one_or_none() is not None
+
+        except Exception as e:
+            logger.error(f"Failed to check file {str(user_file_id_pair.file_uid)[:8]} ownership: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
+
+    async def update_user_file(self, user_file_id_pair: UserFileIDPair, file: File) -> Optional[File]:
+        """Updating the metadata of a file of the user in a single statement
+
+        The ownership is checked through user_files by the same UPDATE, and the
+        stored row is read back with RETURNING where the backend supports it
+        (PostgreSQL, SQLite); elsewhere (MySQL) the matched row count is checked.
+        The creation time of the file is kept.
+
+        Returns:
+            Optional[File]: The updated file, None if it does not exist or belongs to another user
+        """
+        file_id = str(user_file_id_pair.file_uid)
+        try:
+            owned = select(UserFileModel.id).where(
+                UserFileModel.user_id == str(user_file_id_pair.user_uid),
+                UserFileModel.file_id == file_id
+            ).exists()
+            stmt = (
+                update(FileModel)
+                .where(FileModel.id == file_id, owned)
+                .values(
+                    file_name=file.name,
+                    file_extension=file.extension or "",
+                    is_public=file.is_public or False,
+                    file_size=file.size or 0,
+                    mime_type=file.mime_type or "",
+                    content_hash=file.content_hash,
+                    updated_at=file.updated_at
+                )
+                # The EXISTS criteria can't be evaluated in Python, "auto" would SELECT the rows first
+                .execution_options(synchronize_session=False)
+            )
+
+            if self._db.bind.dialect.update_returning:
+                row = (await self._db.execute(stmt.returning(*FILE_ROW_COLUMNS))).first()
+                updated = File.from_row(row) if row is not None else None
+            else:
+                result = await self._db.execute(stmt)
+                updated = file if result.rowcount == 1 else None
+
+            if updated is not None:
+                logger.debug(f"File {file_id[:8]} updated in the database")
+            return updated
 
         except Exception as e:
             logger.error(f"Error updating a file in the database: {e}")
-            raise ServiceRepositoryError(f"File update error: {e}")
\ No newline at end of file
+            raise ServiceRepositoryError(f"File update error: {e}")
+
+    async def delete_file_in_db(self, user_file_id_pair: UserFileIDPair) -> bool:
+        """Deleting the file and its user association
+
+        Returns:
+            bool: True if the file belonged to the user and was deleted
+        """
+        try:
+            association = await self._db.execute(
+                delete(UserFileModel).where(
+                    UserFileModel.user_id == str(user_file_id_pair.user_uid),
+                    UserFileModel.file_id == str(user_file_id_pair.file_uid)
+                )
+            )
+            if association.rowcount == 0:
+                return False
+
+            await self._db.execute(
+                delete(FileModel).where(FileModel.id == str(user_file_id_pair.file_uid))
+            )
+            logger.debug(f"File {str(user_file_id_pair.file_uid)[:8]} deleted from the database")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error deleting a file in the database: {e}")
+            raise ServiceRepositoryError(f"File delete error: {e}")
+
+    async def add_blob_reference(self, content_hash: str, size: int) -> None:
+        """Registering a blob or incrementing its reference count"""
+        try:
+            await self._increment_counter(
+                BlobModel,
+                BlobModel.content_hash,
+                BlobModel.ref_count,
+                {"content_hash": content_hash, "size": size, "ref_count": 1}
+            )
+        except Exception as e:
+            logger.error(f"Failed to add blob reference {content_hash[:12]}: {e}")
+            raise ServiceRepositoryError(f"Blob reference error: {e}")
+
+    async def _increment_counter(self, model, key_column, counter_column, values: dict) -> None:
+        """Inserting a counter row or incrementing its counter in a single statement"""
+        dialect = self._db.bind.dialect.name
+
+        if dialect == "mysql":
+            stmt = mysql.insert(model).values(**values)
+            stmt = stmt.on_duplicate_key_update({counter_column.key: counter_column + 1})
+            await self._db.execute(stmt)
+        elif dialect == "postgresql":
+            stmt = postgresql.insert(model).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key_column],
+                set_={counter_column.key: counter_column + 1}
+            )
+            await self._db.execute(stmt)
+        else:
+            result = await self._db.execute(
+                update(model)
+                .where(key_column == values[key_column.key])
+                .values({counter_column.key: counter_column + 1})
+            )
+            if result.rowcount == 0:
+                self._db.add(model(**values))
+                await self._db.flush()
+
+    async def bump_listing_version(self, user_id: UUID) -> None:
+        """Incrementing the file listing version of the user, in the current transaction"""
+        try:
+            await self._increment_counter(
+                UserFileVersionModel,
+                UserFileVersionModel.user_id,
+                UserFileVersionModel.version,
+                {"user_id": str(user_id), "version": 1}
+            )
+        except Exception as e:
+            logger.error(f"Failed to bump listing version for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"Listing version error: {e}")
+
+    async def get_listing_version(self, user_id: UUID) -> int:
+        """Get the file listing version of the user, 0 if the user never wrote a file"""
+        try:
+            stmt = select(UserFileVersionModel.version).where(UserFileVersionModel.user_id == str(user_id))
+            version = (await self._db.execute(stmt)).scalar_one_or_none()
+            return version or 0
+
+        except Exception as e:
+            logger.error(f"Failed to get listing version for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
+
+    async def record_file_change(self, user_id: UUID, file_id: UUID, operation: str) -> None:
+        """Appending a file change to the change log, in the current transaction"""
+        await self.record_file_changes(user_id, [file_id], operation)
+
+    async def record_file_changes(self, user_id: UUID, file_ids: Sequence[UUID], operation: str) -> None:
+        """Appending the same change of several files to the change log, in one statement"""
+        try:
+            await self._db.execute(
+                insert(FileChangeModel).values([
+                    {
+                        "id": str(uuid7()),
+                        "user_id": str(user_id),
+                        "file_id": str(file_id),
+                        "operation": operation
+                    }
+                    for file_id in file_ids
+                ])
+            )
+        except Exception as e:
+            logger.error(f"Failed to record file change for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"File change log error: {e}")
+
+    async def get_file_changes(
+            self,
+            user_id: UUID,
+            since: Optional[str],
+            until: str,
+            limit: int
+    ) -> Sequence[Row]:
+        """
+        Get the changes of the user files in the cursor range (since, until)
+
+        Each row holds the change ID, file ID and operation, followed by the
+        current FILE_ROW_COLUMNS of the file (all None once it is deleted).
+        """
+        try:
+            stmt = (
+                select(FileChangeModel.id, FileChangeModel.file_id, FileChangeModel.operation, *FILE_ROW_COLUMNS)
+                .outerjoin(FileModel, FileModel.id == FileChangeModel.file_id)
+                .where(FileChangeModel.user_id == str(user_id))
+                .where(FileChangeModel.id < until)
+                .order_by(FileChangeModel.id)
+                .limit(limit)
+            )
+            if since is not None:
+                stmt = stmt.where(FileChangeModel.id > since)
+            return (await self._db.execute(stmt)).all()
+
+        except Exception as e:
+            logger.error(f"Failed to get file changes for user {str(user_id)[:8]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
+
+    async def compact_file_changes(self, horizon: str, batch_size: int) -> int:
+        """
+        Compacting the change log
+
+        Drops the changes older than the retention horizon, and the changes
+        superseded by a later change of the same file: a client reading the
+        feed gets the current file record with the latest change anyway. A
+        file created within the retention keeps "created" when its later
+        updates are collapsed, so clients still see it as new.
+
+        Returns:
+            int: Number of removed changes
+        """
+        try:
+            result = await self._db.execute(
+                delete(FileChangeModel).where(FileChangeModel.id < horizon)
+            )
+            removed = result.rowcount or 0
+
+            # MySQL cannot delete from a table with a subquery on itself, so the latest
+            # change of every file with a history is read first
+            stmt = (
+                select(
+                    FileChangeModel.user_id,
+                    FileChangeModel.file_id,
+                    func.min(FileChangeModel.id),
+                    func.max(FileChangeModel.id)
+                )
+                .group_by(FileChangeModel.user_id, FileChangeModel.file_id)
+                .having(func.count() > 1)
+                .limit(batch_size)
+            )
+            for user_id, file_id, first_id, latest_id in (await self._db.execute(stmt)).all():
+                first_operation = (await self._db.execute(
+                    select(FileChangeModel.operation).where(FileChangeModel.id == first_id)
+                )).scalar_one()
+                result = await self._db.execute(
+                    delete(FileChangeModel)
+                    .where(FileChangeModel.user_id == user_id)
+                    .where(FileChangeModel.file_id == file_id)
+                    .where(FileChangeModel.id < latest_id)
+                )
+                removed += result.rowcount or 0
+                if first_operation == FILE_CHANGE_CREATED:
+                    await self._db.execute(
+                        update(FileChangeModel)
+                        .where(FileChangeModel.id == latest_id)
+                        .where(FileChangeModel.operation == FILE_CHANGE_UPDATED)
+                        .values(operation=FILE_CHANGE_CREATED)
+                    )
+
+            return removed
+
+        except Exception as e:
+            logger.error(f"Failed to compact file changes: {e}")
+            raise ServiceRepositoryError(f"File change log error: {e}")
+
+    async def release_blob_reference(self, content_hash: str) -> bool:
+        """Decrementing the reference count of a blob
+
+        The row is kept at zero, it is removed with delete_unreferenced_blob
+        once the blob is unlinked.
+
+        Returns:
+            bool: True if the last reference was released and the blob can be unlinked
+        """
+        try:
+            stmt = (
+                select(BlobModel)
+                .where(BlobModel.content_hash == content_hash)
+                .with_for_update()
+            )
+            blob = (await self._db.execute(stmt)).scalar_one_or_none()
+            if blob is None:
+                logger.warning(f"Blob {content_hash[:12]} has no reference row")
+                return False
+
+            blob.ref_count = max(blob.ref_count - 1, 0)
+            await self._db.flush()
+            return blob.ref_count == 0
+
+        except Exception as e:
+            logger.error(f"Failed to release blob reference {content_hash[:12]}: {e}")
+            raise ServiceRepositoryError(f"Blob reference error: {e}")
+
+    async def delete_unreferenced_blob(self, content_hash: str) -> bool:
+        """Removing the row of a blob if nothing references it anymore
+
+        The reference count is checked by the DELETE statement itself, so a
+        reference added concurrently either keeps the row or waits for this
+        transaction, whose row lock is held until the commit.
+
+        Returns:
+            bool: True if the row was removed and the blob can be unlinked
+        """
+        try:
+            result = await self._db.execute(
+                delete(BlobModel).where(
+                    BlobModel.content_hash == content_hash,
+                    BlobModel.ref_count <= 0
+                )
+            )
+            return result.rowcount == 1
+
+        except Exception as e:
+            logger.error(f"Failed to delete blob {content_hash[:12]}: {e}")
+            raise ServiceRepositoryError(f"Blob reference error: {e}")
+
+    async def blob_exists(self, content_hash: str, size: Optional[int] = None) -> bool:
+        """Check that a blob with this hash (and size, if given) is referenced"""
+        try:
+            stmt = select(BlobModel.content_hash).where(
+                BlobModel.content_hash == content_hash,
+                BlobModel.ref_count > 0
+            )
+            if size is not None:
+                stmt = stmt.where(BlobModel.size == size)
+            result = await self._db.execute(stmt)
+            return result.scalar_one_or_none() is not None
+
+        except Exception as e:
+            logger.error(f"Failed to check blob {content_hash[:12]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
+
+
+    async def find_file_by_content(self, user_uid: UUID, content_hash: str, size: int) -> Optional[File]:
+        """Find a stored file of the user with this content hash and size
+
+        Returns:
+            Optional[File]: The file, or None
+        """
+        try:
+            stmt = (
+                select(FileModel)
+                .join(UserFileModel, FileModel.id == UserFileModel.file_id)
+                .where(
+                    UserFileModel.user_id == str(user_uid),
+                    FileModel.content_hash == content_hash,
+                    FileModel.file_size == size
+                )
+                .limit(1)
+            )
+            file_model = (await self._db.execute(stmt)).scalar_one_or_none()
+            if file_model is None:
+                return None
+
+            return FileMapper.to_domain(file_model)
+
+        except Exception as e:
+            logger.error(f"Failed to find file by content {content_hash[:12]}: {e}")
+            raise ServiceRepositoryError(f"Database query failed: {e}")
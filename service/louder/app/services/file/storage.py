@@ -2,22 +2,91 @@ from core.domain.file import File
 from core.logger import Logger
 from app.services.storage import BaseStorageService
 from core.dto.user_file_id_pair import UserFileIDPair
+from core.dto.upload_session import UploadSession
+from core.dto.written_content import WrittenContent
+from core.exceptions import *
+from core import config
+from app.services.file.fsync import FsyncBatcher
+from app.services.io_executor import StorageIOExecutor
+from app.services.file.backend import StorageBackend, LocalStorageBackend, S3StorageBackend
 
 import aiofiles
+import asyncio
+import errno
+import hashlib
+import os
+import weakref
 from fastapi import UploadFile
 from pathlib import Path
+from typing import AsyncIterator, Optional, Dict, Callable, Tuple, Union
+from uuid6 import UUID, uuid7
 
 
 logger = Logger.get_logger(__name__)
 
 
 class FileStorageService(BaseStorageService):
+    _upload_locks: "weakref.WeakValueDictionary[UUID, asyncio.Lock]" = weakref.WeakValueDictionary()
+    _file_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    _active_parts: Dict[UUID, int] = {}
+    _shared_backend: Optional[StorageBackend] = None
+
     def __init__(self):
         self._path_master = self.create_path_master()
+        self._backend = self.get_backend()
+        self._chunk_size: int = config.get("UPLOAD_CHUNK_SIZE", 1024 * 1024)
+        self._max_file_size: Optional[int] = config.get("UPLOAD_MAX_FILE_SIZE")
+        self._max_parallel_parts: int = config.get("UPLOAD_MAX_PARALLEL_PARTS", 8)
+        self._dedup_enabled: bool = config.get("STORAGE_DEDUP", False)
+        self._fsync = FsyncBatcher()
+        self._io = StorageIOExecutor()
+
+    @classmethod
+    def get_backend(cls) -> StorageBackend:
+        """Process-wide backend of the committed contents, holding its pooled connections"""
+        if cls._shared_backend is None:
+            cls._shared_backend = cls._create_backend()
+        return cls._shared_backend
+
+    @staticmethod
+    def _create_backend() -> StorageBackend:
+        chunk_size = config.get("UPLOAD_CHUNK_SIZE", 1024 * 1024)
+        if config.get("STORAGE_BACKEND", "local") == "s3":
+            logger.info("File contents are stored in the s3 backend")
+            return S3StorageBackend(
+                bucket=config.get("STORAGE_S3_BUCKET"),
+                root=FileStorageService.create_path_master().base_storage_path,
+                prefix=config.get("STORAGE_S3_PREFIX", ""),
+                endpoint_url=config.get("STORAGE_S3_ENDPOINT_URL"),
+                region=config.get("STORAGE_S3_REGION"),
+                access_key=config.get("STORAGE_S3_ACCESS_KEY"),
+                secret_key=config.get("STORAGE_S3_SECRET_KEY"),
+                part_size=config.get("STORAGE_S3_PART_SIZE", 8 * 1024 * 1024),
+                max_connections=config.get("STORAGE_S3_MAX_CONNECTIONS", 32),
+                upload_concurrency=config.get("STORAGE_S3_UPLOAD_CONCURRENCY", 4),
+                chunk_size=chunk_size
+            )
+        return LocalStorageBackend(chunk_size=chunk_size)
+
+    @classmethod
+    async def close_backend(cls) -> None:
+        """Releasing the pooled connections of the backend at shutdown"""
+        if cls._shared_backend is not None:
+            await cls._shared_backend.close()
+            cls._shared_backend = None
 
-    async def save_file(self, upload_file: UploadFile, file: File, user_file_id_pair: UserFileIDPair) -> bool:
+    @property
+    def content_is_local(self) -> bool:
+        """Whether committed contents are local files, served by path"""
+        return self._backend.is_local
+
+    async def save_file(self, upload_file: UploadFile, file: File, user_file_id_pair: UserFileIDPair) -> WrittenContent:
         """
-        Saves the file to disk
+        Saves the file to a staging path by streaming it in fixed-size chunks
+
+        Only one chunk of the upload is held in memory at a time, so memory per
+        upload stays constant regardless of the file size. The staged content is
+        synced (STORAGE_FSYNC) and moved to the file storage path with commit_staged.
 
         Args:
             user_file_id_pair:
@@ -25,26 +94,699 @@ class FileStorageService(BaseStorageService):
             file: The domain object of the metadata file
 
         Returns:
-            bool: True if successful, False in case of error
+            WrittenContent: Number of bytes actually written, their SHA-256 and the staging path
+
+        Raises:
+            FileSizeLimitError: If the file exceeds UPLOAD_MAX_FILE_SIZE
+            ServiceStorageError: If the file could not be written
         """
-        file_path = self.get_file_path(file, user_file_id_pair)
+        staging_path = await self.get_staging_path(user_file_id_pair)
+        return await self.write_stream(staging_path, self._iter_upload_file(upload_file), fsync=True)
 
-        try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+    async def save_stream(
+            self,
+            chunks: AsyncIterator[bytes],
+            file: File,
+            user_file_id_pair: UserFileIDPair
+    ) -> WrittenContent:
+        """
+        Saves a raw content stream (e.g. a request body) directly to a staging path
 
-            contents = await upload_file.read()
+        Args:
+            chunks: Asynchronous iterator of file content chunks
+            file: The domain object of the metadata file
+            user_file_id_pair:
 
-            async with aiofiles.open(file_path, "wb") as buffer:
-                await buffer.write(contents)
+        Returns:
+            WrittenContent: Number of bytes actually written, their SHA-256 and the staging path
+        """
+        staging_path = await self.get_staging_path(user_file_id_pair)
+        return await self.write_stream(staging_path, chunks, fsync=True)
 
-            logger.debug(f"File saved successfully to {file_path}")
-            return True
+    async def write_stream(self, file_path: Path, chunks: AsyncIterator[bytes], fsync: bool = False) -> WrittenContent:
+        """
+        Writes a stream of chunks to the given path
+
+        The real size and the SHA-256 are computed as the chunks arrive and the
+        write is aborted as soon as it exceeds UPLOAD_MAX_FILE_SIZE. A partially
+        written file is removed on any error.
+
+        Args:
+            file_path: The full path to the file
+            chunks: Asynchronous iterator of file content chunks
+            fsync: Whether to flush the content to stable storage before returning,
+                   as far as the STORAGE_FSYNC policy asks
+
+        Returns:
+            WrittenContent: Number of bytes written, their SHA-256 and the path
+        """
+        written = 0
+        content_hash = hashlib.sha256()
+        try:
+            await self._io.run(file_path.parent.mkdir, parents=True, exist_ok=True)
+
+            async with aiofiles.open(file_path, "wb", executor=self._io.executor) as buffer:
+                async for chunk in chunks:
+                    written += len(chunk)
+                    self.check_size_limit(written)
+                    content_hash.update(chunk)
+                    await buffer.write(chunk)
+            if fsync:
+                await self._fsync.sync_file(file_path)
+
+            logger.debug(f"File saved successfully to {file_path} ({written} bytes)")
+            return WrittenContent(size=written, content_hash=content_hash.hexdigest(), path=file_path)
 
+        except FileSizeLimitError:
+            logger.warning(f"File exceeds the size limit, aborting write to {file_path}")
+            await self._delete_file_by_path(file_path)
+            raise
         except Exception as e:
             logger.error(f"Failed to save file to disk: {e}")
+            await self._delete_file_by_path(file_path)
+            raise ServiceStorageError(f"Failed to save file to disk: {e}") from e
+
+    async def _iter_upload_file(self, upload_file: UploadFile) -> AsyncIterator[bytes]:
+        """Reading the uploaded file in chunks of UPLOAD_CHUNK_SIZE"""
+        self.check_size_limit(getattr(upload_file, 'size', None) or 0)
+        while chunk := await upload_file.read(self._chunk_size):
+            yield chunk
+
+    def check_size_limit(self, size: int) -> None:
+        """Checking the size against UPLOAD_MAX_FILE_SIZE"""
+        if self._max_file_size and size > self._max_file_size:
+            raise FileSizeLimitError(
+                f"File size exceeds the limit of {self._max_file_size} bytes"
+            )
+
+    async def create_upload_session(self, session: UploadSession, user_file_id_pair: UserFileIDPair) -> None:
+        """
+        Registers a resumable upload session next to the file storage path
+
+        The session metadata is kept in a JSON file and the received bytes in an
+        empty part file, whose size is the committed offset.
+
+        Raises:
+            ServiceStorageError: If the session files could not be created
+        """
+        part_path = self._get_upload_part_path(session.upload_id, user_file_id_pair, session.legacy_layout)
+        session_path = self._get_upload_session_path(session.upload_id, user_file_id_pair)
+
+        if not await self.save_in_file_json(session_path, session.to_dict()):
+            raise ServiceStorageError("Failed to save upload session")
+        if session.multipart:
+            logger.debug(f"Multi-part upload session {session.upload_id} created")
+            return
+        try:
+            await self._io.run(part_path.touch)
+        except OSError as e:
+            await self._delete_file_by_path(session_path)
+            raise ServiceStorageError(f"Failed to create upload part file: {e}") from e
+
+        logger.debug(f"Upload session {session.upload_id} created")
+
+    async def get_upload_session(self, upload_id: UUID, user_file_id_pair: UserFileIDPair) -> UploadSession:
+        """
+        Loads an upload session with its committed offset
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+        """
+        session_path, legacy = await self._find_upload_session(upload_id, user_file_id_pair)
+        part_path = self._get_upload_part_path(upload_id, user_file_id_pair, legacy)
+
+        data = await self.get_from_file_json(session_path)
+        if not data:
+            raise UploadSessionNotFoundError(f"Upload session {upload_id} is corrupted")
+
+        if data.get('multipart'):
+            parts = await self.list_upload_parts(upload_id, user_file_id_pair, legacy)
+            return UploadSession.from_dict(data, offset=sum(parts.values()), legacy_layout=legacy)
+
+        try:
+            offset = await self._io.run(os.path.getsize, part_path)
+        except FileNotFoundError:
+            raise UploadSessionNotFoundError(f"Upload session {upload_id} not found")
+        return UploadSession.from_dict(data, offset=offset, legacy_layout=legacy)
+
+    async def _find_upload_session(self, upload_id: UUID, user_file_id_pair: UserFileIDPair) -> Tuple[Path, bool]:
+        """
+        Locating the session metadata in the current layout, then in the legacy one
+
+        Returns:
+            Tuple[Path, bool]: The session path and whether it is in the legacy layout
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+        """
+        session_path = self._get_upload_session_path(upload_id, user_file_id_pair)
+        if await self._io.run(session_path.exists):
+            return session_path, False
+        if self._path_master.has_legacy_layout:
+            legacy_path = self._get_upload_session_path(upload_id, user_file_id_pair, legacy=True)
+            if legacy_path is not None and await self._io.run(legacy_path.exists):
+                return legacy_path, True
+        raise UploadSessionNotFoundError(f"Upload session {upload_id} not found")
+
+    async def append_upload_chunk(
+            self,
+            session: UploadSession,
+            user_file_id_pair: UserFileIDPair,
+            offset: int,
+            chunks: AsyncIterator[bytes]
+    ) -> int:
+        """
+        Appends a byte range to the session part file
+
+        The range must start exactly at the committed offset. On any error the
+        part file is truncated back to that offset, so a retried chunk never
+        leaves a partial range behind.
+
+        Args:
+            session: The upload session
+            user_file_id_pair:
+            offset: Offset of the first byte of the range
+            chunks: Asynchronous iterator of the range content
+
+        Returns:
+            int: The new committed offset
+
+        Raises:
+            UploadOffsetError: If the offset does not match the committed offset
+            FileSizeLimitError: If the range exceeds the declared or maximum size
+        """
+        part_path = self._get_upload_part_path(session.upload_id, user_file_id_pair, session.legacy_layout)
+
+        async with self.get_upload_lock(session.upload_id):
+            committed = await self._io.run(os.path.getsize, part_path)
+            if offset != committed:
+                raise UploadOffsetError(f"Offset {offset} does not match committed offset {committed}")
+
+            written = committed
+            try:
+                async with aiofiles.open(part_path, "ab", executor=self._io.executor) as buffer:
+                    async for chunk in chunks:
+                        written += len(chunk)
+                        self.check_size_limit(written)
+                        if session.total_size is not None and written > session.total_size:
+                            raise FileSizeLimitError(
+                                f"Upload exceeds the declared size of {session.total_size} bytes"
+                            )
+                        await buffer.write(chunk)
+                # The offset reported to the client must survive a crash
+                await self._fsync.sync_file(part_path)
+            except FileSizeLimitError:
+                await self._io.run(os.truncate, part_path, committed)
+                raise
+            except Exception as e:
+                logger.error(f"Failed to append chunk to upload {session.upload_id}: {e}")
+                await self._io.run(os.truncate, part_path, committed)
+                raise ServiceStorageError(f"Failed to append upload chunk: {e}") from e
+
+        logger.debug(f"Upload {session.upload_id} committed offset {written}")
+        return written
+
+    async def stage_upload(self, session: UploadSession, user_file_id_pair: UserFileIDPair) -> Path:
+        """
+        Stages the committed bytes of a resumable upload
+
+        The first session.offset bytes of the part file are copied by the
+        kernel to a staging path. A hard link would share the part file, so a
+        chunk appended concurrently (e.g. by another worker) would end up in
+        the content; the committed range is never rewritten. The part file
+        stays in place, and the upload can be finalized again, until the
+        session is deleted.
+
+        Returns:
+            Path: The staging path, moved into place with commit_staged
+
+        Raises:
+            ServiceStorageError: If the part file could not be staged
+        """
+        part_path = self._get_upload_part_path(session.upload_id, user_file_id_pair, session.legacy_layout)
+        staging_path = await self.get_staging_path(user_file_id_pair)
+        try:
+            await self._io.run(
+                self._copy_prefix, part_path, staging_path, session.offset, self._fsync.sync_file_now
+            )
+        except (OSError, ServiceStorageError) as e:
+            await self._delete_file_by_path(staging_path)
+            raise ServiceStorageError(f"Failed to stage upload {session.upload_id}: {e}") from e
+
+        logger.debug(f"Upload {session.upload_id} staged to {staging_path}")
+        return staging_path
+
+    async def save_upload_part(
+            self,
+            session: UploadSession,
+            user_file_id_pair: UserFileIDPair,
+            part_number: int,
+            chunks: AsyncIterator[bytes]
+    ) -> int:
+        """
+        Saves one part of a parallel multi-part upload to its own part file
+
+        The part is written and synced to a temporary file first and renamed
+        when complete, so the manifest never lists a part that is still being
+        received, even after a crash. A retransmitted part replaces the previous one.
+
+        Args:
+            session: The multi-part upload session
+            user_file_id_pair:
+            part_number: 1-based number of the part
+            chunks: Asynchronous iterator of the part content
+
+        Returns:
+            int: Size of the part in bytes
+
+        Raises:
+            UploadConcurrencyError: If the user already uploads UPLOAD_MAX_PARALLEL_PARTS parts
+                to this worker (the limit is per worker, not enforced across workers)
+            FileSizeLimitError: If the part exceeds the maximum allowed size
+        """
+        part_path = self._get_upload_part_number_path(
+            session.upload_id, user_file_id_pair, part_number, session.legacy_layout
+        )
+        tmp_path = part_path.with_name(f"{part_path.name}.tmp.{uuid7()}")
+
+        self._acquire_part_slot(user_file_id_pair.user_uid)
+        try:
+            size = (await self.write_stream(tmp_path, chunks, fsync=True)).size
+            await self._io.run(os.replace, tmp_path, part_path)
+            await self._fsync.sync_dir(part_path.parent)
+        finally:
+            self._release_part_slot(user_file_id_pair.user_uid)
+
+        logger.debug(f"Upload {session.upload_id} part {part_number} saved ({size} bytes)")
+        return size
+
+    async def list_upload_parts(
+            self,
+            upload_id: UUID,
+            user_file_id_pair: UserFileIDPair,
+            legacy: bool = False
+    ) -> Dict[int, int]:
+        """
+        Lists the completed parts of a multi-part upload
+
+        Args:
+            upload_id: Upload session ID
+            user_file_id_pair:
+            legacy: Whether the session is stored in the legacy layout
+
+        Returns:
+            Dict[int, int]: Part sizes in bytes by part number, ordered by part number
+        """
+        pattern_path = self._get_upload_part_number_path(upload_id, user_file_id_pair, "*", legacy)
+        return await self._io.run(self._scan_upload_parts, pattern_path)
+
+    @staticmethod
+    def _scan_upload_parts(pattern_path: Path) -> Dict[int, int]:
+        """Globbing and sizing the part files (blocking, run in the storage executor)"""
+        prefix, suffix = pattern_path.name.split("*", 1)
+
+        parts = {}
+        if not pattern_path.parent.exists():
+            return parts
+        for part_path in pattern_path.parent.glob(pattern_path.name):
+            number = part_path.name[len(prefix):len(part_path.name) - len(suffix)]
+            if number.isdigit():
+                parts[int(number)] = part_path.stat().st_size
+        return dict(sorted(parts.items()))
+
+    async def assemble_upload_parts(
+            self,
+            session: UploadSession,
+            part_numbers: list[int],
+            user_file_id_pair: UserFileIDPair
+    ) -> WrittenContent:
+        """
+        Concatenates the parts of a multi-part upload into a staging path
+
+        The copy is done by the kernel (copy_file_range, or sendfile as a fallback),
+        so the content never passes through Python buffers. The parts are kept
+        until the session is deleted, so a failed completion can be retried.
+
+        Args:
+            session: The multi-part upload session
+            part_numbers: Ordered numbers of the parts to concatenate
+            user_file_id_pair:
+
+        Returns:
+            WrittenContent: Size of the assembled file and the staging path, without hash
+
+        Raises:
+            ServiceStorageError: If the parts could not be assembled
+        """
+        part_paths = [
+            self._get_upload_part_number_path(session.upload_id, user_file_id_pair, number, session.legacy_layout)
+            for number in part_numbers
+        ]
+        staging_path = await self.get_staging_path(user_file_id_pair)
+
+        try:
+            size = await self._io.run(
+                self._concatenate_files, part_paths, staging_path, self._fsync.sync_file_now
+            )
+        except Exception as e:
+            logger.error(f"Failed to assemble upload {session.upload_id}: {e}")
+            await self._delete_file_by_path(staging_path)
+            raise ServiceStorageError(f"Failed to assemble upload parts: {e}") from e
+
+        logger.debug(f"Upload {session.upload_id} assembled to {staging_path} ({size} bytes)")
+        return WrittenContent(size=size, content_hash=None, path=staging_path)
+
+    @staticmethod
+    def _copy_prefix(source: Path, target: Path, size: int, sync: Callable[[int], None]) -> None:
+        """Copying the first size bytes of a file with in-kernel copies, then syncing them (blocking)"""
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            LocalStorageBackend.copy_fd(src.fileno(), dst.fileno(), size)
+            sync(dst.fileno())
+
+    @staticmethod
+    def _concatenate_files(part_paths: list[Path], file_path: Path, sync: Callable[[int], None]) -> int:
+        """Concatenating files with in-kernel copies, then syncing them (blocking, run in the storage executor)"""
+        total = 0
+        with open(file_path, "wb") as dst:
+            for part_path in part_paths:
+                with open(part_path, "rb") as src:
+                    total += LocalStorageBackend.copy_fd(src.fileno(), dst.fileno(), os.fstat(src.fileno()).st_size)
+            sync(dst.fileno())
+        return total
+
+    def _acquire_part_slot(self, user_uid: UUID) -> None:
+        """Reserving one of the user's parallel part upload slots, counted per worker"""
+        active = self._active_parts.get(user_uid, 0)
+        if active >= self._max_parallel_parts:
+            raise UploadConcurrencyError(
+                f"Limit of {self._max_parallel_parts} parallel part uploads reached"
+            )
+        self._active_parts[user_uid] = active + 1
+
+    def _release_part_slot(self, user_uid: UUID) -> None:
+        """Releasing a parallel part upload slot"""
+        active = self._active_parts.get(user_uid, 0) - 1
+        if active > 0:
+            self._active_parts[user_uid] = active
+        else:
+            self._active_parts.pop(user_uid, None)
+
+    async def delete_upload_session(
+            self,
+            upload_id: UUID,
+            user_file_id_pair: UserFileIDPair,
+            legacy: bool = False
+    ) -> bool:
+        """Deleting the part and session files of an upload"""
+        for part_number in await self.list_upload_parts(upload_id, user_file_id_pair, legacy):
+            await self._delete_file_by_path(
+                self._get_upload_part_number_path(upload_id, user_file_id_pair, part_number, legacy)
+            )
+        part_deleted = await self._delete_file_by_path(
+            self._get_upload_part_path(upload_id, user_file_id_pair, legacy)
+        )
+        session_deleted = await self._delete_file_by_path(
+            self._get_upload_session_path(upload_id, user_file_id_pair, legacy)
+        )
+        return part_deleted and session_deleted
+
+    def get_upload_lock(self, upload_id: UUID) -> asyncio.Lock:
+        """
+        Lock serializing the writes and the completion of one upload session within the worker
+
+        Requests of other workers are not serialized by it: completion only
+        reads the committed bytes, which appends never rewrite.
+        """
+        lock = self._upload_locks.get(upload_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._upload_locks[upload_id] = lock
+        return lock
+
+    def get_file_lock(self, file_uid: Union[UUID, str]) -> asyncio.Lock:
+        """Lock serializing the saves of one file within the worker, from the metadata update to the content placement"""
+        # Keyed by the string form, so a UUID and its string share one lock
+        key = str(file_uid)
+        lock = self._file_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._file_locks[key] = lock
+        return lock
+
+    def _get_upload_part_path(
+            self,
+            upload_id: UUID,
+            user_file_id_pair: UserFileIDPair,
+            legacy: bool = False
+    ) -> Path:
+        """Getting the path of the upload part file"""
+        return self._get_layout_path(
+            "upload_part",
+            legacy,
+            user_uid=user_file_id_pair.user_uid,
+            file_uid=user_file_id_pair.file_uid,
+            upload_id=upload_id
+        )
+
+    def _get_upload_part_number_path(
+            self,
+            upload_id: UUID,
+            user_file_id_pair: UserFileIDPair,
+            part_number: int | str,
+            legacy: bool = False
+    ) -> Path:
+        """Getting the path of a numbered part file of a multi-part upload"""
+        return self._get_layout_path(
+            "upload_part_number",
+            legacy,
+            user_uid=user_file_id_pair.user_uid,
+            file_uid=user_file_id_pair.file_uid,
+            upload_id=upload_id,
+            part_number=part_number
+        )
+
+    def _get_upload_session_path(
+            self,
+            upload_id: UUID,
+            user_file_id_pair: UserFileIDPair,
+            legacy: bool = False
+    ) -> Path:
+        """Getting the path of the upload session metadata"""
+        return self._get_layout_path(
+            "upload_session",
+            legacy,
+            user_uid=user_file_id_pair.user_uid,
+            file_uid=user_file_id_pair.file_uid,
+            upload_id=upload_id
+        )
+
+    def _get_layout_path(self, path_type: str, legacy: bool, **kwargs) -> Optional[Path]:
+        """Getting a path of the current layout, or of the legacy one"""
+        if legacy:
+            return self._path_master.get_legacy_path(path_type, **kwargs)
+        return self._path_master.get_path(path_type, **kwargs)
+
+    @property
+    def dedup_enabled(self) -> bool:
+        """Whether file contents are stored once per SHA-256 in the blob store"""
+        return self._dedup_enabled
+
+    async def hash_content(self, file_path: Path) -> str:
+        """
+        Computes the SHA-256 of content already written to the storage
+
+        Used for content assembled from several requests, whose hash could not
+        be computed while streaming.
+        """
+        return await self._io.run(self._hash_path, file_path, self._chunk_size)
+
+    @staticmethod
+    def _hash_path(file_path: Path, chunk_size: int) -> str:
+        """Hashing a file in chunks (blocking, run in the storage executor)"""
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                content_hash.update(chunk)
+        return content_hash.hexdigest()
+
+    async def place_blob(self, file: File, staging_path: Path) -> None:
+        """
+        Moves staged content into the blob store
+
+        Must be called after the blob reference is committed, from when the
+        blob cannot be unlinked. The staging path belongs to one upload, so
+        concurrent uploads of the same file never exchange their contents. An
+        already stored blob is kept and the staged copy dropped. A blob placed
+        on another volume than the staging path is copied there (uploaded in
+        an object store).
+
+        Raises:
+            ServiceStorageError: If the content could not be moved
+        """
+        try:
+            if await self._find_blob_path(file.content_hash) is not None:
+                await self.discard_staged(staging_path)
+                return
+            await self._backend.put_file(self.get_blob_path(file.content_hash), staging_path)
+            logger.debug(f"Content of file {file.uid} stored as blob {file.content_hash[:12]}")
+        except Exception as e:
+            raise ServiceStorageError(f"Failed to store blob {file.content_hash[:12]}: {e}") from e
+
+    async def delete_blob(self, content_hash: str) -> bool:
+        """Deleting a blob whose reference count dropped to zero"""
+        legacy_path = self._path_master.get_legacy_path("blob", **self._blob_path_params(content_hash))
+        legacy_deleted = legacy_path is None or await self._backend.delete(legacy_path)
+        return await self._backend.delete(self.get_blob_path(content_hash)) and legacy_deleted
+
+    async def _find_blob_path(self, content_hash: str) -> Optional[Path]:
+        """Getting the path of a stored blob, on its current volume or the previous one"""
+        blob_path = self.get_blob_path(content_hash)
+        if await self._backend.exists(blob_path):
+            return blob_path
+        if self._path_master.has_legacy_layout:
+            legacy_path = self._path_master.get_legacy_path("blob", **self._blob_path_params(content_hash))
+            if legacy_path is not None and await self._backend.exists(legacy_path):
+                return legacy_path
+        return None
+
+    async def migrate_blob(self, content_hash: str) -> str:
+        """
+        Moves a blob from its previous volume to the current one
+
+        Returns:
+            str: "moved", "merged" (already present, the previous copy is dropped) or "missing"
+        """
+        if not self._backend.is_local:
+            return "missing"
+        legacy_path = self._path_master.get_legacy_path("blob", **self._blob_path_params(content_hash))
+        if legacy_path is None or not await self._io.run(legacy_path.exists):
+            return "missing"
+        blob_path = self.get_blob_path(content_hash)
+        try:
+            if await self._io.run(blob_path.exists):
+                await self._io.run(legacy_path.unlink, missing_ok=True)
+                return "merged"
+            await self._io.run(blob_path.parent.mkdir, parents=True, exist_ok=True)
+            await self._io.run(LocalStorageBackend.move_file, legacy_path, blob_path, self._fsync.sync_file_now, True)
+            await self._fsync.sync_dir(blob_path.parent)
+        except OSError as e:
+            raise ServiceStorageError(f"Failed to migrate blob {content_hash[:12]}: {e}") from e
+        return "moved"
+
+    def get_blob_path(self, content_hash: str) -> Path:
+        """Getting the hash-sharded path of a blob"""
+        return self._path_master.get_path("blob", **self._blob_path_params(content_hash))
+
+    @staticmethod
+    def _blob_path_params(content_hash: str) -> Dict[str, str]:
+        return {"hash_prefix": content_hash[:2], "hash_sub": content_hash[2:4], "content_hash": content_hash}
+
+    async def blob_available(self, content_hash: str, size: int) -> bool:
+        """Check that the blob is present in the blob store with the expected size"""
+        blob_path = await self._find_blob_path(content_hash)
+        if blob_path is None:
             return False
+        blob_stat = await self._backend.stat(blob_path)
+        return blob_stat is not None and blob_stat.st_size == size
+
+    async def link_content(
+            self,
+            source_file: File,
+            source_pair: UserFileIDPair,
+            user_file_id_pair: UserFileIDPair
+    ) -> Optional[Path]:
+        """
+        Hard-links the content of a stored file to a staging path of another file
+
+        Returns:
+            Optional[Path]: The staging path, None if the source content is missing or cannot be linked
+        """
+        if not self._backend.is_local:
+            return None
+        source_path = await self.get_content_path(source_file, source_pair)
+        try:
+            staging_path = await self.get_staging_path(user_file_id_pair)
+            await self._io.run(os.link, source_path, staging_path)
+            logger.debug(f"Content of file {source_file.uid} linked to file {user_file_id_pair.file_uid}")
+            return staging_path
+        except OSError as e:
+            logger.warning(f"Failed to link content of file {source_file.uid}: {e}")
+            return None
+
+    async def commit_staged(self, staging_path: Path, file: File, user_file_id_pair: UserFileIDPair) -> None:
+        """
+        Atomically moves staged content to the file storage path
+
+        Called after the metadata transaction commits, so readers see either the
+        previous content or the new one, never a partial file. With the file+dir
+        fsync policy the rename itself is made durable. An object store backend
+        uploads the staged content instead.
+
+        Raises:
+            ServiceStorageError: If the content could not be moved
+        """
+        file_path = self.get_file_path(file, user_file_id_pair)
+        try:
+            await self._backend.put_file(file_path, staging_path)
+        except Exception as e:
+            raise ServiceStorageError(f"Failed to commit staged content of file {file.uid}: {e}") from e
+        logger.debug(f"Staged content committed to {file_path}")
+
+    async def discard_staged(self, staging_path: Path) -> bool:
+        """Deleting staged content whose metadata transaction failed"""
+        return await self._delete_file_by_path(staging_path)
+
+    async def get_staging_path(self, user_file_id_pair: UserFileIDPair) -> Path:
+        """Getting a new staging path next to the file storage path"""
+        staging_path = self._path_master.get_path(
+            "upload_staging",
+            user_uid=user_file_id_pair.user_uid,
+            file_uid=user_file_id_pair.file_uid,
+            staging_id=uuid7()
+        )
+        await self._io.run(staging_path.parent.mkdir, parents=True, exist_ok=True)
+        return staging_path
+
+    async def get_content_path(self, file: File, user_file_id_pair: UserFileIDPair) -> Path:
+        """
+        Getting the path holding the file content
+
+        In deduplicated mode the content lives in the blob store, except for a
+        file whose blob has not been placed yet.
+        """
+        if self._dedup_enabled and file.content_hash:
+            blob_path = await self._find_blob_path(file.content_hash)
+            if blob_path is not None:
+                return blob_path
+        return await self._find_file_path(file, user_file_id_pair)
 
-    def delete_file(self, file: File, user_file_id_pair: UserFileIDPair) -> bool:
+    async def _find_file_path(self, file: File, user_file_id_pair: UserFileIDPair) -> Path:
+        """
+        Getting the file storage path, falling back to the legacy layout
+
+        The current path wins: content uploaded after the layout change is
+        written there even when the file directory has not been migrated yet.
+        """
+        file_path = self.get_file_path(file, user_file_id_pair)
+        if not self._path_master.has_legacy_layout or await self._backend.exists(file_path):
+            return file_path
+        legacy_path = self.get_legacy_file_path(file, user_file_id_pair)
+        if legacy_path is not None and await self._backend.exists(legacy_path):
+            return legacy_path
+        return file_path
+
+    async def stat_content(self, content_path: Path) -> os.stat_result:
+        """Getting the stat of a content path, raising FileNotFoundError if it is missing"""
+        content_stat = await self._backend.stat(content_path)
+        if content_stat is None:
+            raise FileNotFoundError(content_path)
+        return content_stat
+
+    def read_content(self, content_path: Path, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Streaming the bytes from start to end inclusive of a content"""
+        return self._backend.get_range(content_path, start, end)
+
+    async def delete_file(self, file: File, user_file_id_pair: UserFileIDPair) -> bool:
         """
         Deleting a file
 
@@ -55,10 +797,13 @@ class FileStorageService(BaseStorageService):
         Returns:
             True if deleted successfully or the file does not exist
         """
+        # The legacy copy goes first, so that a concurrent migration of the file directory cannot resurrect it
+        legacy_path = self.get_legacy_file_path(file, user_file_id_pair)
+        legacy_deleted = legacy_path is None or await self._backend.delete(legacy_path)
         file_path = self.get_file_path(file, user_file_id_pair)
-        return self._delete_file_by_path(file_path)
+        return await self._backend.delete(file_path) and legacy_deleted
 
-    def _delete_file_by_path(self, file_path: Path) -> bool:
+    async def _delete_file_by_path(self, file_path: Path) -> bool:
         """
         Deleting a file by path
 
@@ -70,9 +815,8 @@ class FileStorageService(BaseStorageService):
 
         """
         try:
-            if file_path.exists():
-                file_path.unlink()
-                logger.debug(f"File deleted: {file_path}")
+            await self._io.run(file_path.unlink, missing_ok=True)
+            logger.debug(f"File deleted: {file_path}")
             return True
         except Exception as e:
             logger.error(f"Error deleting file {file_path}: {e}")
@@ -86,3 +830,88 @@ class FileStorageService(BaseStorageService):
             file_uid=user_file_id_pair.file_uid,
             filename=file.storage_filename
         )
+
+    def get_legacy_file_path(self, file: File, user_file_id_pair: UserFileIDPair) -> Optional[Path]:
+        """Getting the path of the file in the legacy layout, None without a legacy layout"""
+        return self._path_master.get_legacy_path(
+            "user_file",
+            user_uid=user_file_id_pair.user_uid,
+            file_uid=user_file_id_pair.file_uid,
+            filename=file.storage_filename
+        )
+
+    async def migrate_file_dir(self, user_file_id_pair: UserFileIDPair) -> str:
+        """
+        Moves the directory of a file from the legacy layout into the current one
+
+        The whole directory is renamed at once, so the content and any
+        leftovers move together. When the current directory already exists
+        (content written after the layout change) or is on another volume, the
+        entries are moved one by one and the current ones win. Directories of
+        uploads in progress are skipped and picked up by a later run.
+
+        Returns:
+            str: "moved", "merged", "busy" or "missing"
+        """
+        if not self._backend.is_local:
+            return "missing"
+        ids = {"user_uid": user_file_id_pair.user_uid, "file_uid": user_file_id_pair.file_uid}
+        legacy_dir = self._path_master.get_legacy_path("file_dir", **ids)
+        if legacy_dir is None:
+            return "missing"
+        file_dir = self._path_master.get_path("file_dir", **ids)
+
+        try:
+            status = await self._io.run(self._move_dir, legacy_dir, file_dir, self._fsync.sync_file_now)
+        except OSError as e:
+            raise ServiceStorageError(f"Failed to migrate file {user_file_id_pair.file_uid}: {e}") from e
+        if status in ("moved", "merged"):
+            await self._fsync.sync_dir(file_dir.parent)
+            await self._fsync.sync_dir(legacy_dir.parent)
+            await self._io.run(self._prune_empty_dirs, legacy_dir.parent, self._path_master.volume_roots)
+            logger.debug(f"File {user_file_id_pair.file_uid} {status} into {file_dir}")
+        return status
+
+    @staticmethod
+    def _move_dir(legacy_dir: Path, file_dir: Path, sync: Callable[[int], None]) -> str:
+        """Renaming or merging a file directory (blocking, run in the storage executor)"""
+        if not legacy_dir.is_dir():
+            return "missing"
+        entries = list(legacy_dir.iterdir())
+        if any(entry.suffix in (".json", ".staging") or ".tmp." in entry.name for entry in entries):
+            return "busy"
+
+        file_dir.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # Also replaces an empty current directory
+            os.rename(legacy_dir, file_dir)
+            return "moved"
+        except OSError as e:
+            if e.errno != errno.EXDEV and not file_dir.is_dir():
+                raise
+
+        file_dir.mkdir(exist_ok=True)
+        for entry in entries:
+            target = file_dir / entry.name
+            if target.exists():
+                entry.unlink(missing_ok=True)
+            else:
+                # A file deleted while copied from another volume must not reappear
+                LocalStorageBackend.move_file(entry, target, sync, drop_if_deleted=True)
+        try:
+            legacy_dir.rmdir()
+        except OSError:
+            pass
+        return "merged"
+
+    @staticmethod
+    def _prune_empty_dirs(dir_path: Path, volume_roots: list[Path]) -> None:
+        """Removing the emptied legacy parents up to the volume root (blocking)"""
+        roots = [root.resolve() for root in volume_roots]
+        dir_path = dir_path.resolve()
+        while dir_path not in roots and any(root in dir_path.parents for root in roots):
+            try:
+                dir_path.rmdir()
+            except OSError:
+                return
+            dir_path = dir_path.parent
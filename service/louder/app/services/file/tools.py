@@ -3,16 +3,27 @@ from core.logger import Logger
 from core.db.models.file import FileModel
 from core.data_mapper.files.file import FileMapper
 from core.dto.user_file_id_pair import UserFileIDPair
+from core.dto.content_challenge import ContentChallenge
 from core.db.models.user_files import UserFileModel
 from core.exceptions import *
+from core import config
 
 from fastapi import UploadFile
 from pathlib import Path
+import hashlib
+import hmac
+import os
+import secrets
+import time
+import uuid
 from uuid6 import UUID
-from typing import Union
+from typing import Union, Optional, Tuple
 
 logger = Logger.get_logger(__name__)
 
+# Challenges signed with a per-process secret can only be answered to the worker that issued them
+_PROOF_SECRET: bytes = (config.get("STORAGE_PROOF_SECRET") or secrets.token_hex(32)).encode()
+
 
 class FileToolsService:
 
@@ -36,24 +47,47 @@ class FileToolsService:
                 - File: File domain object if successful, None if failed
         """
         file_name = getattr(file, 'filename', 'unknown')
+        file_mime_type = getattr(file, 'content_type', 'application/octet-stream')
+        file_size = getattr(file, 'size', 0)
+
+        return self.build_file_metadata(file_name, file_mime_type, file_uid, file_size)
+
+    def build_file_metadata(
+            self,
+            file_name: str,
+            mime_type: Optional[str],
+            file_uid: UUID,
+            file_size: Optional[int] = 0
+    ) -> File:
+        """
+        Creates a File domain object from a raw file name and MIME type.
 
+        Args:
+            file_name: Original file name including the extension
+            mime_type: MIME type of the content
+            file_uid: UUID of the file
+            file_size: File size in bytes
+
+        Returns:
+            File: File domain object
+
+        Raises:
+            ServiceToolsError: If the metadata is invalid
+        """
         file_path = Path(file_name)
         if file_name and not file_name.startswith('.') and file_path.suffix:
             file_extension = file_path.suffix[1:].lower()
         else:
             file_extension = ""
 
-        file_mime_type = getattr(file, 'content_type', 'application/octet-stream')
-        file_size = getattr(file, 'size', 0)
-
         try:
             file = File(
                 name=file_name,
                 uid=file_uid,
                 extension=file_extension,
                 is_public=False,
-                size=file_size,
-                mime_type=file_mime_type
+                size=file_size or 0,
+                mime_type=mime_type or 'application/octet-stream'
             )
             return file
 
@@ -61,6 +95,129 @@ class FileToolsService:
             logger.error(f"Error extract metadata from file: {e}")
             raise ServiceToolsError(f"Error extract metadata from file: {e}")
 
+    def build_etag(self, file: File, stat: os.stat_result) -> str:
+        """
+        Strong ETag of the file content
+
+        Derived from the content hash when known, otherwise from mtime and size.
+        """
+        if file.content_hash:
+            return f'"{file.content_hash}"'
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def etag_matches(self, etag: str, if_none_match: Optional[str]) -> bool:
+        """Weak comparison of an ETag with an If-None-Match header"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag.removeprefix("W/") in candidates
+
+    def parse_byte_range(self, range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+        """
+        First and last byte of a single-range Range header
+
+        Returns:
+            Optional[Tuple[int, int]]: None to serve the whole content (no header,
+                                       another unit, several ranges or an invalid
+                                       range, which RFC 9110 says to ignore)
+
+        Raises:
+            FileRangeError: If the range starts past the end of the content
+        """
+        if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+            return None
+        first, _, last = range_header[len("bytes="):].strip().partition("-")
+        try:
+            if not first:
+                # Suffix range: the last N bytes
+                start, end = max(size - int(last), 0), size - 1
+            else:
+                start, end = int(first), min(int(last), size - 1) if last else size - 1
+        except ValueError:
+            return None
+        if first and last and int(last) < start:
+            return None
+        if start >= size:
+            raise FileRangeError(f"Range {range_header} is not satisfiable for {size} bytes")
+        return start, end
+
+    def issue_content_challenge(
+            self,
+            user_file_id_pair: UserFileIDPair,
+            content_hash: str,
+            size: int
+    ) -> ContentChallenge:
+        """
+        Challenge over a random byte range of the content, proving the client holds it
+
+        The token signs the range and nonce together with the user, the file
+        and the content, so it cannot be answered for another link, and
+        expires after STORAGE_PROOF_TTL seconds.
+        """
+        length = min(config.get("STORAGE_PROOF_LENGTH", 64 * 1024), size)
+        offset = secrets.randbelow(size - length + 1)
+        nonce = secrets.token_hex(16)
+        expires = int(time.time()) + config.get("STORAGE_PROOF_TTL", 300)
+        signature = self._sign_challenge(user_file_id_pair, content_hash, size, offset, length, nonce, expires)
+        return ContentChallenge(
+            token=f"{offset}.{length}.{nonce}.{expires}.{signature}",
+            offset=offset,
+            length=length,
+            nonce=nonce
+        )
+
+    def read_content_challenge(
+            self,
+            token: str,
+            user_file_id_pair: UserFileIDPair,
+            content_hash: str,
+            size: int
+    ) -> Optional[ContentChallenge]:
+        """
+        Challenge of a token issued for this link
+
+        Returns:
+            Optional[ContentChallenge]: None if the token is malformed, forged,
+                                        issued for another link or expired
+        """
+        try:
+            offset, length, nonce, expires, signature = token.split(".")
+            offset, length, expires = int(offset), int(length), int(expires)
+        except ValueError:
+            return None
+        expected = self._sign_challenge(user_file_id_pair, content_hash, size, offset, length, nonce, expires)
+        if not hmac.compare_digest(signature, expected) or expires < time.time():
+            return None
+        return ContentChallenge(token=token, offset=offset, length=length, nonce=nonce)
+
+    def content_proof(self, challenge: ContentChallenge, data: bytes) -> str:
+        """Expected answer to a challenge, given the bytes of its range"""
+        return hashlib.sha256(bytes.fromhex(challenge.nonce) + data).hexdigest()
+
+    @staticmethod
+    def _sign_challenge(
+            user_file_id_pair: UserFileIDPair,
+            content_hash: str,
+            size: int,
+            offset: int,
+            length: int,
+            nonce: str,
+            expires: int
+    ) -> str:
+        message = (f"{user_file_id_pair.user_uid}:{user_file_id_pair.file_uid}:{content_hash}:{size}:"
+                   f"{offset}:{length}:{nonce}:{expires}")
+        return hmac.new(_PROOF_SECRET, message.encode(), hashlib.sha256).hexdigest()
+
+    def uuid7_bound(self, timestamp_ms: int) -> str:
+        """Smallest uuid7 string generated at the given Unix time in milliseconds"""
+        return str(uuid.UUID(int=timestamp_ms << 80))
+
+    def uuid7_timestamp_ms(self, uid: UUID) -> int:
+        """Unix time in milliseconds embedded in a uuid7"""
+        return uid.int >> 80
+
     def validate_upload_file(self, upload_file: UploadFile) -> bool:
         """Validation of the uploaded file"""
         if not upload_file or getattr(upload_file, 'size', 0) == 0:
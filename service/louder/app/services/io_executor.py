@@ -0,0 +1,99 @@
+from core.logger import Logger
+from core import config
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import functools
+import time
+
+logger = Logger.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class StorageIOExecutor:
+    """
+    Singleton thread pool running the blocking filesystem calls of the storage layer.
+
+    On network storage a stat, mkdir or unlink can take tens of milliseconds;
+    running them here keeps the event loop free. The pool has its own
+    STORAGE_IO_THREADS threads, so storage stalls cannot starve the default
+    executor, and it is also passed to aiofiles.
+
+    Attributes:
+        calls: Number of completed calls
+        pending: Calls submitted and not completed yet (queued or running)
+        max_pending: Highest number of pending calls seen
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init_executor()
+        return cls._instance
+
+    def _init_executor(self) -> None:
+        self._threads: int = config.get("STORAGE_IO_THREADS", 16)
+        self._executor = ThreadPoolExecutor(max_workers=self._threads, thread_name_prefix="storage-io")
+        self.calls = 0
+        self.pending = 0
+        self.max_pending = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+        self._max_wait = 0.0
+        self._max_run = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The underlying pool, for libraries taking an executor (aiofiles)"""
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs a blocking call in the pool and waits for its result.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments of the call
+            **kwargs: Keyword arguments of the call
+        """
+        timings = [time.perf_counter(), 0.0, 0.0]
+
+        def call() -> T:
+            timings[1] = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[2] = time.perf_counter()
+
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(call))
+        finally:
+            self.pending -= 1
+            if timings[2]:
+                self._record(timings[1] - timings[0], timings[2] - timings[1])
+
+    def _record(self, wait: float, run: float) -> None:
+        self.calls += 1
+        self._wait_total += wait
+        self._run_total += run
+        self._max_wait = max(self._max_wait, wait)
+        self._max_run = max(self._max_run, run)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Queue depth and latency counters, for tuning STORAGE_IO_THREADS"""
+        return {
+            "threads": self._threads,
+            "calls": self.calls,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "avg_wait_ms": self._wait_total / self.calls * 1000 if self.calls else None,
+            "avg_run_ms": self._run_total / self.calls * 1000 if self.calls else None,
+            "max_wait_ms": self._max_wait * 1000,
+            "max_run_ms": self._max_run * 1000,
+        }
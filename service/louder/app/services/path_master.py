@@ -1,15 +1,132 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Optional, Tuple
 from core import config
+from core.logger import Logger
+from app.services.volume_ring import VolumeRing
+import hashlib
+import os
+import re
+import string
+import threading
 import yaml
-from uuid6 import UUID
+
+logger = Logger.get_logger(__name__)
+
+# Template parameters placing a path on a volume, by priority
+_PLACEMENT_KEYS = ("file_uid", "content_hash")
+
+
+@lru_cache(maxsize=65536)
+def _digest(value: Any) -> str:
+    """Hex hash of a template value, cached by the value itself (UUIDs are hashable)"""
+    return hashlib.blake2b(str(value).encode(), digest_size=16).hexdigest()
+
+
+class _CompiledTemplate:
+    """
+    Path template parsed once into a str.format_map pattern.
+
+    A purely numeric format spec is a hash-prefix fan-out placeholder: it
+    selects hex characters of a hash of the value instead of padding it.
+    "{user_uid:2}" is the first two characters and "{user_uid:2:4}" the third
+    and fourth. UUIDv7 values start with their timestamp, so their own prefix
+    would put every recent user in one directory. Such fields are replaced by
+    synthetic ones computed before formatting; the others, UUIDs included, are
+    converted by format_map itself.
+    """
+
+    __slots__ = ("_pattern", "_shards", "_placement_key")
+
+    _SHARD_SPEC = re.compile(r"^(\d+)(?::(\d+))?$")
+
+    def __init__(self, template: str):
+        pattern = []
+        shards: List[Tuple[str, str, int, int]] = []
+        fields = set()
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+            pattern.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field_name is None:
+                continue
+            fields.add(field_name)
+            match = self._SHARD_SPEC.match(format_spec or "")
+            if match is not None and not conversion:
+                start, end = match.groups()
+                start, end = (0, int(start)) if end is None else (int(start), int(end))
+                shard_field = f"_shard{len(shards)}"
+                shards.append((shard_field, field_name, start, end))
+                pattern.append(f"{{{shard_field}}}")
+            else:
+                pattern.append(
+                    "{" + field_name
+                    + (f"!{conversion}" if conversion else "")
+                    + (f":{format_spec}" if format_spec else "")
+                    + "}"
+                )
+        self._pattern: str = "".join(pattern)
+        self._shards: Tuple[Tuple[str, str, int, int], ...] = tuple(shards)
+        self._placement_key: Optional[str] = next((key for key in _PLACEMENT_KEYS if key in fields), None)
+
+    def render(self, kwargs: Dict[str, Any]) -> str:
+        if self._shards:
+            kwargs = dict(kwargs)
+            for shard_field, field_name, start, end in self._shards:
+                kwargs[shard_field] = _digest(kwargs[field_name])[start:end]
+        return self._pattern.format_map(kwargs)
+
+    def placement(self, kwargs: Dict[str, Any]) -> Optional[Any]:
+        """Value placing the path on a volume, None for the primary volume"""
+        return None if self._placement_key is None else kwargs.get(self._placement_key)
+
+
+class _PathLayout:
+    """Immutable snapshot of paths_config.yaml with its compiled templates"""
+
+    __slots__ = (
+        "base_storage_path", "templates", "legacy_templates", "volumes", "previous_volumes", "mtime"
+    )
+
+    def __init__(self, raw_config: Dict, mtime: float):
+        storage = raw_config['storage']
+        self.base_storage_path = Path(storage['base_path'])
+        self.templates: Dict[str, _CompiledTemplate] = {
+            path_type: _CompiledTemplate(template) for path_type, template in raw_config['templates'].items()
+        }
+        raw_legacy = raw_config.get('legacy_templates') or {}
+        # Types without a legacy template keep their current one, and are legacy by volume only
+        self.legacy_templates: Dict[str, _CompiledTemplate] = {
+            path_type: _CompiledTemplate(template)
+            for path_type, template in {**raw_config['templates'], **raw_legacy}.items()
+        } if raw_legacy or storage.get('previous_volumes') else {}
+        self.volumes = VolumeRing.from_config(storage.get('volumes'), self.base_storage_path)
+        self.previous_volumes = (
+            VolumeRing.from_config(storage['previous_volumes'], self.base_storage_path)
+            if storage.get('previous_volumes') else None
+        )
+        self.mtime = mtime
+
 
 class PathMaster:
-    def __init__(self):
-        config_path = self._get_config_path()
-        self._config = self._load_config(config_path)
-        self.base_storage_path = Path(self._config['storage']['base_path'])
-        self._path_templates = self._config['templates']
+    """
+    Singleton resolving the storage paths from the templates of paths_config.yaml.
+
+    The file is read and its templates compiled once per process. With
+    PATH_CONFIG_RELOAD_INTERVAL set, reload_if_changed is polled by a
+    background task and swaps in a new snapshot when the file mtime changes;
+    a resolution in progress keeps the snapshot it started with.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._layout = instance._load_layout()
+                    cls._instance = instance
+        return cls._instance
 
     @staticmethod
     def _get_config_path():
@@ -20,23 +137,80 @@ class PathMaster:
         with open(config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
 
-    def get_path(self, path_type: str, **kwargs) -> Path:
-        if path_type not in self._path_templates:
-            available_types = list(self._path_templates.keys())
-            raise ValueError(f"Unknown path type: '{path_type}'. Available: {available_types}")
+    def _load_layout(self) -> _PathLayout:
+        config_path = self._get_config_path()
+        mtime = os.stat(config_path).st_mtime
+        return _PathLayout(self._load_config(config_path), mtime)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reloading paths_config.yaml if it was modified (blocking)
+
+        An invalid file is logged and the current layout is kept.
 
-        template = self._path_templates[path_type]
+        Returns:
+            bool: True if a new layout was loaded
+        """
+        try:
+            if os.stat(self._get_config_path()).st_mtime == self._layout.mtime:
+                return False
+            self._layout = self._load_layout()
+        except Exception as e:
+            logger.error(f"Failed to reload the path configuration, keeping the current one: {e}")
+            return False
+        logger.info("Path configuration reloaded")
+        return True
+
+    @property
+    def base_storage_path(self) -> Path:
+        return self._layout.base_storage_path
+
+    @property
+    def has_legacy_layout(self) -> bool:
+        """Whether files may still be stored with the legacy templates or on the previous volumes"""
+        return bool(self._layout.legacy_templates)
+
+    @property
+    def volume_roots(self) -> List[Path]:
+        """Root paths of the current and previous volumes"""
+        layout = self._layout
+        roots = layout.volumes.roots
+        if layout.previous_volumes is not None:
+            roots += [root for root in layout.previous_volumes.roots if root not in roots]
+        return roots
 
+    def get_path(self, path_type: str, **kwargs) -> Path:
+        layout = self._layout
         try:
-            formatted_kwargs = {}
-            for key, value in kwargs.items():
-                if isinstance(value, UUID):
-                    formatted_kwargs[key] = str(value)
-                else:
-                    formatted_kwargs[key] = value
+            template = layout.templates[path_type]
+        except KeyError:
+            raise ValueError(f"Unknown path type: '{path_type}'. Available: {list(layout.templates)}")
+        return self._render(template, kwargs, layout.volumes)
+
+    def get_legacy_path(self, path_type: str, **kwargs) -> Optional[Path]:
+        """
+        Getting the path of the legacy layout: the legacy template, if any, on
+        the previous volumes, if any
 
-            path_str = template.format(**formatted_kwargs)
-            return self.base_storage_path / path_str
+        Returns:
+            Optional[Path]: None if the legacy path is the current one
+        """
+        layout = self._layout
+        template = layout.legacy_templates.get(path_type)
+        if template is None:
+            return None
+        legacy_path = self._render(template, kwargs, layout.previous_volumes or layout.volumes)
+        current = layout.templates.get(path_type)
+        if current is not None and legacy_path == self._render(current, kwargs, layout.volumes):
+            return None
+        return legacy_path
 
+    @staticmethod
+    def _render(template: _CompiledTemplate, kwargs: Dict[str, Any], volumes: VolumeRing) -> Path:
+        try:
+            path_str = template.render(kwargs)
         except KeyError as e:
             raise ValueError(f"Missing parameter for template: {e}")
+        placement = template.placement(kwargs)
+        root = volumes.primary if placement is None else volumes.locate(placement)
+        return root / path_str
@@ -29,6 +29,20 @@ class RepositoryService:
             logger.error(f"Failed to commit transaction: {e}")
             raise ServiceRepositoryError(f"Database commit failed: {e}")
 
+    async def release_connection(self) -> None:
+        """
+        Ending the current read transaction, so its connection returns to the pool
+
+        Called after read-only checks and before long disk I/O; a later query
+        checks a connection out again.
+        """
+        try:
+            if self._db.in_transaction():
+                await self._db.commit()
+        except Exception as e:
+            logger.error(f"Failed to release connection: {e}")
+            raise ServiceRepositoryError(f"Database connection release failed: {e}")
+
     async def rollback_db(self) -> None:
         """Rollback of a database transaction"""
         try:
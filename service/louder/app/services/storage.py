@@ -2,6 +2,7 @@ from abc import ABC
 
 from core.logger import Logger
 from app.services.path_master import PathMaster
+from app.services.io_executor import StorageIOExecutor
 
 from typing import Dict
 import aiofiles
@@ -20,11 +21,12 @@ class BaseStorageService(ABC):
     @staticmethod
     async def get_from_file_json(storage_path) -> Dict:
         logger.debug("Start reading json from")
-        if not storage_path.exists() or os.path.getsize(storage_path) == 0:
-            BaseStorageService.check_and_create_text_file(storage_path)
+        io = StorageIOExecutor()
+        if await io.run(BaseStorageService._is_empty_file, storage_path):
+            await io.run(BaseStorageService.check_and_create_text_file, storage_path)
             return {}
         try:
-            async with aiofiles.open(storage_path, 'r', encoding='utf-8') as f:
+            async with aiofiles.open(storage_path, 'r', encoding='utf-8', executor=io.executor) as f:
                 content = await f.read()
                 try:
                     data = json.loads(content)
@@ -44,11 +46,12 @@ class BaseStorageService(ABC):
     @staticmethod
     async def get_from_file_text(storage_path) -> str:
         logger.debug("Start reading text from ")
-        if not storage_path.exists() or os.path.getsize(storage_path) == 0:
-            BaseStorageService.check_and_create_text_file(storage_path)
+        io = StorageIOExecutor()
+        if await io.run(BaseStorageService._is_empty_file, storage_path):
+            await io.run(BaseStorageService.check_and_create_text_file, storage_path)
             return ""
         try:
-            async with aiofiles.open(storage_path, 'r', encoding='utf-8') as f:
+            async with aiofiles.open(storage_path, 'r', encoding='utf-8', executor=io.executor) as f:
                 content = await f.read()
                 logger.debug("Successfully read text from ")
                 return content
@@ -59,11 +62,15 @@ class BaseStorageService(ABC):
     @staticmethod
     async def save_in_file_json(storage_path, data) -> bool:
         logger.debug("The beginning of saving json to the database")
-        BaseStorageService.check_and_create_text_file(storage_path)
+        io = StorageIOExecutor()
+        await io.run(BaseStorageService.check_and_create_text_file, storage_path)
         try:
             json_data = json.dumps(data, ensure_ascii=False, indent=4)
-            async with aiofiles.open(storage_path, 'w', encoding='utf-8') as f:
+            # Written aside and renamed, so a crash never leaves a truncated json
+            tmp_path = storage_path.with_name(f"{storage_path.name}.tmp")
+            async with aiofiles.open(tmp_path, 'w', encoding='utf-8', executor=io.executor) as f:
                 await f.write(json_data)
+            await io.run(os.replace, tmp_path, storage_path)
             logger.debug("Saving the analog in the database was successful")
             return True
         except Exception as e:
@@ -73,10 +80,11 @@ class BaseStorageService(ABC):
     @staticmethod
     async def save_in_file_text(storage_path, data) -> bool:
         logger.debug("The beginning of saving text to the database")
-        if not BaseStorageService.check_and_create_text_file(storage_path):
+        io = StorageIOExecutor()
+        if not await io.run(BaseStorageService.check_and_create_text_file, storage_path):
             return False
         try:
-            async with aiofiles.open(storage_path, 'w', encoding='utf-8') as f:
+            async with aiofiles.open(storage_path, 'w', encoding='utf-8', executor=io.executor) as f:
                 await f.write(data)
             logger.debug("Saving in the database was successful text")
             return True
@@ -84,6 +92,11 @@ class BaseStorageService(ABC):
             logger.error(f"Error saving file text: {e}")
             return False
 
+    @staticmethod
+    def _is_empty_file(path) -> bool:
+        """Check for a missing or empty file (blocking, run in the storage executor)"""
+        return not path.exists() or os.path.getsize(path) == 0
+
     @staticmethod
     def check_and_create_text_file(path) -> bool:
         logger.debug("We check the availability of the database or create")
@@ -0,0 +1,38 @@
+from core.token_manager.service_client.file import FileServiceTokenManager
+from core.logger import Logger
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Optional
+import hmac
+
+logger = Logger.get_logger(__name__)
+
+
+class TokenIntrospectionService:
+    _instance = None
+    security = HTTPBearer()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @staticmethod
+    def has_service_key(credentials: HTTPAuthorizationCredentials = Depends(security)) -> bool:
+        """Dependency of the internal endpoints: the bearer token must be the service secret key"""
+        my_token = TokenIntrospectionService._get_service_key()
+        if not my_token:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        if not hmac.compare_digest(credentials.credentials.encode(), my_token.encode()):
+            logger.warning("Attempt to access with an invalid service token")
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        return True
+
+    @staticmethod
+    def _get_service_key() -> Optional[str]:
+        successful, token = FileServiceTokenManager().get_token()
+        if successful:
+            return token
+        logger.error("Failed to retrieve a token from the storage for validation")
+        return None
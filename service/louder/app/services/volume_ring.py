@@ -0,0 +1,67 @@
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+import hashlib
+
+
+class VolumeRing:
+    """
+    Weighted consistent hash ring of storage volumes.
+
+    Every volume owns weight * points_per_weight points of a 64-bit ring and a
+    key is placed on the volume of the first point after its hash. Adding a
+    volume only takes over the keys falling before its own points, so the share
+    of data to move is its share of the total weight. The points depend on the
+    volume name and weight only, so every worker resolves the same volume.
+    """
+
+    def __init__(self, volumes: List[Tuple[str, Path, float]], points_per_weight: int = 128):
+        """
+        Args:
+            volumes: Name, root path and weight of every volume
+            points_per_weight: Ring points per unit of weight, more points even out the shares
+        """
+        if not volumes:
+            raise ValueError("At least one storage volume is required")
+
+        self._roots: List[Path] = [root for _, root, _ in volumes]
+        points = []
+        for name, root, weight in volumes:
+            if weight <= 0:
+                raise ValueError(f"Weight of storage volume '{name}' must be positive")
+            for i in range(max(1, round(weight * points_per_weight))):
+                points.append((self._hash(f"{name}#{i}"), root))
+        points.sort(key=lambda point: point[0])
+        self._hashes: List[int] = [point_hash for point_hash, _ in points]
+        self._points: List[Path] = [root for _, root in points]
+
+    @classmethod
+    def from_config(cls, volumes: Optional[List[dict]], default_root: Path) -> 'VolumeRing':
+        """Building the ring from the "volumes" list of paths_config.yaml, or the single base path"""
+        if not volumes:
+            return cls([(str(default_root), default_root, 1)])
+        return cls([
+            (str(volume.get('name', volume['path'])), Path(volume['path']), float(volume.get('weight', 1)))
+            for volume in volumes
+        ])
+
+    @property
+    def roots(self) -> List[Path]:
+        """Root paths of the volumes, in configuration order"""
+        return list(self._roots)
+
+    @property
+    def primary(self) -> Path:
+        """Volume of paths without a placement key"""
+        return self._roots[0]
+
+    def locate(self, key: Any) -> Path:
+        """Root path of the volume holding the key (hashed as a string)"""
+        if len(self._roots) == 1:
+            return self._roots[0]
+        index = bisect_right(self._hashes, self._hash(str(key)))
+        return self._points[index % len(self._points)]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
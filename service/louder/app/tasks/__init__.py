@@ -0,0 +1,7 @@
+from .file_changes import compact_file_changes, run_file_change_compaction
+from .loop_lag import EventLoopLagMonitor
+from .storage_layout import migrate_storage_layout, run_storage_rebalance
+from .path_config import run_path_config_reload
+from .leader import LeaderLock
+
+__all__ = ['compact_file_changes', 'run_file_change_compaction', 'EventLoopLagMonitor', 'migrate_storage_layout', 'run_storage_rebalance', 'run_path_config_reload', 'LeaderLock']
@@ -0,0 +1,43 @@
+from core.db.db import AsyncSessionLocal
+from core.depends.container import ServiceContainer
+from app.tasks.leader import LeaderLock
+from core.logger import Logger
+from core import config
+
+import asyncio
+
+logger = Logger.get_logger(__name__)
+
+
+async def compact_file_changes(services: ServiceContainer) -> int:
+    """
+    Compacts the file change log once, in its own database session.
+
+    Args:
+        services: Service graph of the application (app.state.services)
+
+    Returns:
+        int: Number of removed changes
+    """
+    async with AsyncSessionLocal() as session:
+        return await services.file_service(session).compact_file_changes()
+
+
+async def run_file_change_compaction(services: ServiceContainer) -> None:
+    """
+    Background loop compacting the file change log every FILE_CHANGES_COMPACTION_INTERVAL
+    seconds, on the worker holding the leader lock
+    """
+    interval = config.get("FILE_CHANGES_COMPACTION_INTERVAL", 3600)
+    lock = LeaderLock("file_change_compaction")
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            if not lock.acquire():
+                continue
+            try:
+                await compact_file_changes(services)
+            except Exception as e:
+                logger.error(f"File change log compaction failed: {e}")
+    finally:
+        lock.release()
@@ -0,0 +1,55 @@
+from core.logger import Logger
+from app.services.path_master import PathMaster
+
+from typing import Optional
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = Logger.get_logger(__name__)
+
+
+class LeaderLock:
+    """
+    Exclusive file lock electing the worker running a background task.
+
+    The lock file lives under the storage root, so one worker of the workers
+    sharing it holds the lock. It is kept until the process exits; the other
+    workers retry on each interval and take over when the holder is gone.
+    Without fcntl (Windows) every process is the leader.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """
+        Taking the lock if it is free (blocking, but never waits on the holder)
+
+        Returns:
+            bool: True if this process holds the lock
+        """
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            return True
+        lock_path = PathMaster().base_storage_path / ".locks" / f"{self._name}.lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        logger.info(f"This worker (pid {os.getpid()}) runs the {self._name} task")
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,52 @@
+from core.logger import Logger
+from core import config
+
+from collections import deque
+from typing import Dict, Optional
+import asyncio
+import time
+
+logger = Logger.get_logger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    Singleton measuring how late the event loop wakes up a sleeping task.
+
+    Any blocking call on the loop (e.g. a filesystem call on slow storage)
+    shows up as lag, so this is the number to watch when tuning
+    STORAGE_IO_THREADS.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init_monitor()
+        return cls._instance
+
+    def _init_monitor(self) -> None:
+        self._interval: float = config.get("EVENT_LOOP_LAG_INTERVAL_MS", 500) / 1000
+        # Last minute of samples at the default interval
+        self._samples: deque = deque(maxlen=120)
+        self.max_lag = 0.0
+
+    async def run(self) -> None:
+        """Background loop sampling the lag every EVENT_LOOP_LAG_INTERVAL_MS"""
+        while True:
+            expected = time.perf_counter() + self._interval
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Recent and all-time lag of the event loop"""
+        samples = list(self._samples)
+        return {
+            "samples": len(samples),
+            "avg_lag_ms": sum(samples) / len(samples) * 1000 if samples else None,
+            "recent_max_lag_ms": max(samples) * 1000 if samples else None,
+            "max_lag_ms": self.max_lag * 1000,
+        }
@@ -0,0 +1,14 @@
+from core import config
+from app.services.path_master import PathMaster
+from app.services.io_executor import StorageIOExecutor
+
+import asyncio
+
+
+async def run_path_config_reload() -> None:
+    """Background loop reloading paths_config.yaml when its mtime changes, every PATH_CONFIG_RELOAD_INTERVAL seconds"""
+    interval = config.get("PATH_CONFIG_RELOAD_INTERVAL", 0)
+    path_master = PathMaster()
+    while True:
+        await asyncio.sleep(interval)
+        await StorageIOExecutor().run(path_master.reload_if_changed)
@@ -0,0 +1,107 @@
+from core.db.db import AsyncSessionLocal
+from core.db.models.user_files import UserFileModel
+from core.db.models.blob import BlobModel
+from core.dto.user_file_id_pair import UserFileIDPair
+from core.exceptions import ServiceStorageError
+from core.logger import Logger
+from core import config
+from app.services.file import FileStorageService
+from app.services.path_master import PathMaster
+from app.tasks.leader import LeaderLock
+
+from collections import Counter
+from sqlalchemy import select
+from uuid6 import UUID
+import asyncio
+
+logger = Logger.get_logger(__name__)
+
+
+async def migrate_storage_layout() -> Counter:
+    """
+    Moves the stored files and blobs from the legacy layout (legacy templates
+    or previous volumes) into the current one, once.
+
+    Files are walked through user_files and blobs through the blob table by
+    primary key, in batches of STORAGE_REBALANCE_BATCH with a pause of
+    STORAGE_REBALANCE_PAUSE_MS between them, so the moves leave disk bandwidth
+    to the traffic. Interrupted runs are simply started again.
+
+    Returns:
+        Counter: Number of files and blobs by status ("moved", "merged", "busy", "missing", "failed")
+    """
+    batch_size = config.get("STORAGE_REBALANCE_BATCH", 500)
+    pause = config.get("STORAGE_REBALANCE_PAUSE_MS", 50) / 1000
+    storage = FileStorageService()
+    statuses = Counter()
+
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(UserFileModel.id, UserFileModel.user_id, UserFileModel.file_id)
+                .where(UserFileModel.id > last_id)
+                .order_by(UserFileModel.id)
+                .limit(batch_size)
+            )).all()
+        if not rows:
+            break
+        for row in rows:
+            pair = UserFileIDPair(user_uid=UUID(row.user_id), file_uid=UUID(row.file_id))
+            try:
+                statuses[await storage.migrate_file_dir(pair)] += 1
+            except ServiceStorageError as e:
+                logger.error(str(e))
+                statuses["failed"] += 1
+        last_id = rows[-1].id
+        await asyncio.sleep(pause)
+
+    last_hash = ""
+    while True:
+        async with AsyncSessionLocal() as session:
+            hashes = (await session.execute(
+                select(BlobModel.content_hash)
+                .where(BlobModel.content_hash > last_hash)
+                .order_by(BlobModel.content_hash)
+                .limit(batch_size)
+            )).scalars().all()
+        if not hashes:
+            break
+        for content_hash in hashes:
+            try:
+                statuses[await storage.migrate_blob(content_hash)] += 1
+            except ServiceStorageError as e:
+                logger.error(str(e))
+                statuses["failed"] += 1
+        last_hash = hashes[-1]
+        await asyncio.sleep(pause)
+
+    logger.info(f"Storage layout migration pass: {dict(statuses)}")
+    return statuses
+
+
+async def run_storage_rebalance() -> None:
+    """
+    Background loop migrating the storage layout every STORAGE_REBALANCE_INTERVAL
+    seconds, on the worker holding the leader lock
+
+    Stops once a pass moves nothing: what is left is either busy (uploads in
+    progress, picked up by scripts/migrate_storage_layout.py) or not in the
+    legacy layout at all.
+    """
+    interval = config.get("STORAGE_REBALANCE_INTERVAL", 0)
+    lock = LeaderLock("storage_rebalance")
+    try:
+        while PathMaster().has_legacy_layout:
+            if lock.acquire():
+                try:
+                    statuses = await migrate_storage_layout()
+                except Exception as e:
+                    logger.error(f"Storage rebalance failed: {e}")
+                else:
+                    if not (statuses["moved"] or statuses["merged"]):
+                        logger.info("Storage rebalance pass moved nothing, stopping")
+                        return
+            await asyncio.sleep(interval)
+    finally:
+        lock.release()
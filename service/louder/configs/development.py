@@ -10,12 +10,63 @@ with open('paths_config.yaml', 'r', encoding='utf-8') as f:
 USER_FILE_UUID_RESTRICTION = {7} # version
 BASE_DIR = Path(__file__).resolve().parent.parent
 PATH_YAML_FILE = os.path.join(BASE_DIR, 'paths_config.yaml')
+PATH_CONFIG_RELOAD_INTERVAL = int(os.getenv("PATH_CONFIG_RELOAD_INTERVAL", 0))  # seconds between mtime checks, 0 disables
 
 #STORAGE
 STORAGE_DIR = Path(paths_config['storage']['base_path'])
 STORAGE_USER_DATA_DIR = STORAGE_DIR / paths_config['storage']['user_data_dir']
 STORAGE_PROMPTS_DIR = STORAGE_DIR / paths_config['storage']['prompts_dir']
 USER_FILE_PATH = paths_config['templates']['user_file']
+STORAGE_DEDUP = os.getenv("STORAGE_DEDUP", "false").lower() in ('true', '1', 'yes')  # content-addressed blobs
+STORAGE_FSYNC = os.getenv("STORAGE_FSYNC", "file")  # none | file | file+dir
+STORAGE_FSYNC_BATCH_WINDOW_MS = 2  # concurrent fsyncs within the window share one batch
+STORAGE_IO_THREADS = int(os.getenv("STORAGE_IO_THREADS", 16))  # threads for blocking filesystem calls
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")  # local | s3
+STORAGE_S3_BUCKET = os.getenv("STORAGE_S3_BUCKET", "louder")
+STORAGE_S3_PREFIX = os.getenv("STORAGE_S3_PREFIX", "")
+STORAGE_S3_ENDPOINT_URL = os.getenv("STORAGE_S3_ENDPOINT_URL")  # e.g. http://localhost:9000 for MinIO
+STORAGE_S3_REGION = os.getenv("STORAGE_S3_REGION")
+STORAGE_S3_ACCESS_KEY = os.getenv("STORAGE_S3_ACCESS_KEY")
+STORAGE_S3_SECRET_KEY = os.getenv("STORAGE_S3_SECRET_KEY")
+STORAGE_S3_PART_SIZE = 8 * 1024 * 1024  # multipart upload above this size
+STORAGE_S3_MAX_CONNECTIONS = 32  # pooled HTTP connections per worker
+STORAGE_S3_UPLOAD_CONCURRENCY = 4  # parts of one upload in flight
+STORAGE_PROOF_SECRET = os.getenv("STORAGE_PROOF_SECRET")  # signs the content challenges; random per worker if unset, set it with several workers
+STORAGE_PROOF_LENGTH = 64 * 1024  # bytes of known content a client hashes to prove it holds them
+STORAGE_PROOF_TTL = 300  # seconds a content challenge can be answered
+STORAGE_REBALANCE_INTERVAL = int(os.getenv("STORAGE_REBALANCE_INTERVAL", 0))  # seconds, 0 disables; one worker per storage root runs it
+STORAGE_REBALANCE_BATCH = 500
+STORAGE_REBALANCE_PAUSE_MS = 50  # pause between batches, leaving disk bandwidth to the traffic
+EVENT_LOOP_LAG_INTERVAL_MS = 500
+
+# UPLOAD
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))  # 1 MB
+UPLOAD_MAX_FILE_SIZE = int(os.getenv("UPLOAD_MAX_FILE_SIZE", 1024 * 1024 * 1024))  # 1 GB
+UPLOAD_MAX_PARALLEL_PARTS = int(os.getenv("UPLOAD_MAX_PARALLEL_PARTS", 8))  # per user and worker, not enforced across workers
+UPLOAD_MAX_PART_NUMBER = 10000
+UPLOAD_BATCH_CONCURRENCY = int(os.getenv("UPLOAD_BATCH_CONCURRENCY", 4))  # disk writes per multi-file request
+
+# FILE LISTING
+FILE_LIST_DEFAULT_LIMIT = 100
+FILE_LIST_MAX_LIMIT = 1000
+FILE_LIST_CACHE_ENABLED = os.getenv("FILE_LIST_CACHE_ENABLED", "true").lower() in ('true', '1', 'yes')
+FILE_LIST_CACHE_ENCODED = os.getenv("FILE_LIST_CACHE_ENCODED", "true").lower() in ('true', '1', 'yes')  # cache the JSON bytes of the listing
+FILE_LIST_CACHE_BACKEND = os.getenv("FILE_LIST_CACHE_BACKEND", "memory")  # memory | redis
+FILE_LIST_CACHE_REDIS_URL = os.getenv("FILE_LIST_CACHE_REDIS_URL")
+FILE_LIST_CACHE_TTL = 30  # seconds
+FILE_LIST_CACHE_MAX_USERS = 10000
+FILE_LIST_VERSION_TTL = 2  # seconds a worker may serve a listing version changed by another worker
+
+# Batch file creation
+FILE_BATCH_MAX_FILES = 1000
+
+# File change feed
+FILE_CHANGES_DEFAULT_LIMIT = 500
+FILE_CHANGES_MAX_LIMIT = 5000
+FILE_CHANGES_RETENTION = 7 * 24 * 3600  # seconds; older cursors must re-list
+FILE_CHANGES_SETTLE_MS = 1000  # changes younger than this are held back until concurrent commits land
+FILE_CHANGES_COMPACTION_INTERVAL = int(os.getenv("FILE_CHANGES_COMPACTION_INTERVAL", 3600))  # seconds, 0 disables; one worker per storage root runs it
+FILE_CHANGES_COMPACTION_BATCH = 1000
 
 # SERVICE URLS
 USER_SERVICE_URL = os.getenv('USER_SERVICE_URL')
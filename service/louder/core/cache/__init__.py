@@ -0,0 +1,9 @@
+from core.cache.backend import CacheBackend
+from core.cache.memory import MemoryCacheBackend
+from core.cache.redis import RedisCacheBackend
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+]
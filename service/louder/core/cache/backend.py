@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Storage of cached values, local to the worker or shared between workers.
+
+    Every key has a generation, bumped by invalidate. A value loaded from the
+    source of truth is cached with set_if_generation and the generation read
+    before the load, so a load that raced a write is not cached after it.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value, None on a miss or an expired entry"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_generation(self, key: str) -> int:
+        """Returns the number of invalidations of the key (0 if unknown)"""
+        pass
+
+    @abstractmethod
+    async def set_if_generation(self, key: str, value: Any, generation: int) -> bool:
+        """
+        Caches the value unless the key was invalidated since its generation was read
+
+        Returns:
+            bool: True if the value was cached
+        """
+        pass
+
+    @abstractmethod
+    async def invalidate(self, key: str) -> None:
+        """Drops the cached value and bumps the generation of the key"""
+        pass
+
+    def size(self) -> int:
+        """Number of entries held by the backend, -1 if unknown"""
+        return -1
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import time
+
+from core.cache.backend import CacheBackend
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with a TTL and a bound on the number of entries.
+
+    Entries are local to the worker: other uvicorn workers only see an
+    invalidation once the TTL expires.
+
+    Invalidations number the generations from a single increasing counter.
+    The table of generations is bounded too: a key evicted from it reads the
+    highest evicted generation, so the generation of a key never goes back
+    to a value a load in progress may have read.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._max_generations = max_entries * 4
+        self._last_generation = 0
+        self._evicted_generation = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def get_generation(self, key: str) -> int:
+        return self._generations.get(key, self._evicted_generation)
+
+    async def set_if_generation(self, key: str, value: Any, generation: int) -> bool:
+        if await self.get_generation(key) != generation:
+            return False
+        await self.set(key, value)
+        return True
+
+    async def invalidate(self, key: str) -> None:
+        self._last_generation += 1
+        self._generations[key] = self._last_generation
+        self._generations.move_to_end(key)
+        while len(self._generations) > self._max_generations:
+            _, generation = self._generations.popitem(last=False)
+            self._evicted_generation = max(self._evicted_generation, generation)
+        self._entries.pop(key, None)
+
+    def size(self) -> int:
+        return len(self._entries)
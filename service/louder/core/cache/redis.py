@@ -0,0 +1,80 @@
+from typing import Any, Callable, Optional
+
+from core.cache.backend import CacheBackend
+
+# Generations outlive any load racing an invalidation by far
+GENERATION_TTL = 24 * 3600
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all workers, stored in Redis with a TTL.
+
+    Requires the optional `redis` package. Values are stored as bytes through
+    the given serializer and deserializer. Generations are Redis counters
+    next to the values, so an invalidation by any worker stops every other
+    worker from caching a value loaded before it.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            ttl: float,
+            serializer: Callable[[Any], bytes],
+            deserializer: Callable[[bytes], Any],
+            prefix: str = "louder:"
+    ):
+        try:
+            from redis import asyncio as redis_asyncio
+            from redis.exceptions import WatchError
+        except ImportError as e:
+            raise RuntimeError("The redis cache backend requires the 'redis' package") from e
+
+        self._client = redis_asyncio.from_url(url)
+        self._watch_error = WatchError
+        self._ttl = max(1, int(ttl))
+        self._serializer = serializer
+        self._deserializer = deserializer
+        self._prefix = prefix
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self._prefix}gen:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        data = await self._client.get(self._prefix + key)
+        if data is None:
+            return None
+        return self._deserializer(data)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._client.set(self._prefix + key, self._serializer(value), ex=self._ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+    async def get_generation(self, key: str) -> int:
+        return int(await self._client.get(self._generation_key(key)) or 0)
+
+    async def set_if_generation(self, key: str, value: Any, generation: int) -> bool:
+        # Compare-and-set: WATCH aborts the write if an invalidation lands in between
+        data = self._serializer(value)
+        generation_key = self._generation_key(key)
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(generation_key)
+                if int(await pipe.get(generation_key) or 0) != generation:
+                    return False
+                pipe.multi()
+                pipe.set(self._prefix + key, data, ex=self._ttl)
+                await pipe.execute()
+                return True
+            except self._watch_error:
+                return False
+
+    async def invalidate(self, key: str) -> None:
+        generation_key = self._generation_key(key)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(generation_key)
+            pipe.expire(generation_key, GENERATION_TTL)
+            pipe.delete(self._prefix + key)
+            await pipe.execute()
@@ -2,7 +2,6 @@ from core.domain.file import File
 from core.db.models.file import FileModel
 from app.http.response_models.file import FileFieldsResponse
 from core.data_mapper.mapper import StaticMapper
-from uuid6 import UUID
 
 
 class FileMapper(StaticMapper[File, FileModel, FileFieldsResponse]):
@@ -18,22 +17,14 @@ class FileMapper(StaticMapper[File, FileModel, FileFieldsResponse]):
             file_size=file.size,
             mime_type=file.mime_type,
             created_at=file.created_at,
-            updated_at=file.updated_at
+            updated_at=file.updated_at,
+            content_hash=file.content_hash
         )
 
     @staticmethod
     def to_domain(model: FileModel) -> File:
-        """Convert to system model"""
-        return File(
-            name=model.file_name,
-            uid=UUID(model.id),
-            extension=model.file_extension,
-            is_public=model.is_public,
-            size=model.file_size,
-            mime_type=model.mime_type,
-            created_at=model.created_at,
-            updated_at=model.updated_at
-        )
+        """Convert to system model (trusted: the row was validated on creation)"""
+        return File.from_row(model)
     
     @staticmethod
     def to_pydantic(file: File) -> FileFieldsResponse:
@@ -50,5 +41,6 @@ class FileMapper(StaticMapper[File, FileModel, FileFieldsResponse]):
             filename=file.filename,
             storage_filename=file.storage_filename,
             size_in_mb=file.size_in_mb,
-            size_in_kb=file.size_in_kb
+            size_in_kb=file.size_in_kb,
+            content_hash=file.content_hash
         )
\ No newline at end of file
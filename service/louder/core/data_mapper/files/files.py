@@ -1,6 +1,18 @@
 from core.domain.file import File
 from core.db.models.file import FileModel
-from app.http.response_models.file import FilesResponse, FileFieldsResponse
+from app.http.response_models.file import (
+    FilesResponse,
+    FileFieldsResponse,
+    FilesPageResponse,
+    FileChangeResponse,
+    FileChangesResponse
+)
+from app.http.response_models.encoding import encode_json
+from core.db.models.file_change import FILE_CHANGE_DELETED
+from core.data_mapper.files.file import FileMapper
+from uuid6 import UUID
+from typing import Optional, Iterable, Sequence, Any
+import uuid
 from core.data_mapper.mapper import StaticMapper
 
 
@@ -18,28 +30,35 @@ class FilesMapper(StaticMapper[list[File], list[FileModel], list[FilesResponse]]
                 file_size=file.size or 0,
                 mime_type=file.mime_type or "",
                 created_at=file.created_at,
-                updated_at=file.updated_at
+                updated_at=file.updated_at,
+                content_hash=file.content_hash
             )
             for file in files
         ]
 
     @staticmethod
-    def to_domain(models: list[FileModel]) -> list[File]:
-        """Convert database models to system files"""
+    def to_rows(files: list[File]) -> list[dict]:
+        """Convert system files to column values for a bulk insert"""
         return [
-            File(
-                uid=model.id,
-                name=model.file_name,
-                extension=model.file_extension,
-                is_public=model.is_public,
-                size=model.file_size,
-                mime_type=model.mime_type,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            )
-            for model in models
+            {
+                "id": str(file.uid),
+                "file_name": file.name,
+                "file_extension": file.extension or "",
+                "is_public": file.is_public or False,
+                "file_size": file.size or 0,
+                "mime_type": file.mime_type or "",
+                "created_at": file.created_at,
+                "updated_at": file.updated_at,
+                "content_hash": file.content_hash
+            }
+            for file in files
         ]
 
+    @staticmethod
+    def to_domain(models: list[FileModel]) -> list[File]:
+        """Convert database models to system files"""
+        return [File.from_row(model) for model in models]
+
     @staticmethod
     def to_pydantic(files: list[File]) -> FilesResponse:
         """Convert system files to Pydantic responses"""
@@ -57,8 +76,102 @@ class FilesMapper(StaticMapper[list[File], list[FileModel], list[FilesResponse]]
                     filename=file.filename,
                     storage_filename=file.storage_filename,
                     size_in_mb=file.size_in_mb,
-                    size_in_kb=file.size_in_kb
+                    size_in_kb=file.size_in_kb,
+                    content_hash=file.content_hash
                 )
                 for file in files
             }
         )
+
+    @staticmethod
+    def to_pydantic_page(files: list[File], next_cursor: Optional[UUID] = None) -> FilesPageResponse:
+        """Convert a page of system files to an ordered Pydantic response"""
+        return FilesPageResponse(
+            files=[FileMapper.to_pydantic(file) for file in files],
+            next_cursor=str(next_cursor) if next_cursor else None
+        )
+
+    @staticmethod
+    def rows_to_pydantic(rows: Iterable[Sequence[Any]]) -> FilesResponse:
+        """Convert listing column tuples to Pydantic responses"""
+        fields = [FilesMapper._row_to_fields(row) for row in rows]
+        return FilesResponse.model_construct(files={field.uid: field for field in fields})
+
+    @staticmethod
+    def rows_to_pydantic_page(rows: Iterable[Sequence[Any]], next_cursor: Optional[UUID] = None) -> FilesPageResponse:
+        """Convert a page of listing column tuples to an ordered Pydantic response"""
+        return FilesPageResponse.model_construct(
+            files=[FilesMapper._row_to_fields(row) for row in rows],
+            next_cursor=str(next_cursor) if next_cursor else None
+        )
+
+    @staticmethod
+    def rows_to_json(rows: Iterable[Sequence[Any]]) -> bytes:
+        """Encode listing column tuples straight to the JSON of a FilesResponse, with no Pydantic model"""
+        files = {}
+        for row in rows:
+            fields = FilesMapper._row_to_dict(row)
+            files[fields["uid"]] = fields
+        return encode_json({"files": files})
+
+    @staticmethod
+    def rows_to_json_page(rows: Iterable[Sequence[Any]], next_cursor: Optional[UUID] = None) -> bytes:
+        """Encode a page of listing column tuples straight to the JSON of a FilesPageResponse"""
+        return encode_json({
+            "files": [FilesMapper._row_to_dict(row) for row in rows],
+            "next_cursor": str(next_cursor) if next_cursor else None
+        })
+
+    @staticmethod
+    def to_json(listing: FilesResponse) -> bytes:
+        """Encode a listing with the serializer of pydantic-core, without validating it again"""
+        return listing.model_dump_json().encode()
+
+    @staticmethod
+    def change_rows_to_pydantic(rows: Iterable[Sequence[Any]], cursor: str, has_more: bool) -> FileChangesResponse:
+        """Convert change log rows (change ID, file ID, operation, FILE_ROW_COLUMNS) to a Pydantic response"""
+        changes = []
+        for row in rows:
+            change_id, file_id, operation = row[0], row[1], row[2]
+            file = None
+            if operation != FILE_CHANGE_DELETED and row[3] is not None:
+                file = FilesMapper._row_to_fields(row[3:])
+            changes.append(FileChangeResponse.model_construct(
+                change_id=change_id,
+                operation=operation,
+                file_uid=uuid.UUID(file_id),
+                file=file
+            ))
+        return FileChangesResponse.model_construct(changes=changes, cursor=cursor, has_more=has_more)
+
+    @staticmethod
+    def _row_to_fields(row: Sequence[Any]) -> FileFieldsResponse:
+        """
+        Convert one listing column tuple (see FILE_ROW_COLUMNS) to a Pydantic response
+
+        The row comes from the database, so it is trusted: no File domain object
+        is built and no validation is run.
+        """
+        fields = FilesMapper._row_to_dict(row)
+        fields["uid"] = uuid.UUID(fields["uid"])
+        return FileFieldsResponse.model_construct(**fields)
+
+    @staticmethod
+    def _row_to_dict(row: Sequence[Any]) -> dict:
+        """Convert one listing column tuple to the fields of a FileFieldsResponse, the UID as a str"""
+        file_id, name, extension, is_public, size, mime_type, created_at, updated_at, content_hash = row
+        return {
+            "uid": file_id,
+            "name": name,
+            "extension": extension,
+            "is_public": is_public,
+            "size": size,
+            "mime_type": mime_type,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "filename": f"{name}.{extension}" if extension else name,
+            "storage_filename": f"{file_id}.{extension}" if extension else file_id,
+            "size_in_mb": size / (1024 * 1024),
+            "size_in_kb": size / 1024,
+            "content_hash": content_hash
+        }
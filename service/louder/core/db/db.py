@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, func, inspect, text
 from sqlalchemy.pool import NullPool
 import os
 from core import config
@@ -78,7 +78,45 @@ async def get_db():
         finally:
             await session.close()
 
+# Columns added to tables that existing databases already hold. create_all
+# only creates the missing tables, add_missing_columns adds these.
+ADDED_COLUMNS = [
+    ("file", "content_hash"),
+]
+
+
+def add_missing_columns(sync_conn) -> list:
+    """
+    Adds the ADDED_COLUMNS an existing table lacks, with their indexes.
+
+    Runs with Connection.run_sync after create_all, and does nothing on a
+    database that is up to date, so it can be run on every start.
+
+    Returns:
+        list: Names of the added columns and indexes
+    """
+    inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    added = []
+    for table_name, column_name in ADDED_COLUMNS:
+        table = Base.metadata.tables[table_name]
+        column = table.c[column_name]
+        if column_name not in {c["name"] for c in inspector.get_columns(table_name)}:
+            sync_conn.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(sync_conn.dialect)}"
+            ))
+            added.append(f"{table_name}.{column_name}")
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        for index in table.indexes:
+            if column.key in index.columns and index.name not in existing_indexes:
+                index.create(sync_conn)
+                added.append(index.name)
+    return added
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
\ No newline at end of file
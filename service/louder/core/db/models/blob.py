@@ -0,0 +1,16 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from core.db.db import Base
+
+
+class BlobModel(Base):
+    __tablename__ = "blob"
+
+    content_hash = Column(String(64), primary_key=True, nullable=False)
+    size = Column(BigInteger, nullable=False, default=0)
+    ref_count = Column(BigInteger, nullable=False, default=0)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"Blob(content_hash={self.content_hash}, ref_count={self.ref_count})"
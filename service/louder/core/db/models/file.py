@@ -19,6 +19,7 @@ class FileModel(Base):
     is_public = Column(Boolean, nullable=False, default=False)
     file_size = Column(BigInteger, nullable=False, default=0)
     mime_type = Column(String(100), nullable=False, default="")
+    content_hash = Column(String(64), nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy.sql import func
+from core.db.db import Base
+
+FILE_CHANGE_CREATED = "created"
+FILE_CHANGE_UPDATED = "updated"
+FILE_CHANGE_DELETED = "deleted"
+
+
+class FileChangeModel(Base):
+    """Append-only log of file metadata changes, read by the change feed"""
+    __tablename__ = "file_change"
+
+    # uuid7, so the primary key orders changes in time and doubles as the feed cursor
+    id = Column(String(36), primary_key=True, nullable=False)
+    user_id = Column(String(36), nullable=False)
+    file_id = Column(String(36), nullable=False)
+    operation = Column(String(16), nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_file_change_user_id_id', 'user_id', 'id'),
+        Index('ix_file_change_user_id_file_id', 'user_id', 'file_id'),
+    )
+
+    def __repr__(self):
+        return f"FileChange(id={self.id}, file_id={self.file_id}, operation={self.operation})"
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from core.db.db import Base
+
+
+class UserFileVersionModel(Base):
+    __tablename__ = "user_file_version"
+
+    user_id = Column(String(36), primary_key=True, nullable=False)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"UserFileVersion(user_id={self.user_id}, version={self.version})"
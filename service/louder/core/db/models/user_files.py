@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from uuid6 import uuid7
 from sqlalchemy.orm import relationship
@@ -7,7 +7,8 @@ from core.db.db import Base
 class UserFileModel(Base):
     __tablename__ = "user_files"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # SQLite only autoincrements an INTEGER primary key
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
     user_id = Column(String(36), nullable=False)
     file_id = Column(String(36), ForeignKey("file.id"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
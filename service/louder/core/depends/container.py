@@ -0,0 +1,34 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.file.file import FileService
+from app.services.file.tools import FileToolsService
+from app.services.file.data import FileDataService
+from app.services.file.repository import FileRepositoryService
+from app.services.file.storage import FileStorageService
+from app.services.file.cache import FileCacheService
+
+
+class ServiceContainer:
+    """
+    Service graph of the application, built once in create_app.
+
+    The tools, data, storage and cache services hold no per-request state and
+    are shared by all requests; only the repository is bound to the database
+    session of the request.
+    """
+
+    def __init__(self):
+        self.tools_service = FileToolsService()
+        self.data_service = FileDataService()
+        self.storage_service = FileStorageService()
+        self.cache_service = FileCacheService()
+
+    def file_service(self, db: AsyncSession) -> FileService:
+        """File service bound to the session of one request"""
+        return FileService(
+            self.data_service,
+            self.tools_service,
+            FileRepositoryService(db, self.tools_service),
+            self.storage_service,
+            self.cache_service
+        )
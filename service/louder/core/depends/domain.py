@@ -18,4 +18,11 @@ async def get_user_file_id_pair(
 
         return UserFileIDPair(user_uid=user_uuid, file_uid=file_uuid)
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(e)}")
+
+
+async def get_upload_id(upload_id: Annotated[str, Path()]) -> UUID:
+    try:
+        return UUID(upload_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid UUID format: {str(e)}")
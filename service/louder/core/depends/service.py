@@ -1,17 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from core.db.db import get_db
 from app.services.file import *
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
 
-def get_file_service(db: SessionDep) -> FileService:
-    ts = FileToolsService()
-    return FileService(
-        FileDataService(),
-        ts,
-        FileRepositoryService(db, ts),
-        FileStorageService()
-    )
+# Coroutine dependency: a plain function would be run in the threadpool on every request
+async def get_file_service(request: Request, db: SessionDep) -> FileService:
+    return request.app.state.services.file_service(db)
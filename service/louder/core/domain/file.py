@@ -1,9 +1,16 @@
-from typing import Optional
+from typing import Any, Optional
 from uuid6 import uuid7, UUID
 from datetime import datetime
 from core import config
 
 class File:
+    # No per-instance __dict__: listings hold one File per row
+    __slots__ = (
+        "_uid", "_name", "_extension", "_is_public", "_size", "_mime_type",
+        "_created_at", "_updated_at", "_content_hash",
+        "_dir", "_filename", "_storage_filename",
+    )
+
     def __init__(
             self,
             name: str,
@@ -13,20 +20,48 @@ class File:
             size: Optional[int] = 0,
             mime_type: Optional[str] = "",
             created_at: Optional[datetime] = None,
-            updated_at: Optional[datetime] = None
+            updated_at: Optional[datetime] = None,
+            content_hash: Optional[str] = None
     ):
         self._uid: UUID = uid
         self._name: str = name
-        self._dir: str = str(self._uid)
         self._extension: str = extension
         self._is_public: bool = is_public
         self._size: int = size
         self._mime_type: str = mime_type
         self._created_at: datetime = created_at or datetime.now()
         self._updated_at: datetime = updated_at or datetime.now()
+        self._content_hash: Optional[str] = content_hash
+        # Derived names, computed on first access (uid, name and extension never change)
+        self._dir: Optional[str] = None
+        self._filename: Optional[str] = None
+        self._storage_filename: Optional[str] = None
 
         self._validate_parameters()
 
+    @classmethod
+    def from_row(cls, row: Any) -> 'File':
+        """
+        Trusted constructor for a file loaded from the database
+
+        Skips the validation of __init__: the row was validated when the file
+        was created. Accepts a FileModel or a row of FILE_ROW_COLUMNS.
+        """
+        file = cls.__new__(cls)
+        file._uid = UUID(row.id)
+        file._name = row.file_name
+        file._extension = row.file_extension
+        file._is_public = row.is_public
+        file._size = row.file_size
+        file._mime_type = row.mime_type
+        file._created_at = row.created_at
+        file._updated_at = row.updated_at
+        file._content_hash = row.content_hash
+        file._dir = None
+        file._filename = None
+        file._storage_filename = None
+        return file
+
     def _validate_parameters(self) -> None:
         """Validation of input parameters"""
         if not self._name or not self._name.strip():
@@ -50,6 +85,8 @@ class File:
 
     @property
     def dir(self) -> str:
+        if self._dir is None:
+            self._dir = str(self._uid)
         return self._dir
 
     @property
@@ -68,6 +105,12 @@ class File:
     def size(self) -> int:
         return self._size
 
+    @size.setter
+    def size(self, value: int) -> None:
+        if value < 0:
+            raise ValueError("The file size cannot be negative")
+        self._size = value
+
     @property
     def mime_type(self) -> str:
         return self._mime_type
@@ -80,21 +123,28 @@ class File:
     def updated_at(self) -> datetime:
         return self._updated_at
 
+    @property
+    def content_hash(self) -> Optional[str]:
+        """SHA-256 of the file content (hex)"""
+        return self._content_hash
+
+    @content_hash.setter
+    def content_hash(self, value: Optional[str]) -> None:
+        self._content_hash = value
+
     @property
     def filename(self) -> str:
         """Full file name with the extension"""
-        if self._extension:
-            return f"{self._name}.{self._extension}"
-        else:
-            return self._name
+        if self._filename is None:
+            self._filename = f"{self._name}.{self._extension}" if self._extension else self._name
+        return self._filename
 
     @property
     def storage_filename(self) -> str:
         """File name for storage (using UUID)"""
-        if self._extension:
-            return f"{self._uid}.{self._extension}"
-        else:
-            return str(self._uid)
+        if self._storage_filename is None:
+            self._storage_filename = f"{self.dir}.{self._extension}" if self._extension else self.dir
+        return self._storage_filename
 
     @property
     def size_in_mb(self) -> float:
@@ -116,13 +166,14 @@ class File:
         return {
             'name': self._name,
             'uid': str(self._uid),
-            'directory': self._dir,
+            'directory': self.dir,
             'extension': self._extension,
             'is_public': self._is_public,
             'size': self._size,
             'mime_type': self._mime_type,
             'filename': self.filename,
-            'path': self.path
+            'storage_filename': self.storage_filename,
+            'content_hash': self._content_hash
         }
 
     @classmethod
@@ -135,4 +186,5 @@ class File:
             is_public=data['is_public'],
             size=data['size'],
             mime_type=data['mime_type'],
+            content_hash=data.get('content_hash'),
         )
\ No newline at end of file
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachedListing:
+    """Immutable DTO of a cached user file listing and the listing version it was read at"""
+
+    version: int
+    listing: Any  # FilesResponse, or its encoded JSON bytes
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ContentChallenge:
+    """
+    Immutable DTO of a proof-of-possession challenge over a byte range of known content
+
+    The proof is the hex SHA-256 of the nonce bytes followed by the
+    length bytes of the content starting at offset.
+    """
+
+    token: str
+    offset: int
+    length: int
+    nonce: str
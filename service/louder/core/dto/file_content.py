@@ -0,0 +1,17 @@
+from core.domain.file import File
+
+from dataclasses import dataclass
+from pathlib import Path
+import os
+
+
+@dataclass(frozen=True)
+class FileContent:
+    """Immutable DTO describing the stored content of a file"""
+
+    file: File
+    path: Path
+    stat: os.stat_result
+    etag: str
+    # The path is a local file; otherwise the content is read through the storage backend
+    local: bool = True
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class FileListFilter:
+    """Immutable DTO with optional filters of the user file listing"""
+
+    extension: Optional[str] = None
+    mime_type: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
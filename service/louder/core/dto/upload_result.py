@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+from uuid6 import UUID
+
+from core.domain.file import File
+
+
+@dataclass(frozen=True)
+class UploadResult:
+    """Immutable DTO with the outcome of one file of a multi-file upload"""
+
+    file_uid: UUID
+    file: Optional[File] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.file is not None
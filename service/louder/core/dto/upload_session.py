@@ -0,0 +1,54 @@
+from uuid6 import UUID
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class UploadSession:
+    """Immutable DTO for a resumable or parallel multi-part upload session"""
+
+    upload_id: UUID
+    file_name: str
+    mime_type: str
+    total_size: Optional[int] = None
+    offset: int = 0
+    created_at: Optional[datetime] = None
+    multipart: bool = False
+    # Stored with the legacy path templates (not serialized, found by lookup)
+    legacy_layout: bool = False
+
+    @property
+    def is_complete(self) -> bool:
+        """All declared bytes have been received"""
+        return self.total_size is not None and self.offset == self.total_size
+
+    def with_offset(self, offset: int) -> 'UploadSession':
+        """Copy of the session with the committed offset"""
+        return replace(self, offset=offset)
+
+    def to_dict(self) -> dict:
+        """Serializing the session into a dictionary (the offset is kept by the part file)"""
+        return {
+            'upload_id': str(self.upload_id),
+            'file_name': self.file_name,
+            'mime_type': self.mime_type,
+            'total_size': self.total_size,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'multipart': self.multipart,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, offset: int = 0, legacy_layout: bool = False) -> 'UploadSession':
+        """Creating a session from a dictionary"""
+        created_at = data.get('created_at')
+        return cls(
+            upload_id=UUID(data['upload_id']),
+            file_name=data['file_name'],
+            mime_type=data['mime_type'],
+            total_size=data.get('total_size'),
+            offset=offset,
+            created_at=datetime.fromisoformat(created_at) if created_at else None,
+            multipart=data.get('multipart', False),
+            legacy_layout=legacy_layout,
+        )
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class WrittenContent:
+    """Immutable DTO describing content written to the storage"""
+
+    size: int
+    content_hash: Optional[str]
+    path: Optional[Path] = None
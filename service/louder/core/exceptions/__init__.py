@@ -6,7 +6,16 @@ __all__ = [
     'FileError',
     'FileGetError',
     'FileEditError',
+    'FileDeleteError',
     'FileCreationError',
+    'FileSizeLimitError',
+    'FileAccessError',
+    'UploadSessionNotFoundError',
+    'UploadOffsetError',
+    'UploadPartError',
+    'UploadConcurrencyError',
+    'FileChangesExpiredError',
+    'FileRangeError',
     'ServiceError',
     'ServiceToolsError',
     'ServiceStorageError',
@@ -12,4 +12,40 @@ class FileGetError(FileError):
 
 class FileEditError(FileError):
     """Error when editing a file in the system."""
-    pass
\ No newline at end of file
+    pass
+
+class FileDeleteError(FileError):
+    """Error when deleting a file in the system."""
+    pass
+
+class FileSizeLimitError(FileError):
+    """Error when the file exceeds the maximum allowed size."""
+    pass
+
+class FileAccessError(FileError):
+    """Error when the file does not exist or does not belong to the user."""
+    pass
+
+class UploadSessionNotFoundError(FileError):
+    """Error when the upload session does not exist."""
+    pass
+
+class UploadOffsetError(FileError):
+    """Error when the chunk offset does not match the committed offset."""
+    pass
+
+class UploadPartError(FileError):
+    """Error when the upload parts are missing or inconsistent."""
+    pass
+
+class UploadConcurrencyError(FileError):
+    """Error when the user exceeds the limit of parallel part uploads."""
+    pass
+
+class FileChangesExpiredError(FileError):
+    """Error when the change feed cursor is older than the retained change log."""
+    pass
+
+class FileRangeError(FileError):
+    """Error when the requested byte range is outside the file content."""
+    pass
@@ -0,0 +1,67 @@
+"""
+Benchmark of the per-request dependency injection of FileService.
+
+Usage:
+    BENCH_REQUESTS=100000 python scripts/bench_di.py
+
+Compares building the whole service graph in a plain function, as FastAPI ran
+it in the threadpool for every request, with binding a session to the
+ServiceContainer built at startup. The session is a stand-in object, so only
+the construction and dispatch cost is measured.
+"""
+import os
+import sys
+import asyncio
+import gc
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.concurrency import run_in_threadpool
+
+from core.depends.container import ServiceContainer
+from app.services.file import *
+
+
+def build_graph(db) -> FileService:
+    ts = FileToolsService()
+    return FileService(
+        FileDataService(),
+        ts,
+        FileRepositoryService(db, ts),
+        FileStorageService(),
+        FileCacheService()
+    )
+
+
+async def measure(resolve, requests: int) -> tuple[float, int]:
+    gc.collect()
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    start = time.perf_counter()
+    for _ in range(requests):
+        await resolve()
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(stat["collections"] for stat in gc.get_stats()) - collections
+
+
+async def main():
+    requests = int(os.getenv("BENCH_REQUESTS", 100000))
+    db = object()
+    container = ServiceContainer()
+
+    async def per_request_graph():
+        return await run_in_threadpool(build_graph, db)
+
+    async def container_binding():
+        return container.file_service(db)
+
+    graph_time, graph_gcs = await measure(per_request_graph, requests)
+    container_time, container_gcs = await measure(container_binding, requests)
+
+    print(f"📦 Requests: {requests}")
+    print(f"🐢 Graph per request (threadpool): {graph_time / requests * 1e6:8.2f} us/request  {graph_gcs} GC runs")
+    print(f"🚀 Container binding:              {container_time / requests * 1e6:8.2f} us/request  {container_gcs} GC runs")
+    print(f"📈 Speedup: x{graph_time / container_time:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
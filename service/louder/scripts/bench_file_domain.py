@@ -0,0 +1,98 @@
+"""
+Benchmark of the File domain object: construction time and memory per object.
+
+Usage:
+    BENCH_FILES=100000 python scripts/bench_file_domain.py
+
+Compares the validated constructor, the trusted File.from_row used for
+database rows, and a stand-in of the former __dict__-based object.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uuid6 import UUID, uuid7
+
+from core.domain.file import File
+
+Row = namedtuple("Row", [
+    "id", "file_name", "file_extension", "is_public", "file_size",
+    "mime_type", "created_at", "updated_at", "content_hash",
+])
+
+
+class DictFile:
+    """The former layout: ten attributes in a per-instance __dict__"""
+
+    def __init__(self, name, uid, extension, is_public, size, mime_type, created_at, updated_at, content_hash):
+        self._uid = uid
+        self._name = name
+        self._dir = str(uid)
+        self._extension = extension
+        self._is_public = is_public
+        self._size = size
+        self._mime_type = mime_type
+        self._created_at = created_at
+        self._updated_at = updated_at
+        self._content_hash = content_hash
+
+
+def validated(row: Row) -> File:
+    return File(
+        name=row.file_name,
+        uid=UUID(row.id),
+        extension=row.file_extension,
+        is_public=row.is_public,
+        size=row.file_size,
+        mime_type=row.mime_type,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        content_hash=row.content_hash
+    )
+
+
+def legacy(row: Row) -> DictFile:
+    return DictFile(
+        row.file_name, UUID(row.id), row.file_extension, row.is_public, row.file_size,
+        row.mime_type, row.created_at, row.updated_at, row.content_hash
+    )
+
+
+def measure(build, rows: list) -> tuple[float, float]:
+    start = time.perf_counter()
+    objects = [build(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    del objects
+
+    tracemalloc.start()
+    objects = [build(row) for row in rows]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return elapsed, allocated / len(rows)
+
+
+def main():
+    count = int(os.getenv("BENCH_FILES", 100000))
+    now = datetime.now()
+    rows = [
+        Row(str(uuid7()), f"patent-{i}", "pdf", False, 1024 * i, "application/pdf", now, now, None)
+        for i in range(count)
+    ]
+
+    print(f"📦 Files: {count}")
+    for label, build in (
+            ("🐢 __dict__ object (former)", legacy),
+            ("🔒 Slotted, validated       ", validated),
+            ("🚀 Slotted, from_row        ", File.from_row),
+    ):
+        elapsed, per_object = measure(build, rows)
+        print(f"{label}: {elapsed * 1000:8.1f} ms  {per_object:6.0f} B/object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of the user file listing: ORM hydration vs column projection, and
+response serialization.
+
+Usage:
+    BENCH_FILES=50000 BENCH_ROUNDS=7 python scripts/bench_file_listing.py
+
+All paths run the listing query of FileRepositoryService against an in-memory
+SQLite database, so only the per-row mapping and encoding cost is compared:
+- ORM path: FileModel entities, File.from_row (no validation), then a
+  validated FileFieldsResponse per file (FilesMapper.to_pydantic)
+- projection path: FILE_ROW_COLUMNS tuples, then FileFieldsResponse built
+  with model_construct (FilesMapper.rows_to_pydantic)
+The model response path mimics FastAPI with a response_model: the returned
+model is dumped, validated again and encoded with the json module.
+
+Every round runs each path once, so load changes of the machine hit all
+paths alike, and the median round is reported. Compare several runs.
+"""
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, insert
+from sqlalchemy.orm import Session
+from uuid6 import uuid7
+
+from core.db.db import Base
+from core.db.models.file import FileModel
+from core.db.models.user_files import UserFileModel
+from core.db.models.blob import BlobModel
+from core.db.models.user_file_version import UserFileVersionModel
+from core.db.models.file_change import FileChangeModel
+from core.data_mapper.files.file import FileMapper
+from core.data_mapper.files.files import FilesMapper
+from app.http.response_models.file import FilesResponse
+from app.http.response_models import encoding
+from app.services.file.repository import FileRepositoryService, FILE_ROW_COLUMNS
+
+
+def seed(session: Session, user_uid, count: int) -> None:
+    now = datetime.now()
+    file_ids = [str(uuid7()) for _ in range(count)]
+    session.execute(insert(FileModel), [
+        {
+            "id": file_id,
+            "file_name": f"patent-{i}",
+            "file_extension": "pdf",
+            "is_public": False,
+            "file_size": 1024 * (i + 1),
+            "mime_type": "application/pdf",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i, file_id in enumerate(file_ids)
+    ])
+    session.execute(insert(UserFileModel), [
+        {"user_id": str(user_uid), "file_id": file_id} for file_id in file_ids
+    ])
+    session.commit()
+
+
+def orm_listing(session: Session, user_uid):
+    stmt = FileRepositoryService._filter_user_files(select(FileModel), user_uid)
+    files = [FileMapper.to_domain(model) for model in session.execute(stmt).scalars().all()]
+    return FilesMapper.to_pydantic(files)
+
+
+def row_listing(session: Session, user_uid):
+    stmt = FileRepositoryService._filter_user_files(select(*FILE_ROW_COLUMNS), user_uid)
+    return FilesMapper.rows_to_pydantic(session.execute(stmt).all())
+
+
+def model_response(session: Session, user_uid):
+    listing = row_listing(session, user_uid)
+    validated = FilesResponse.model_validate(listing.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+def bytes_response(session: Session, user_uid):
+    stmt = FileRepositoryService._filter_user_files(select(*FILE_ROW_COLUMNS), user_uid)
+    return FilesMapper.rows_to_json(session.execute(stmt).all())
+
+
+def measure(listings, session: Session, user_uid, rounds: int) -> list[float]:
+    """Median time of each listing, the listings taking turns in every round"""
+    times = [[] for _ in listings]
+    for _ in range(rounds):
+        for listing, listing_times in zip(listings, times):
+            session.expunge_all()
+            start = time.perf_counter()
+            listing(session, user_uid)
+            listing_times.append(time.perf_counter() - start)
+    return [statistics.median(listing_times) for listing_times in times]
+
+
+def main():
+    count = int(os.getenv("BENCH_FILES", 10000))
+    rounds = int(os.getenv("BENCH_ROUNDS", 7))
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    user_uid = uuid7()
+
+    with Session(engine) as session:
+        seed(session, user_uid, count)
+        assert len(orm_listing(session, user_uid).files) == len(row_listing(session, user_uid).files) == count
+
+        orm_time, row_time, model_time, bytes_time = measure(
+            [orm_listing, row_listing, model_response, bytes_response], session, user_uid, rounds
+        )
+
+    print(f"📦 Files: {count}, median of {rounds} rounds")
+    print(f"🐢 ORM entities, validated models:  {orm_time * 1000:8.1f} ms  {count / orm_time:12,.0f} rows/s")
+    print(f"🚀 Column tuples, model_construct:  {row_time * 1000:8.1f} ms  {count / row_time:12,.0f} rows/s")
+    print(f"📈 Speedup: x{orm_time / row_time:.1f}")
+    print(f"🐢 Validated model response:        {model_time * 1000:8.1f} ms  {count / model_time:12,.0f} rows/s")
+    print(f"🚀 Column tuples to JSON bytes:     {bytes_time * 1000:8.1f} ms  {count / bytes_time:12,.0f} rows/s"
+          f"  ({'orjson' if encoding.orjson else 'json'})")
+    print(f"📈 Response speedup: x{model_time / bytes_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Compacts the file change log: drops changes past FILE_CHANGES_RETENTION and
+changes superseded by a later change of the same file.
+
+Usage:
+    python scripts/compact_file_changes.py
+
+Meant for cron when the in-process compaction is disabled
+(FILE_CHANGES_COMPACTION_INTERVAL=0).
+"""
+import os
+import sys
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.depends.container import ServiceContainer
+from app.tasks.file_changes import compact_file_changes
+
+
+async def main():
+    removed = await compact_file_changes(ServiceContainer())
+    print(f"🧹 Removed {removed} file changes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,15 @@
+"""
+Creates the tables of the service, and upgrades the existing ones.
+
+Usage:
+    python scripts/init_db.py
+
+create_all only creates the missing tables. The columns added since a
+table was created (ADDED_COLUMNS of core/db/db.py, e.g. file.content_hash
+and its index) are added with ALTER TABLE when missing. The script can be
+run again on an up-to-date database, and must be run before deploying a
+version that reads a new column.
+"""
 import asyncpg
 import aiomysql
 import sys
@@ -7,9 +19,12 @@ from sqlalchemy import text
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-from core.db.db import engine, Base
+from core.db.db import engine, Base, add_missing_columns
 from core.db.models.user_files import UserFileModel
 from core.db.models.file import FileModel
+from core.db.models.blob import BlobModel
+from core.db.models.user_file_version import UserFileVersionModel
+from core.db.models.file_change import FileChangeModel
 from core import config
 
 
@@ -80,7 +95,10 @@ async def create_tables():
         async with engine.begin() as conn:
             print("📦 Creating tables...")
             await conn.run_sync(Base.metadata.create_all)
+            added = await conn.run_sync(add_missing_columns)
         print("✅ Tables created successfully!")
+        if added:
+            print(f"✅ Added to existing tables: {', '.join(added)}")
         return True
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
@@ -0,0 +1,36 @@
+"""
+Moves the stored files and blobs from the legacy layout (legacy_templates and
+previous_volumes of paths_config.yaml, both commented out by default) into the
+current one. Uncomment them, describing the old layout, before running it.
+
+Usage:
+    python scripts/migrate_storage_layout.py
+
+Runs online: the service reads the current layout first and falls back to the
+legacy one, every file directory is moved with a single rename (or copied
+when it changes volume), and the walk pauses between batches
+(STORAGE_REBALANCE_BATCH, STORAGE_REBALANCE_PAUSE_MS). It can be interrupted
+and run again. Files with an upload in progress are skipped; run the script
+until it reports no busy files, then comment out legacy_templates and
+previous_volumes again: while they are set, every lookup missing the current
+layout also checks the legacy one.
+
+The same pass runs in the service when STORAGE_REBALANCE_INTERVAL is set, on
+one worker, until a pass moves nothing.
+"""
+import os
+import sys
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.tasks.storage_layout import migrate_storage_layout
+
+
+async def main():
+    statuses = await migrate_storage_layout()
+    print(f"✅ Moved {statuses['moved']}, merged {statuses['merged']}, busy {statuses['busy']}, "
+          f"failed {statuses['failed']}, not in the legacy layout {statuses['missing']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
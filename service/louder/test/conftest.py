@@ -0,0 +1,80 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+# core parses the command line and loads configs/development.py, which reads
+# paths_config.yaml from the working directory and the database settings from
+# the environment
+sys.argv = sys.argv[:1]
+os.chdir(SERVICE_DIR)
+sys.path.insert(0, str(SERVICE_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("DATABASE_POOL_SIZE", "5")
+os.environ.setdefault("DATABASE_MAX_OVERFLOW", "5")
+os.environ.setdefault("DATABASE_POOL_RECYCLE", "3600")
+os.environ.setdefault("DATABASE_FUTURE", "true")
+
+from core import config
+from app.services.path_master import PathMaster
+
+
+@pytest.fixture
+def storage_layout(tmp_path, monkeypatch):
+    """
+    Points PathMaster at a copy of paths_config.yaml whose storage root is tmp_path.
+
+    Returns a function rewriting the copy, for tests changing the layout.
+    """
+    import yaml
+
+    with open(SERVICE_DIR / "paths_config.yaml", "r", encoding="utf-8") as f:
+        base = yaml.safe_load(f)
+    config_path = tmp_path / "paths_config.yaml"
+
+    def write(**sections):
+        data = {**base, **sections}
+        data["storage"] = {**base["storage"], "base_path": str(tmp_path / "storage"), **sections.get("storage", {})}
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(data, f)
+        PathMaster._instance = None
+        return PathMaster()
+
+    monkeypatch.setitem(config._data, "PATH_YAML_FILE", str(config_path))
+    write()
+    yield write
+    PathMaster._instance = None
+
+
+@pytest.fixture
+def db_sessions(tmp_path):
+    """Session factory of a fresh SQLite database holding all the tables"""
+    import asyncio
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from sqlalchemy.pool import NullPool
+    from core.db.db import Base
+    import core.db.models.user_files, core.db.models.file, core.db.models.blob
+    import core.db.models.user_file_version, core.db.models.file_change
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'louder.db'}", poolclass=NullPool)
+
+    async def create_all():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_all())
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def services():
+    """Service graph of the application, with an empty listing cache"""
+    from app.services.file.cache import FileCacheService
+    from core.depends.container import ServiceContainer
+
+    FileCacheService._instance = None
+    yield ServiceContainer()
+    FileCacheService._instance = None
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from uuid6 import uuid7
+
+from core import config
+from core.dto.user_file_id_pair import UserFileIDPair
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture
+def dedup(storage_layout, monkeypatch):
+    monkeypatch.setitem(config._data, "STORAGE_DEDUP", True)
+    storage_layout()
+
+
+def test_a_blob_referenced_again_is_not_unlinked(dedup, db_sessions, services):
+    user_uid = uuid7()
+
+    async def scenario():
+        async with db_sessions() as session:
+            first_uid, second_uid = await services.file_service(session).create_files(["a.txt", "b.txt"], user_uid)
+        first = UserFileIDPair(user_uid=user_uid, file_uid=first_uid)
+        second = UserFileIDPair(user_uid=user_uid, file_uid=second_uid)
+        async with db_sessions() as session:
+            file = await services.file_service(session).save_file_stream(first, chunks(b"shared"), "a.txt")
+
+        # The last reference is released, then the content is uploaded again
+        # before the releasing request unlinks the blob
+        async with db_sessions() as session:
+            repository = services.file_service(session)._repository_service
+            assert await repository.release_blob_reference(file.content_hash)
+            await repository.commit_transaction()
+            assert not await repository.blob_exists(file.content_hash)
+        async with db_sessions() as session:
+            await services.file_service(session).save_file_stream(second, chunks(b"shared"), "b.txt")
+        async with db_sessions() as session:
+            repository = services.file_service(session)._repository_service
+            assert not await repository.delete_unreferenced_blob(file.content_hash)
+            await repository.rollback_db()
+        async with db_sessions() as session:
+            await services.file_service(session)._unlink_released_blob(file.content_hash)
+
+        async with db_sessions() as session:
+            assert await services.file_service(session)._repository_service.blob_exists(file.content_hash)
+        assert services.storage_service.get_blob_path(file.content_hash).read_bytes() == b"shared"
+
+    asyncio.run(scenario())
+
+
+def test_an_unreferenced_blob_is_unlinked(dedup, db_sessions, services):
+    user_uid = uuid7()
+
+    async def scenario():
+        async with db_sessions() as session:
+            file_uid, = await services.file_service(session).create_files(["a.txt"], user_uid)
+        pair = UserFileIDPair(user_uid=user_uid, file_uid=file_uid)
+        async with db_sessions() as session:
+            first = await services.file_service(session).save_file_stream(pair, chunks(b"first"), "a.txt")
+        async with db_sessions() as session:
+            await services.file_service(session).save_file_stream(pair, chunks(b"second"), "a.txt")
+
+        assert not services.storage_service.get_blob_path(first.content_hash).exists()
+        async with db_sessions() as session:
+            repository = services.file_service(session)._repository_service
+            assert not await repository.delete_unreferenced_blob(first.content_hash)
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_saves_of_a_file_keep_its_content_and_hash_together(dedup, db_sessions, services):
+    user_uid = uuid7()
+
+    async def scenario():
+        async with db_sessions() as session:
+            file_uid, = await services.file_service(session).create_files(["a.txt"], user_uid)
+        pair = UserFileIDPair(user_uid=user_uid, file_uid=file_uid)
+
+        async def save(content: bytes):
+            async with db_sessions() as session:
+                return await services.file_service(session).save_file_stream(pair, chunks(content), "a.txt")
+
+        await asyncio.gather(save(b"content A"), save(b"content B"))
+
+        async with db_sessions() as session:
+            file = (await services.file_service(session)._repository_service.get_files_by_ids([file_uid]))[file_uid]
+        content = (await services.storage_service.get_content_path(file, pair)).read_bytes()
+        assert content in (b"content A", b"content B")
+        assert len(content) == file.size
+        assert services.storage_service.get_blob_path(file.content_hash).read_bytes() == content
+
+    asyncio.run(scenario())
+
+
+def test_a_file_has_one_lock_whatever_the_id_type(storage_layout):
+    from app.services.file.storage import FileStorageService
+
+    storage = FileStorageService()
+    file_uid = uuid7()
+    lock = storage.get_file_lock(file_uid)
+    assert storage.get_file_lock(str(file_uid)) is lock
+
+
+def test_deleting_files_releases_their_blob(dedup, db_sessions, services):
+    from sqlalchemy import select
+    from core.db.models.blob import BlobModel
+
+    user_uid = uuid7()
+
+    async def ref_count(content_hash):
+        async with db_sessions() as session:
+            return (await session.execute(
+                select(BlobModel.ref_count).where(BlobModel.content_hash == content_hash)
+            )).scalar_one_or_none()
+
+    async def scenario():
+        async with db_sessions() as session:
+            first_uid, second_uid = await services.file_service(session).create_files(["a.txt", "b.txt"], user_uid)
+        first = UserFileIDPair(user_uid=user_uid, file_uid=first_uid)
+        second = UserFileIDPair(user_uid=user_uid, file_uid=second_uid)
+        for pair in (first, second):
+            async with db_sessions() as session:
+                file = await services.file_service(session).save_file_stream(pair, chunks(b"shared"), "a.txt")
+        blob_path = services.storage_service.get_blob_path(file.content_hash)
+        assert await ref_count(file.content_hash) == 2
+
+        async with db_sessions() as session:
+            await services.file_service(session).delete_file(first)
+        assert await ref_count(file.content_hash) == 1
+        assert blob_path.read_bytes() == b"shared"
+
+        async with db_sessions() as session:
+            await services.file_service(session).delete_file(second)
+        assert await ref_count(file.content_hash) is None
+        assert not blob_path.exists()
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+import asyncio
+
+import fakeredis
+import pytest
+from redis import asyncio as redis_asyncio
+
+from core.cache import MemoryCacheBackend, RedisCacheBackend
+
+
+@pytest.fixture
+def redis_backend(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_asyncio, "from_url", lambda url: fakeredis.FakeAsyncRedis(server=server))
+
+    def connect():
+        """A backend of another worker, sharing the server"""
+        return RedisCacheBackend(url="redis://", ttl=30, serializer=bytes, deserializer=bytes, prefix="test:")
+
+    return connect
+
+
+def test_redis_load_racing_an_invalidation_of_another_worker_is_not_cached(redis_backend):
+    reader, writer = redis_backend(), redis_backend()
+
+    async def scenario():
+        generation = await reader.get_generation("user")
+        # Another worker commits a write and invalidates while the listing is loaded
+        await writer.invalidate("user")
+        assert not await reader.set_if_generation("user", b"stale", generation)
+        assert await reader.get("user") is None
+
+        generation = await reader.get_generation("user")
+        assert await reader.set_if_generation("user", b"fresh", generation)
+        assert await writer.get("user") == b"fresh"
+
+    asyncio.run(scenario())
+
+
+def test_memory_load_racing_an_invalidation_is_not_cached():
+    backend = MemoryCacheBackend(max_entries=10, ttl=30)
+
+    async def scenario():
+        generation = await backend.get_generation("user")
+        await backend.invalidate("user")
+        assert not await backend.set_if_generation("user", "stale", generation)
+        assert await backend.set_if_generation("user", "fresh", await backend.get_generation("user"))
+        assert await backend.get("user") == "fresh"
+
+    asyncio.run(scenario())
+
+
+def test_memory_generations_never_go_back_when_the_table_is_full():
+    # max_entries=1 tracks the generations of 4 keys
+    backend = MemoryCacheBackend(max_entries=1, ttl=30)
+
+    async def scenario():
+        # A load reads the generation of a user never written, then the user
+        # is written, and enough other users to evict it from the table
+        generation = await backend.get_generation("user")
+        await backend.invalidate("user")
+        for other in range(8):
+            await backend.invalidate(f"other-{other}")
+
+        assert await backend.get_generation("user") != generation
+        assert not await backend.set_if_generation("user", "stale", generation)
+        assert await backend.get("user") is None
+        assert await backend.set_if_generation("user", "fresh", await backend.get_generation("user"))
+        assert await backend.get("user") == "fresh"
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy import select
+from uuid6 import uuid7
+
+from app.services.file.repository import FileRepositoryService
+from app.services.file.tools import FileToolsService
+from core.db.models.file_change import FileChangeModel, FILE_CHANGE_CREATED, FILE_CHANGE_UPDATED, FILE_CHANGE_DELETED
+
+
+async def compact(db_sessions, changes):
+    """Records the (file id, operation) changes in order, compacts and returns the log per file"""
+    user_id = uuid7()
+    async with db_sessions() as session:
+        repository = FileRepositoryService(session, FileToolsService())
+        for file_id, operation in changes:
+            await repository.record_file_changes(user_id, [file_id], operation)
+        await repository.compact_file_changes("", 1000)
+        await session.commit()
+        rows = (await session.execute(
+            select(FileChangeModel.file_id, FileChangeModel.operation).order_by(FileChangeModel.id)
+        )).all()
+    return [(file_id, operation) for file_id, operation in rows]
+
+
+def test_compaction_keeps_created_of_a_file_updated_later(db_sessions):
+    file_id = uuid7()
+    log = asyncio.run(compact(db_sessions, [
+        (file_id, FILE_CHANGE_CREATED), (file_id, FILE_CHANGE_UPDATED), (file_id, FILE_CHANGE_UPDATED),
+    ]))
+    assert log == [(str(file_id), FILE_CHANGE_CREATED)]
+
+
+def test_compaction_keeps_latest_change_of_known_files(db_sessions):
+    updated, deleted = uuid7(), uuid7()
+    log = asyncio.run(compact(db_sessions, [
+        (updated, FILE_CHANGE_UPDATED), (deleted, FILE_CHANGE_CREATED),
+        (updated, FILE_CHANGE_UPDATED), (deleted, FILE_CHANGE_DELETED),
+    ]))
+    assert sorted(log) == sorted([(str(updated), FILE_CHANGE_UPDATED), (str(deleted), FILE_CHANGE_DELETED)])
@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+
+from uuid6 import uuid7
+
+from core.domain.file import File
+
+
+def test_to_dict_round_trips():
+    file = File(name="report", uid=uuid7(), extension="pdf", size=42, mime_type="application/pdf",
+                content_hash="ab" * 32)
+    data = file.to_dict()
+    assert data["filename"] == "report.pdf"
+    assert data["storage_filename"] == f"{file.uid}.pdf"
+
+    copy = File.from_dict(data)
+    assert (copy.uid, copy.name, copy.size, copy.content_hash) == (file.uid, file.name, file.size, file.content_hash)
+
+
+def test_to_dict_of_a_file_loaded_from_a_row():
+    uid = uuid7()
+    row = SimpleNamespace(id=str(uid), file_name="notes", file_extension="", is_public=False, file_size=0,
+                          mime_type="text/plain", created_at=None, updated_at=None, content_hash=None)
+    data = File.from_row(row).to_dict()
+    assert data["uid"] == str(uid)
+    assert data["storage_filename"] == str(uid)
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from uuid6 import uuid7
+
+from app import create_app
+from core.db.db import get_db
+from core.dto.user_file_id_pair import UserFileIDPair
+
+CONTENT = b"0123456789" * 100
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture
+def download(storage_layout, db_sessions):
+    """Client of the app over the test database, and the URL and headers of a stored file"""
+    app = create_app()
+
+    async def get_test_db():
+        async with db_sessions() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = get_test_db
+    services = app.state.services
+    user_uid = uuid7()
+
+    async def store():
+        async with db_sessions() as session:
+            file_uid, = await services.file_service(session).create_files(["report.txt"], user_uid)
+        async with db_sessions() as session:
+            pair = UserFileIDPair(user_uid=user_uid, file_uid=file_uid)
+            await services.file_service(session).save_file_stream(pair, chunks(CONTENT), "report.txt")
+        return file_uid
+
+    file_uid = asyncio.run(store())
+    return TestClient(app), f"/api/v1/loader/file/{file_uid}/content", {"X-User-Id": str(user_uid)}
+
+
+def test_full_download(download):
+    client, url, headers = download
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["ETag"]
+
+
+def test_range_download(download):
+    client, url, headers = download
+    response = client.get(url, headers={**headers, "Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert response.headers["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+
+
+def test_range_past_the_end_is_not_satisfiable(download):
+    client, url, headers = download
+    response = client.get(url, headers={**headers, "Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+
+
+def test_matching_etag_is_not_modified(download):
+    client, url, headers = download
+    etag = client.get(url, headers=headers).headers["ETag"]
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_file_of_another_user_is_not_found(download):
+    client, url, _ = download
+    assert client.get(url, headers={"X-User-Id": str(uuid7())}).status_code == 404
+
+
+def test_invalid_range_serves_the_whole_content(download):
+    client, url, headers = download
+    response = client.get(url, headers={**headers, "Range": "bytes=5-3"})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_parse_byte_range():
+    from app.services.file.tools import FileToolsService
+    from core.exceptions import FileRangeError
+
+    tools = FileToolsService()
+    assert tools.parse_byte_range("bytes=10-19", 100) == (10, 19)
+    assert tools.parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert tools.parse_byte_range("bytes=-5", 100) == (95, 99)
+    assert tools.parse_byte_range("bytes=5-3", 100) is None
+    with pytest.raises(FileRangeError):
+        tools.parse_byte_range("bytes=100-", 100)
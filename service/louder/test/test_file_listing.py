@@ -0,0 +1,32 @@
+import asyncio
+
+from uuid6 import uuid7
+
+
+def test_listing_etag_is_the_version_the_body_was_read_at(db_sessions, services):
+    user_uid = uuid7()
+
+    async def scenario():
+        async with db_sessions() as session:
+            fs = services.file_service(session)
+            etag, body = await fs.get_files_listing_json(user_uid, min_version=await fs.get_listing_version(user_uid))
+            assert (etag, body) == ('"v0"', b'{"files":{}}')
+
+            # A write committed by another worker: the listing cached here is not invalidated
+            await fs._repository_service.bump_listing_version(user_uid)
+            await session.commit()
+            # ... and seen here once the cached version expires (FILE_LIST_VERSION_TTL)
+            await services.cache_service._versions.delete(str(user_uid))
+
+            version = await fs.get_listing_version(user_uid)
+            assert version == 1
+            etag, _ = await fs.get_files_listing_json(user_uid, min_version=version)
+            assert etag == '"v1"'
+            # The stale entry was loaded again, not served under the new tag
+            assert services.cache_service.misses == 2
+
+            # An entry at least as recent as the version is served from the cache
+            assert await fs.get_files_listing_json(user_uid, min_version=version) == (etag, body)
+            assert services.cache_service.hits == 1
+
+    asyncio.run(scenario())
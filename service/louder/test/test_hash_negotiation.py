@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+
+import pytest
+from uuid6 import uuid7
+
+from core import config
+from core.domain.file import File
+from core.dto.content_challenge import ContentChallenge
+from core.dto.user_file_id_pair import UserFileIDPair
+
+CONTENT = b"quarterly figures " * 1000
+CONTENT_HASH = hashlib.sha256(CONTENT).hexdigest()
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture(params=[False, True], ids=["files", "dedup"])
+def dedup(request, storage_layout, monkeypatch):
+    """Storage mode, set before the services are built"""
+    monkeypatch.setitem(config._data, "STORAGE_DEDUP", request.param)
+    monkeypatch.setitem(config._data, "STORAGE_PROOF_LENGTH", 1024)
+    storage_layout()
+    return request.param
+
+
+async def store_for_two_users(db_sessions, services):
+    """User A stores CONTENT, user B has an empty file"""
+    owner, other = uuid7(), uuid7()
+    async with db_sessions() as session:
+        owner_file_uid, = await services.file_service(session).create_files(["a.txt"], owner)
+        other_file_uid, = await services.file_service(session).create_files(["b.txt"], other)
+    owner_pair = UserFileIDPair(user_uid=owner, file_uid=owner_file_uid)
+    async with db_sessions() as session:
+        await services.file_service(session).save_file_stream(owner_pair, chunks(CONTENT), "a.txt")
+    return owner_pair, UserFileIDPair(user_uid=other, file_uid=other_file_uid)
+
+
+async def negotiate(db_sessions, services, pair, **challenge):
+    async with db_sessions() as session:
+        return await services.file_service(session).link_known_content(
+            pair, "b.txt", CONTENT_HASH, len(CONTENT), **challenge
+        )
+
+
+def test_content_of_another_user_is_not_linked_by_its_hash(dedup, db_sessions, services):
+    async def scenario():
+        _, other_pair = await store_for_two_users(db_sessions, services)
+        result = await negotiate(db_sessions, services, other_pair)
+        assert not isinstance(result, File)
+
+        if dedup:
+            assert isinstance(result, ContentChallenge)
+            # A proof computed without the content is refused
+            wrong = hashlib.sha256(bytes.fromhex(result.nonce)).hexdigest()
+            assert await negotiate(
+                db_sessions, services, other_pair, challenge_token=result.token, challenge_proof=wrong
+            ) is None
+
+        async with db_sessions() as session:
+            file = (await services.file_service(session)._repository_service.get_files_by_ids(
+                [other_pair.file_uid]))[other_pair.file_uid]
+        assert file.content_hash is None
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("dedup", [True], ids=["dedup"], indirect=True)
+def test_content_of_another_user_is_linked_with_a_proof(dedup, db_sessions, services):
+    async def scenario():
+        owner_pair, other_pair = await store_for_two_users(db_sessions, services)
+        challenge = await negotiate(db_sessions, services, other_pair)
+        assert challenge.length == 1024
+
+        data = CONTENT[challenge.offset:challenge.offset + challenge.length]
+        proof = hashlib.sha256(bytes.fromhex(challenge.nonce) + data).hexdigest()
+        # The token is bound to the file it was issued for
+        assert isinstance(await negotiate(
+            db_sessions, services, owner_pair, challenge_token=challenge.token, challenge_proof=proof
+        ), File)
+        file = await negotiate(db_sessions, services, other_pair, challenge_token=challenge.token, challenge_proof=proof)
+        assert isinstance(file, File)
+        assert file.content_hash == CONTENT_HASH
+
+    asyncio.run(scenario())
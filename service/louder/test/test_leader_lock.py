@@ -0,0 +1,16 @@
+from app.tasks.leader import LeaderLock
+
+
+def test_one_holder_per_storage_root(storage_layout):
+    leader, follower = LeaderLock("compaction"), LeaderLock("compaction")
+
+    assert leader.acquire()
+    assert leader.acquire()
+    assert not follower.acquire()
+    other_task = LeaderLock("storage_rebalance")
+    assert other_task.acquire()
+    other_task.release()
+
+    leader.release()
+    assert follower.acquire()
+    follower.release()
@@ -0,0 +1,19 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("File_SERVICE_SECRET_KEY", "service-key")
+    return TestClient(create_app())
+
+
+def test_metrics_require_the_service_key(client):
+    assert client.get("/api/v1/loader/metrics").status_code in (401, 403)
+    assert client.get("/api/v1/loader/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/api/v1/loader/metrics", headers={"Authorization": "Bearer service-key"})
+    assert response.status_code == 200
+    assert "file_list_cache" in response.json()
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiobotocore")
+moto_server = pytest.importorskip("moto.server")
+
+from app.services.file.backend.s3 import S3StorageBackend
+
+PART_SIZE = 5 * 1024 * 1024
+CONTENT = bytes(range(256)) * (PART_SIZE * 2 // 256) + b"tail"
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint():
+    """S3 stand-in served by moto on a free local port"""
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def backend(s3_endpoint, tmp_path):
+    """Backend over a bucket of its own, whose storage root is tmp_path"""
+    return S3StorageBackend(
+        bucket=f"louder-{tmp_path.name.lower().replace('_', '-')}",
+        root=tmp_path,
+        prefix="files",
+        endpoint_url=s3_endpoint,
+        region="us-east-1",
+        access_key="test",
+        secret_key="test",
+        part_size=PART_SIZE
+    )
+
+
+async def create_bucket(backend) -> None:
+    # The client is bound to the event loop of the scenario, created in it
+    client = await backend._get_client()
+    await client.create_bucket(Bucket=backend._bucket)
+
+
+async def read(backend, path, start=0, end=None) -> bytes:
+    return b"".join([chunk async for chunk in backend.get_range(path, start, end)])
+
+
+def test_multipart_upload_and_ranged_get(backend, tmp_path):
+    source = tmp_path / "staging"
+    source.write_bytes(CONTENT)
+    path = tmp_path / "user" / "file"
+
+    async def scenario():
+        try:
+            await create_bucket(backend)
+            await backend.put_file(path, source)
+            assert not source.exists()
+            assert (await backend.stat(path)).st_size == len(CONTENT)
+
+            # Ranges across a part boundary, up to the end, and the suffix
+            assert await read(backend, path, PART_SIZE - 10, PART_SIZE + 9) == CONTENT[PART_SIZE - 10:PART_SIZE + 10]
+            assert await read(backend, path, len(CONTENT) - 4) == b"tail"
+            assert await read(backend, path) == CONTENT
+        finally:
+            await backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_interrupted_multipart_upload_is_aborted(backend, tmp_path):
+    path = tmp_path / "user" / "file"
+
+    async def chunks():
+        yield CONTENT[:PART_SIZE]
+        raise ConnectionResetError("client went away")
+
+    async def scenario():
+        try:
+            await create_bucket(backend)
+            with pytest.raises(ConnectionResetError):
+                await backend.put_stream(path, chunks())
+            client = await backend._get_client()
+            uploads = await client.list_multipart_uploads(Bucket=backend._bucket)
+            assert not uploads.get("Uploads")
+            assert await backend.stat(path) is None
+        finally:
+            await backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_move_copies_on_the_server_and_removes_the_source(backend, tmp_path):
+    source = tmp_path / "staging" / "file"
+    target = tmp_path / "blobs" / "ab" / "cd" / "abcd"
+
+    async def chunks():
+        yield b"moved content"
+
+    async def scenario():
+        try:
+            await create_bucket(backend)
+            assert await backend.put_stream(source, chunks()) == len(b"moved content")
+            await backend.move(source, target)
+            assert await backend.stat(source) is None
+            assert await read(backend, target) == b"moved content"
+            assert await read(backend, target, 6, 12) == b"content"
+        finally:
+            await backend.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core.db.db import Base, add_missing_columns
+import core.db.models.user_files, core.db.models.file, core.db.models.blob
+import core.db.models.user_file_version, core.db.models.file_change
+
+
+def test_columns_added_since_a_table_was_created_are_added(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}", poolclass=NullPool)
+
+    def file_columns_and_indexes(sync_conn):
+        inspector = inspect(sync_conn)
+        return ({c["name"] for c in inspector.get_columns("file")},
+                {i["name"] for i in inspector.get_indexes("file")})
+
+    async def scenario():
+        async with engine.begin() as conn:
+            # The file table as created before content_hash
+            await conn.execute(text(
+                "CREATE TABLE file (id VARCHAR(36) PRIMARY KEY, file_name VARCHAR(255) NOT NULL, "
+                "file_extension VARCHAR(50) NOT NULL, is_public BOOLEAN NOT NULL, file_size BIGINT NOT NULL, "
+                "mime_type VARCHAR(100) NOT NULL, created_at DATETIME, updated_at DATETIME)"
+            ))
+            await conn.execute(text("INSERT INTO file VALUES ('f', 'a.txt', 'txt', 0, 1, 'text/plain', NULL, NULL)"))
+            await conn.run_sync(Base.metadata.create_all)
+            assert await conn.run_sync(add_missing_columns) == ["file.content_hash", "ix_file_content_hash"]
+
+        async with engine.begin() as conn:
+            columns, indexes = await conn.run_sync(file_columns_and_indexes)
+            assert "content_hash" in columns and "ix_file_content_hash" in indexes
+            assert (await conn.execute(text("SELECT content_hash FROM file"))).scalar_one() is None
+            # Up to date: nothing to add
+            assert await conn.run_sync(add_missing_columns) == []
+        await engine.dispose()
+
+    asyncio.run(scenario())
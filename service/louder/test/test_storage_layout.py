@@ -0,0 +1,52 @@
+import asyncio
+
+from uuid6 import uuid7
+
+from app.services.file.storage import FileStorageService
+from core.dto.user_file_id_pair import UserFileIDPair
+
+# The flat layout, as paths_config.yaml documents it for a migration
+LEGACY_TEMPLATES = {
+    "file_dir": "{user_uid}/files/{file_uid}",
+    "user_file": "{user_uid}/files/{file_uid}/{filename}",
+    "upload_session": "{user_uid}/files/{file_uid}/{upload_id}.json",
+}
+
+
+def test_no_legacy_layout_by_default(storage_layout):
+    path_master = storage_layout()
+    assert not path_master.has_legacy_layout
+    assert path_master.get_legacy_path("file_dir", user_uid=uuid7(), file_uid=uuid7()) is None
+
+
+def test_migrate_file_dir_moves_flat_directory_into_sharded_layout(storage_layout):
+    path_master = storage_layout(legacy_templates=LEGACY_TEMPLATES)
+    pair = UserFileIDPair(user_uid=uuid7(), file_uid=uuid7())
+    ids = {"user_uid": pair.user_uid, "file_uid": pair.file_uid}
+
+    legacy_dir = path_master.get_legacy_path("file_dir", **ids)
+    file_dir = path_master.get_path("file_dir", **ids)
+    assert legacy_dir is not None
+    assert legacy_dir != file_dir
+    legacy_dir.mkdir(parents=True)
+    (legacy_dir / "report.pdf").write_bytes(b"content")
+
+    status = asyncio.run(FileStorageService().migrate_file_dir(pair))
+
+    assert status == "moved"
+    assert (file_dir / "report.pdf").read_bytes() == b"content"
+    assert not legacy_dir.exists()
+    # The emptied user directory of the flat layout is pruned as well
+    assert not legacy_dir.parent.parent.exists()
+    assert asyncio.run(FileStorageService().migrate_file_dir(pair)) == "missing"
+
+
+def test_migrate_file_dir_skips_directory_with_upload_in_progress(storage_layout):
+    path_master = storage_layout(legacy_templates=LEGACY_TEMPLATES)
+    pair = UserFileIDPair(user_uid=uuid7(), file_uid=uuid7())
+    legacy_dir = path_master.get_legacy_path("file_dir", user_uid=pair.user_uid, file_uid=pair.file_uid)
+    legacy_dir.mkdir(parents=True)
+    (legacy_dir / f"{uuid7()}.json").write_text("{}")
+
+    assert asyncio.run(FileStorageService().migrate_file_dir(pair)) == "busy"
+    assert legacy_dir.is_dir()
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from uuid6 import uuid7
+
+from app.services.file.storage import FileStorageService
+from core.dto.upload_session import UploadSession
+from core.dto.user_file_id_pair import UserFileIDPair
+from core.exceptions import FileCreationError, ServiceStorageError
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_staging_copies_the_committed_bytes_only(storage_layout):
+    storage_layout()
+    storage = FileStorageService()
+    pair = UserFileIDPair(user_uid=uuid7(), file_uid=uuid7())
+    session = UploadSession(upload_id=uuid7(), file_name="report.pdf", mime_type="application/pdf")
+
+    async def scenario():
+        await storage.create_upload_session(session, pair)
+        offset = await storage.append_upload_chunk(session, pair, 0, chunks(b"committed"))
+        committed = await storage.get_upload_session(session.upload_id, pair)
+        assert committed.offset == offset
+
+        # A chunk appended by another worker after the session was read
+        await storage.append_upload_chunk(session, pair, offset, chunks(b"-late"))
+        staging_path = await storage.stage_upload(committed, pair)
+        assert staging_path.read_bytes() == b"committed"
+
+        # The staged content is a copy, later appends do not reach it
+        await storage.append_upload_chunk(session, pair, offset + 5, chunks(b"-later"))
+        assert staging_path.read_bytes() == b"committed"
+
+    asyncio.run(scenario())
+
+
+def test_previous_metadata_is_restored_when_the_content_cannot_be_moved_in_place(
+        storage_layout, db_sessions, services, monkeypatch):
+    storage_layout()
+    user_uid = uuid7()
+
+    async def scenario():
+        async with db_sessions() as session:
+            file_uid, = await services.file_service(session).create_files(["report.pdf"], user_uid)
+        pair = UserFileIDPair(user_uid=user_uid, file_uid=file_uid)
+        async with db_sessions() as session:
+            await services.file_service(session).save_file_stream(pair, chunks(b"first"), "report.pdf")
+
+        async def fail(*args, **kwargs):
+            raise ServiceStorageError("disk full")
+        monkeypatch.setattr(FileStorageService, "commit_staged", fail)
+
+        async with db_sessions() as session:
+            with pytest.raises(FileCreationError):
+                await services.file_service(session).save_file_stream(pair, chunks(b"second version"), "report.pdf")
+
+        async with db_sessions() as session:
+            file = (await services.file_service(session)._repository_service.get_files_by_ids([file_uid]))[file_uid]
+        assert file.size == len(b"first")
+        assert (await services.storage_service.get_content_path(file, pair)).read_bytes() == b"first"
+        assert not list(storage_layout().base_storage_path.rglob("*.staging"))
+
+    asyncio.run(scenario())